@@ -1,8 +1,11 @@
-from rdflib import Graph, Literal, RDF, URIRef, Namespace, RDFS
-from rdflib.namespace import DC, FOAF, DCTERMS, XSD
-import pandas as pd
-from SPARQLWrapper import SPARQLWrapper, JSON
-import requests
+from rdflib import Graph, Literal, RDF, RDFS
+from rdflib.namespace import XSD
+
+from .cache import cached_get_json
+from .namespaces import CRM, DC, W3, bind_namespaces
+from .uris import object_uri, url_to_uri
+from .utils import intern_value, parse_list, parse_year
+from .wikidata import WIKIDATA_URL, qid_from_uri, query_descriptions
 
 CLEVELAND_URL = "https://openaccess-api.clevelandart.org/api/artworks/"
 CHICAGO_URL = "https://api.artic.edu/api/v1/artworks/search"
@@ -15,8 +18,35 @@ class Artifact:
     This class allows for initialization from tabular data (e.g., a DataFrame),
     conversion to an RDF representation using CIDOC-CRM concepts, enrichment with Wikidata labels and descriptions,
     and the discovery of similar artifacts from the Chicago and Cleveland Museum APIs.
+    The attributes are stored in slots and repeated strings are interned, so large collections stay compact.
     """
 
+    __slots__ = (
+        "department",
+        "accessionYear",
+        "objectName",
+        "title",
+        "culture",
+        "period",
+        "medium",
+        "classification",
+        "creditLine",
+        "objectWikidataURL",
+        "tags",
+        "tagsAATURL",
+        "tagsWikidataURL",
+        "dimensions",
+        "cm_value",
+        "author_name",
+        "objectID",
+        "enriched_tags",
+        "_collections",
+        "_uri",
+    )
+
+    # attributes the URI of an artifact is minted from
+    URI_ATTRIBUTES = frozenset(("objectWikidataURL", "title", "objectID"))
+
     def __init__(
         self,
         department,
@@ -35,6 +65,7 @@ class Artifact:
         dimensions,
         cm_value,
         author_name=None,
+        objectID=None,
     ):
         """
         Initialize an Artifact object with its associated metadata.
@@ -55,30 +86,62 @@ class Artifact:
             tagsWikidataURL (str or list): Wikidata URLs of the tags.
             dimensions (str): Dimensions of the artifact.
             cm_value (float): Height or other metric in centimeters.
+            author_name (str or list): Artist display names, the first one is used as author.
+            objectID (int, optional): The MET Object ID, keeps the URIs of artifacts with the same title apart.
         """
-        self.department = department
-        self.accessionYear = pd.Timestamp(accessionYear).year
-        self.objectName = objectName
+        self._collections = None  # the collections holding the artifact, notified of changes
+        self._uri = None  # the URI, minted once on first use
+        self.department = intern_value(department)
+        self.accessionYear = parse_year(accessionYear)
+        self.objectName = intern_value(objectName)
         self.title = title
-        self.culture = culture
-        self.period = period
-        self.medium = medium
-        self.classification = classification
-        self.creditLine = creditLine
+        self.culture = intern_value(culture)
+        self.period = intern_value(period)
+        self.medium = intern_value(medium)
+        self.classification = intern_value(classification)
+        self.creditLine = intern_value(creditLine)
         self.objectWikidataURL = objectWikidataURL
-        self.tags = eval(tags) if isinstance(tags, str) else []
-        self.tagsAATURL = eval(tagsAATURL) if isinstance(tagsAATURL, str) else []
-        self.tagsWikidataURL = (
-            eval(tagsWikidataURL) if isinstance(tagsWikidataURL, str) else []
-        )
+        self.tags = parse_list(tags)
+        self.tagsAATURL = parse_list(tagsAATURL)
+        self.tagsWikidataURL = parse_list(tagsWikidataURL)
         self.dimensions = dimensions
         self.cm_value = cm_value
-        self.author_name = (
-            eval(author_name)[0] if isinstance(author_name, str) else "Unknown"
-        )
+        author_names = parse_list(author_name)
+        self.author_name = intern_value(author_names[0]) if author_names else "Unknown"
+        self.objectID = objectID
 
         self.enriched_tags = []
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self.URI_ATTRIBUTES:
+            object.__setattr__(self, "_uri", None)
+        if self._collections and not name.startswith("_"):
+            self.mark_changed()
+
+    def __getstate__(self):
+        # pickled without the collections holding it (e.g. when sent to a worker process)
+        return {
+            name: getattr(self, name)
+            for name in Artifact.__slots__
+            if name != "_collections"
+        }
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "_collections", None)
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def mark_changed(self):
+        """
+        Tell the collections holding the artifact that its RDF has to be updated.
+
+        Assigning an attribute does this automatically, call it after changing a list attribute
+        (e.g. `tags`) in place.
+        """
+        for collection in self._collections or ():
+            collection._mark_dirty(self)
+
     @classmethod
     def from_dataframe(cls, df, index):
         """
@@ -108,69 +171,77 @@ class Artifact:
             df.loc[index, "Dimensions"],
             df.loc[index, "cm_value"],
             df.loc[index, "Artist Display Name"],
+            df.loc[index, "Object ID"] if "Object ID" in df.columns else None,
         )
 
-    def to_rdf(self):
+    def to_rdf(self, graph=None):
         """
         Convert the Artifact into an RDF graph using CIDOC-CRM and Dublin Core vocabularies.
 
+        Args:
+            graph (rdflib.Graph, optional): Graph to add the triples to. If omitted, a new graph is created.
+
         Returns:
             rdflib.Graph: RDF graph representing the artifact and its metadata.
         """
+        if graph is None:
+            graph = bind_namespaces(Graph())
 
-        CRM = Namespace("http://www.cidoc-crm.org/cidoc-crm/")
-        DC = Namespace("http://purl.org/dc/elements/1.1/")
-        EX = Namespace("http://w3id.org/example/")
-        W3 = Namespace("https://w3id.org/i40/sto")
+        graph.addN((s, p, o, graph) for s, p, o in self.triples())
 
-        g = Graph()
-        g.bind("crm", CRM)
-        g.bind("dc", DC)
-        g.bind("ex", EX)
-        g.bind("w3", W3)
+        return graph
 
-        if (
-            self.objectWikidataURL is None
-            or pd.isna(self.objectWikidataURL)
-            or self.objectWikidataURL == "nan"
-        ):
-            self.objectWikidataURL = (
-                f"http://w3id.org/example/artifact/{self.title.replace(' ', '_')}"
-            )
-        artifact_uri = URIRef(self.objectWikidataURL)
-
-        g.add((artifact_uri, RDF.type, CRM["E22_Man-Made_Object"]))
-        g.add(
-            (
-                artifact_uri,
-                CRM.P4_has_time_span,
-                Literal(str(self.accessionYear), datatype=XSD.gYear),
-            )
+    def triples(self):
+        """
+        Generate the RDF triples describing the artifact.
+
+        Yields:
+            tuple: (subject, predicate, object) triples using CIDOC-CRM and Dublin Core vocabularies.
+        """
+        artifact_uri = self.uri()
+
+        yield (artifact_uri, RDF.type, CRM["E22_Man-Made_Object"])
+        yield (
+            artifact_uri,
+            CRM.P4_has_time_span,
+            Literal(str(self.accessionYear), datatype=XSD.gYear),
         )
-        g.add((artifact_uri, DC.title, Literal(self.title)))
-        g.add((artifact_uri, CRM.P45_consists_of, Literal(self.medium)))
-        g.add((artifact_uri, CRM.P2_has_type, Literal(self.objectName)))
-        g.add(
-            (
-                artifact_uri,
-                CRM.P107i_is_current_or_former_member_of,
-                Literal(self.department),
-            )
+        yield (artifact_uri, DC.title, Literal(self.title))
+        yield (artifact_uri, CRM.P45_consists_of, Literal(self.medium))
+        yield (artifact_uri, CRM.P2_has_type, Literal(self.objectName))
+        yield (
+            artifact_uri,
+            CRM.P107i_is_current_or_former_member_of,
+            Literal(self.department),
         )
 
         if isinstance(self.tags, list):
             for tag in self.tags:
-                g.add((artifact_uri, CRM.P2_has_type, Literal(tag)))
+                yield (artifact_uri, CRM.P2_has_type, Literal(tag))
 
         if isinstance(self.tagsWikidataURL, list):
             for url in self.tagsWikidataURL:
-                g.add((artifact_uri, W3.hasWikidataEntity, URIRef(url)))
+                yield (artifact_uri, W3.hasWikidataEntity, url_to_uri(url))
 
         if self.enriched_tags:
             for url, value in self.enriched_tags:
-                g.add((URIRef(url), RDFS.comment, Literal(value)))
+                yield (url_to_uri(url), RDFS.comment, Literal(value))
+
+    def uri(self):
+        """
+        The URI identifying the artifact in RDF, the attributes are left unchanged.
 
-        return g
+        It is computed once and reused until objectWikidataURL, title or objectID change.
+
+        Returns:
+            rdflib.URIRef: The Wikidata URL, or an example URI minted from the title and
+            the Object ID if there is none (see uris.mint_uri).
+        """
+        if self._uri is None:
+            self._uri = object_uri(
+                self.objectWikidataURL, "artifact", self.title, self.objectID
+            )
+        return self._uri
 
     def print_rdf(self):
         """
@@ -180,41 +251,50 @@ class Artifact:
 
         print(graph.serialize(format="turtle"))
 
-    def wikidata_enrich(self):
+    def wikidata_enrich(self, endpoint=WIKIDATA_URL):
         """
         Enrich tag information using SPARQL queries to Wikidata.
 
-        Appends English descriptions of tag entities to the `enriched_tags` list.
+        Appends English descriptions of tag entities to the `enriched_tags` list (once per tag).
+        All tags of the artifact are resolved with a single query.
+
+        Args:
+            endpoint (str): URL of the SPARQL endpoint.
         """
         if not isinstance(self.tagsWikidataURL, list):
             print("tagsWikidataURL is not a list, skipping enrichment.")
             return
 
-        sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
-        sparql.setReturnFormat(JSON)
+        self.enrich_tags(
+            query_descriptions(
+                filter(None, map(qid_from_uri, self.tagsWikidataURL)), endpoint
+            )
+        )
+
+    def enrich_tags(self, descriptions):
+        """
+        Append the descriptions of the artifact's tags to `enriched_tags`.
+
+        Tags that are already enriched are skipped, so enriching again adds only the new ones.
+
+        Args:
+            descriptions (dict): Wikidata QID -> English description.
+        """
+        if not isinstance(self.tagsWikidataURL, list):
+            return
 
+        seen = {uri for uri, _ in self.enriched_tags}
+        enriched = []
         for uri in self.tagsWikidataURL:
-            qid = uri.split("/")[-1]
-            query = f"""
-            SELECT ?label ?description WHERE {{
-              wd:{qid} rdfs:label ?label .
-              OPTIONAL {{ wd:{qid} schema:description ?description . }}
-              FILTER (lang(?label) = "en")
-              FILTER (lang(?description) = "en")
-            }}
-            LIMIT 1
-            """
-            try:
-                sparql.setQuery(query)
-                results = sparql.query().convert()
-                for result in results["results"]["bindings"]:
-                    label = result["label"]["value"]
-                    description = result.get("description", {}).get("value", "")
-                    self.enriched_tags.append((uri, description))
-            except Exception as e:
-                print(f"Error querying {qid}: {e}")
-
-    def similar_artworks(self, limit: int = 5):
+            qid = qid_from_uri(uri)
+            if qid in descriptions and uri not in seen:
+                seen.add(uri)
+                enriched.append((uri, descriptions[qid]))
+        if enriched:
+            self.enriched_tags.extend(enriched)
+            self.mark_changed()
+
+    def similar_artworks(self, limit: int = 5, index=None):
         """
         Find similar artworks from external museum collections.
 
@@ -223,6 +303,8 @@ class Artifact:
 
         Args:
             limit (int): Maximum number of results to retrieve from each collection.
+            index (SearchIndex, optional): Offline mode: search this local index of mirrored
+                records instead of the live APIs.
 
         Returns:
             list: A list of dictionaries containing metadata for similar artworks.
@@ -232,15 +314,46 @@ class Artifact:
             print("No classification available for this artifact.")
             return []
 
-        results = self.similiar_artworks_chicago(limit)
+        if index is not None:
+            results = self.similar_artworks_offline(index, limit)
+        else:
+            results = self.similiar_artworks_chicago(limit)
 
-        results = results + self.similiar_artworks_cleveland(limit)
+            results = results + self.similiar_artworks_cleveland(limit)
 
         if not results:
             print("No similar artworks found in either collection.")
 
         return results
 
+    def similar_artworks_offline(self, index, limit):
+        """
+        Search a local index the way the live searches do: a full-text search for the culture among
+        the Chicago records and a culture match among the Cleveland records.
+
+        Args:
+            index (SearchIndex): Index of mirrored Chicago and Cleveland records.
+            limit (int): Number of results per collection.
+
+        Returns:
+            list: Similar artworks in the form of `parse_chicago` and `parse_cleveland`.
+        """
+        results = []
+        for source, museum, fields in (
+            ("Chicago", "aic", ("title", "culture", "artist")),
+            ("Cleveland", "cleveland", ("culture",)),
+        ):
+            for record in index.search(self.culture, limit, museum, fields):
+                results.append(
+                    {
+                        "source": source,
+                        "title": record["title"],
+                        "date": record["date"] or "Unknown",
+                        "url": record["url"],
+                    }
+                )
+        return results
+
     def similiar_artworks_chicago(self, limit):
         """
         Search for similar artworks in the Chicago Art Institute collection using full-text search.
@@ -251,29 +364,50 @@ class Artifact:
         Returns:
             list: List of similar artworks with basic metadata from Chicago.
         """
-        results = []
+        try:
+            data = cached_get_json(CHICAGO_URL, params=self.chicago_params(limit))
+            return self.parse_chicago(data)
+        except Exception as e:
+            print(f"Error fetching from Chicago: {e}")
+            return []
 
-        chicago_params = {
+    def chicago_params(self, limit):
+        """
+        Build the Chicago full-text search parameters for this artifact's culture.
+
+        Args:
+            limit (int): Number of results to return.
+
+        Returns:
+            dict: Query parameters for the Chicago search API.
+        """
+        return {
             "q": self.culture,
             "limit": limit,
             "fields": "id,title,date_display",
         }
-        try:
-            response = requests.get(CHICAGO_URL, params=chicago_params)
-            response.raise_for_status()
-            data = response.json()
-            for item in data.get("data", []):
-                results.append(
-                    {
-                        "source": "Chicago",
-                        "title": item.get("title"),
-                        "date": item.get("date_display", "Unknown"),
-                        "url": f"https://www.artic.edu/artworks/{item['id']}",
-                    }
-                )
-        except Exception as e:
-            print(f"Error fetching from Chicago: {e}")
 
+    @staticmethod
+    def parse_chicago(data):
+        """
+        Extract the basic metadata of similar artworks from a Chicago search response.
+
+        Args:
+            data (dict): Decoded JSON response of the Chicago search API.
+
+        Returns:
+            list: List of similar artworks with basic metadata from Chicago.
+        """
+        results = []
+        for item in data.get("data", []):
+            results.append(
+                {
+                    "source": "Chicago",
+                    "title": item.get("title"),
+                    "date": item.get("date_display", "Unknown"),
+                    "url": f"https://www.artic.edu/artworks/{item['id']}",
+                }
+            )
         return results
 
     def similiar_artworks_cleveland(self, limit):
@@ -286,27 +420,44 @@ class Artifact:
         Returns:
             list: List of similar artworks with basic metadata from Cleveland.
         """
-        params = {"culture": self.culture, "limit": limit}
-
         try:
-            response = requests.get(CLEVELAND_URL, params=params)
-            response.raise_for_status()
+            data = cached_get_json(CLEVELAND_URL, params=self.cleveland_params(limit))
+            return self.parse_cleveland(data)
+        except Exception as e:
+            print(f"Error fetching similar artworks: {e}")
+            return []
 
-            data = response.json()
+    def cleveland_params(self, limit):
+        """
+        Build the Cleveland search parameters for this artifact's culture.
 
-            similar = []
-            for result in data.get("data", []):
-                similar.append(
-                    {
-                        "source": "Cleveland",
-                        "title": result.get("title"),
-                        "date": result.get("creation_date", "Unknown"),
-                        "url": result.get("url"),
-                    }
-                )
+        Args:
+            limit (int): Number of results to return.
 
-            return similar
+        Returns:
+            dict: Query parameters for the Cleveland artworks API.
+        """
+        return {"culture": self.culture, "limit": limit}
 
-        except Exception as e:
-            print(f"Error fetching similar artworks: {e}")
-            return []
+    @staticmethod
+    def parse_cleveland(data):
+        """
+        Extract the basic metadata of similar artworks from a Cleveland response.
+
+        Args:
+            data (dict): Decoded JSON response of the Cleveland artworks API.
+
+        Returns:
+            list: List of similar artworks with basic metadata from Cleveland.
+        """
+        similar = []
+        for result in data.get("data", []):
+            similar.append(
+                {
+                    "source": "Cleveland",
+                    "title": result.get("title"),
+                    "date": result.get("creation_date", "Unknown"),
+                    "url": result.get("url"),
+                }
+            )
+        return similar
@@ -12,6 +12,12 @@ class ArtifactGreek(Artifact):
         Artifact: The base artifact class with metadata, RDF export, and enrichment functionality.
     """
 
+    __slots__ = ()
+
+    KEYWORD = "greek"  # the culture must contain it (case-insensitive), see dispatch.classify_artifacts
+    TAG = "Ancient Greece"
+    TAG_WIKIDATA_URL = "https://www.wikidata.org/wiki/Q11772"
+
     def __init__(
         self,
         department,
@@ -29,6 +35,8 @@ class ArtifactGreek(Artifact):
         tagsWikidataURL,
         dimensions,
         cm_value,
+        author_name=None,
+        objectID=None,
     ):
         """
         Initialize a Greek artifact with all standard artifact metadata.
@@ -52,6 +60,8 @@ class ArtifactGreek(Artifact):
             tagsWikidataURL (list or str): Wikidata tag URLs.
             dimensions (str): Physical dimensions.
             cm_value (float): Measured size in centimeters.
+            author_name (str or list, optional): Artist display names, the first one is used as author.
+            objectID (int, optional): The MET Object ID.
 
         Raises:
             AssertionError: If 'Greek' is not found in the culture string.
@@ -72,9 +82,15 @@ class ArtifactGreek(Artifact):
             tagsWikidataURL,
             dimensions,
             cm_value,
+            author_name,
+            objectID,
         )
 
-        assert "greek" in self.culture, "Artifact is not Greek."
+        assert (
+            self.KEYWORD in str(self.culture).lower()
+        ), "Artifact is not Greek."
 
-        self.tags.append("Ancient Greece")
-        self.tagsWikidataURL.append("https://www.wikidata.org/wiki/Q11772")
+        # new lists: parse_list hands lists through unchanged, appending would change the caller's lists
+        if self.TAG not in self.tags:
+            self.tags = self.tags + [self.TAG]
+            self.tagsWikidataURL = self.tagsWikidataURL + [self.TAG_WIKIDATA_URL]
@@ -14,6 +14,12 @@ class ArtifactRoman(Artifact):
         tag enrichment, and API search for similar artifacts.
     """
 
+    __slots__ = ()
+
+    KEYWORD = "roman"  # the culture must contain it (case-insensitive), see dispatch.classify_artifacts
+    TAG = "Roman Empire"
+    TAG_WIKIDATA_URL = "https://www.wikidata.org/wiki/Q2277"
+
     def __init__(
         self,
         department,
@@ -31,6 +37,8 @@ class ArtifactRoman(Artifact):
         tagsWikidataURL,
         dimensions,
         cm_value,
+        author_name=None,
+        objectID=None,
     ):
         """
         Initialize a Roman artifact, validating cultural attribution and appending Roman-specific tags.
@@ -51,6 +59,8 @@ class ArtifactRoman(Artifact):
             tagsWikidataURL (list or str): Wikidata tag URLs.
             dimensions (str): Dimensions of the artifact.
             cm_value (float): Physical measurement in centimeters.
+            author_name (str or list, optional): Artist display names, the first one is used as author.
+            objectID (int, optional): The MET Object ID.
 
         Raises:
             AssertionError: If 'Roman' is not found in the culture string.
@@ -71,9 +81,15 @@ class ArtifactRoman(Artifact):
             tagsWikidataURL,
             dimensions,
             cm_value,
+            author_name,
+            objectID,
         )
 
-        assert "roman" in self.culture.lower(), "Artifact is not Roman."
+        assert (
+            self.KEYWORD in str(self.culture).lower()
+        ), "Artifact is not Roman."
 
-        self.tags.append("Roman Empire")
-        self.tagsWikidataURL.append("https://www.wikidata.org/wiki/Q2277")
+        # new lists: parse_list hands lists through unchanged, appending would change the caller's lists
+        if self.TAG not in self.tags:
+            self.tags = self.tags + [self.TAG]
+            self.tagsWikidataURL = self.tagsWikidataURL + [self.TAG_WIKIDATA_URL]
@@ -1,24 +1,70 @@
 import math
 
 from rdflib import Graph, Literal
-from rdflib.namespace import RDF, RDFS, URIRef
-from rdflib import Namespace
+from rdflib.namespace import RDF, RDFS
 import pandas as pd
-from SPARQLWrapper import SPARQLWrapper, JSON
-from .utils import visualize_rdf_graph
+from .namespaces import CRM, FOAF, Schema, bind_namespaces
+from .uris import object_uri
+from .utils import intern_value, parse_list, visualize_rdf_graph
+from .wikidata import WIKIDATA_URL, qid_from_uri, query_dates_of_birth
 
 
 class Artist:
+    __slots__ = (
+        "display_name",
+        "nationality",
+        "wikidata_uri",
+        "date_of_birth",
+        "_collections",
+        "_uri",
+    )  # attributes are stored in slots instead of a per-instance dict to keep large collections compact
+
+    URI_ATTRIBUTES = frozenset(
+        ("wikidata_uri", "display_name")
+    )  # attributes the uri of an artist is minted from
+
     def __init__(
         self, display_name, nationality=None, wikidata_uri=None, date_of_birth=None
     ):  # defining the class and its parameters (parameters found in the MET dataset but also through enritchment)
+        self._collections = None  # the collections holding the artist, notified of changes
+        self._uri = None  # the uri, minted once on first use
+        display_names = parse_list(
+            display_name
+        )  # parses the stringified list of names (or takes an already parsed list)
         self.display_name = (
-            eval(display_name)[0] if isinstance(display_name, str) else "Unknown"
-        )  # eval= parses string to python object
-        self.nationality = nationality
+            intern_value(display_names[0]) if display_names else "Unknown"
+        )  # names and nationalities repeat a lot, interning them shares one string object
+        self.nationality = intern_value(nationality)
         self.wikidata_uri = wikidata_uri
         self.date_of_birth = date_of_birth
 
+    def __setattr__(
+        self, name, value
+    ):  # assigning an attribute tells the collections holding the artist that its RDF has to be updated
+        object.__setattr__(self, name, value)
+        if name in self.URI_ATTRIBUTES:  # the uri has to be minted again
+            object.__setattr__(self, "_uri", None)
+        if self._collections and not name.startswith("_"):
+            self.mark_changed()
+
+    def __getstate__(
+        self,
+    ):  # pickled without the collections holding it (e.g. when sent to a worker process)
+        return {
+            name: getattr(self, name)
+            for name in Artist.__slots__
+            if name != "_collections"
+        }
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "_collections", None)
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def mark_changed(self):  # can also be called by hand after changing an attribute in place
+        for collection in self._collections or ():
+            collection._mark_dirty(self)
+
     @classmethod
     def from_dataframe(
         cls, df: pd.DataFrame, index: int
@@ -30,54 +76,51 @@ class Artist:
             df.loc[index, "Artist Wikidata URL"],
         )
 
-    def to_rdf(self):  # creates a rdf-graph for artist
-        g = Graph()
-
-        CRM = Namespace(
-            "http://www.cidoc-crm.org/cidoc-crm/"
-        )  # defining the ontologies
-        DC = Namespace("http://purl.org/dc/elements/1.1/")
-        EX = Namespace("http://w3id.org/example/")
-        FOAF = Namespace("http://xmlns.com/foaf/0.1/")
-        Schema = Namespace("http://schema.org/")
-
-        g.bind(
-            "crm", CRM
-        )  # binding the abbreviation to the graph so when we serialize it, it will use #crm:something instead of the full namespace
-        g.bind("dc", DC)
-        g.bind("ex", EX)
-
-        if (
-            self.wikidata_uri is None
-            or pd.isna(self.wikidata_uri)
-            or self.wikidata_uri == "nan"
-        ):
-            self.wikidata_uri = f'http://w3id.org/example/artist/{self.display_name.replace(" ", "_")}'  # if there is no wikidata_uri in the dataframe, this line creates one out of the display_name. Spaces have to be replaced by _ to create a valid link.
-        artist_uri = URIRef(
-            self.wikidata_uri
-        )  # creates a artist_uri out of the wikidata_uri
-
-        g.add(
-            (artist_uri, RDF.type, CRM["E21_Person"])
-        )  # adds triples using the ontologies
-        g.add((artist_uri, FOAF.name, Literal(self.display_name)))
-        g.add((artist_uri, Schema.nationality, Literal(self.nationality)))
+    def to_rdf(
+        self, graph=None
+    ):  # creates a rdf-graph for artist, or adds the triples to an existing graph
+        if graph is None:
+            graph = bind_namespaces(
+                Graph()
+            )  # binding the abbreviations (crm, dc, ex, ...) to the graph so when we serialize it, it will use #crm:something instead of the full namespace
+
+        graph.addN((s, p, o, graph) for s, p, o in self.triples())
+
+        return graph
+
+    def uri(self):  # returns the uri of the artist in the rdf graph without changing its attributes
+        if self._uri is None:
+            self._uri = object_uri(
+                self.wikidata_uri, "artist", self.display_name
+            )  # the wikidata_uri, or if there is none an uri minted from the display_name (see uris.mint_uri). Artists are identified by their name, so artists with the same name share it
+        return self._uri
+
+    def triples(self):  # generates the rdf triples for artist
+        artist_uri = self.uri()
+
+        yield (
+            artist_uri,
+            RDF.type,
+            CRM["E21_Person"],
+        )  # yields triples using the ontologies
+        yield (artist_uri, FOAF.name, Literal(self.display_name))
+        yield (artist_uri, Schema.nationality, Literal(self.nationality))
 
         if self.date_of_birth:
-            g.add(
-                (artist_uri, Schema.birthDate, Literal(self.date_of_birth))
+            yield (
+                artist_uri,
+                Schema.birthDate,
+                Literal(self.date_of_birth),
             )  # adds a birth date if there is one
 
-        return g
-
     def print_rdf(self):  # prints the rdf graph in a turtle format
         graph = self.to_rdf()
 
         print(graph.serialize(format="turtle"))
 
     def wikidata_enrich(
-        self,
-    ):  # enriches the class information using a SPARQL querie to wikidata
+        self, endpoint=WIKIDATA_URL
+    ):  # enriches the class information using a SPARQL querie to wikidata (or another endpoint)
 
         if not isinstance(
             self.wikidata_uri, str
@@ -85,30 +128,16 @@ class Artist:
             print("wikidata_uri is not a str, skipping enrichment.")
             return
 
-        sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
-        sparql.setReturnFormat(JSON)
-
-        qid = self.wikidata_uri.split("/")[-1]  # queries the optional birth date
-        query = f"""
-        SELECT ?date_of_birth WHERE {{
-            OPTIONAL {{ wd:{qid} wdt:P569 ?date_of_birth . }}
-            
-        }}
-        LIMIT 1
-        """
-        try:  # sends the query to wikidata to look if there is any infomation that was asked for
-            sparql.setQuery(query)
-            results = sparql.query().convert()
-            for result in results["results"][
-                "bindings"
-            ]:  # if there is information it gets saved
-                date_of_birth = result.get("date_of_birth", {}).get("value", "")
-                self.date_of_birth = date_of_birth
-
-        except Exception as e:
-            print(
-                f"Error querying {qid}: {e}"
-            )  # prints a error if the query doesn't work
+        qid = qid_from_uri(self.wikidata_uri)
+        if qid is None:  # e.g. an uri that does not point to a Wikidata entity
+            print(f"{self.wikidata_uri} is not a Wikidata entity, skipping enrichment.")
+            return
+
+        dates_of_birth = query_dates_of_birth(
+            [qid], endpoint
+        )  # queries the optional birth date, errors are printed by the query
+        if qid in dates_of_birth:  # if there is information it gets saved
+            self.date_of_birth = dates_of_birth[qid]
 
     def visualize_graph(self):  # visualizes the rdf graph for artist
         visualize_rdf_graph(self.to_rdf())
@@ -2,10 +2,13 @@ from .Artist import Artist
 
 
 class ArtistPainter(Artist):  # creates a subclass in the class artist
+    __slots__ = ()
+    KEYWORD = "painter"  # the display name must contain it (case-insensitive), see dispatch.classify_artists
+
     def __init__(
         self, display_name, nationality=None, wikidata_uri=None, date_of_birth=None
     ):  # defining the class and its parameters (parameters found in the MET dataset but also through enritchment)
         super().__init__(display_name, nationality, wikidata_uri, date_of_birth)
 
-        if "painter" not in self.display_name.lower():
+        if self.KEYWORD not in self.display_name.lower():
             raise ValueError("Artist is not a painter.")
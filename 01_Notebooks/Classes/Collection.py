@@ -1,21 +1,39 @@
 # importing external used in the different functions
+import gzip
+import itertools
+import uuid
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import requests
-import matplotlib.dates as mdates
-from rdflib import Graph, Namespace, URIRef
+from rdflib import Graph
 
 
 # import of the other classes of the project
+from Classes.aggregates import get_aggregates, plot_cumulative_counts
 from Classes.Artifact import Artifact
 from Classes.Artist import Artist
+from Classes.dispatch import classify_artifacts, classify_artists
+from Classes.indexes import HashIndex, SortedIndex
+from Classes.namespaces import CRM, bind_namespaces
+from Classes.storage import COLLECTION_COLUMNS, read_parquet
+from Classes.utils import parse_list_column, parse_year_column
+from Classes.wikidata import (
+    WIKIDATA_URL,
+    qid_from_uri,
+    query_dates_of_birth,
+    query_descriptions,
+)
 
 
-# needed for the function to enrich the data
-CLEVELAND_URL = (
-    "https://openaccess-api.clevelandart.org/api/artworks/"  # Cleveland Museum of Art
-)
-CHICAGO_URL = "https://api.artic.edu/api/v1/artworks/search"  # Art Institut of Chichaco
+# artifact attributes with an index for Collection.query
+HASH_INDEXED_ATTRIBUTES = ["culture", "classification", "department", "author_name"]
+SORTED_INDEXED_ATTRIBUTES = ["accessionYear", "cm_value"]
+
+# larger graphs are drawn with the scalable mode of visualize_rdf_graph
+SCALABLE_VISUALIZATION_TRIPLES = 500
+
+# formats supported by export_rdf and their rdflib serializer names
+RDF_EXPORT_FORMATS = {"nt": "nt", "ttl": "turtle"}
 
 
 class Collection:
@@ -25,6 +43,134 @@ class Collection:
         self.artists = []  # List of Artist objects
         self.artifacts = []  # List of Artifact objects
 
+        # indexes by artist name, kept up to date by add_artist / add_artifact so that
+        # to_rdf can link creators to their works without comparing every pair
+        self._artists_by_name = {}  # display_name -> list of Artist objects
+        self._artifacts_by_author = {}  # author_name -> list of Artifact objects
+
+        # secondary indexes over the positions of the artifacts in self.artifacts, used by query
+        self._hash_indexes = {
+            attribute: HashIndex() for attribute in HASH_INDEXED_ATTRIBUTES
+        }
+        self._sorted_indexes = {
+            attribute: SortedIndex() for attribute in SORTED_INDEXED_ATTRIBUTES
+        }
+        self._tag_index = HashIndex()  # inverted index: tag -> artifacts
+        self._indexes_stale = False  # an artifact changed after it was indexed, rebuilt by the next query
+
+        # persistent RDF graph, built by the first to_rdf and afterwards only updated for the objects
+        # that were added or changed since (they mark themselves dirty, see Artifact.mark_changed)
+        self._graph = None
+        self._dirty = set()
+        self._rdf_records = {}  # object -> (name it is indexed under, triples it contributes)
+        self._triple_counts = {}  # triple -> number of objects contributing it
+        self._artist_uris = {}  # display_name -> distinct uris of the artists with that name
+        self._graph_version = 0  # increased whenever the graph changes
+        self._sparql_store = None  # store answering sparql, see sparql / sparql_store
+        self._change_count = 0  # increased whenever an object is added or changed, fingerprints the aggregates
+        self._token = uuid.uuid4().hex  # identifies the collection in fingerprints and store versions (ids of dropped objects are reused)
+        self._names_synced_at = 0  # _change_count when the name indexes were last rebuilt
+
+    @classmethod
+    def from_dataframe(
+        cls, name, df: pd.DataFrame, rows=None, compact=False, typed=False
+    ):
+        # builds a whole collection from the cleaned MET dataframe in one pass instead of calling
+        # Artifact.from_dataframe and Artist.from_dataframe row by row.
+        # rows can be a boolean mask, a range/list of index labels or a slice (passed to df.loc).
+        # With compact=True every distinct artist is added only once instead of once per row.
+        # With typed=True the rows are classified up front (see dispatch) and become ArtifactGreek /
+        # ArtifactRoman and ArtistPainter / ArtistPotter objects where they match, Artifact / Artist otherwise.
+        # df may also be a pyarrow Table or RecordBatch (e.g. a batch of a Parquet file)
+        if not isinstance(df, pd.DataFrame):
+            df = df.to_pandas()
+        if rows is not None:
+            df = df.loc[rows]
+
+        # the list-valued columns are parsed once per column, every distinct string only once
+        tags = parse_list_column(df["Tags"])
+        tags_aat = parse_list_column(df["Tags AAT URL"])
+        tags_wikidata = parse_list_column(df["Tags Wikidata URL"])
+        display_names = parse_list_column(df["Artist Display Name"])
+
+        accession_years = parse_year_column(df["AccessionYear"])
+        object_ids = (
+            df["Object ID"].tolist() if "Object ID" in df.columns else [None] * len(df)
+        )
+
+        collection = cls(name)
+
+        if typed:
+            artifact_classes = classify_artifacts(df["Culture"])
+            artist_classes = classify_artists(display_names)
+        else:
+            artifact_classes = itertools.repeat(Artifact)
+            artist_classes = itertools.repeat(Artist)
+
+        for artifact_class, values in zip(
+            artifact_classes,
+            zip(
+                df["Department"].tolist(),
+                accession_years,
+                df["Object Name"].tolist(),
+                df["Title"].tolist(),
+                df["Culture"].tolist(),
+                df["Period"].tolist(),
+                df["Medium"].tolist(),
+                df["Classification"].tolist(),
+                df["Credit Line"].tolist(),
+                df["Object Wikidata URL"].tolist(),
+                tags,
+                tags_aat,
+                tags_wikidata,
+                df["Dimensions"].tolist(),
+                df["cm_value"].tolist(),
+                display_names,
+                object_ids,
+            ),
+        ):
+            collection.add_artifact(artifact_class(*values))
+
+        # the cleaned CSV keeps the nationalities as stringified lists, Parquet as real lists (or None).
+        # Both end up as the same value, so the RDF does not depend on the storage format
+        nationalities = [
+            str(list(nationality))
+            if isinstance(nationality, (list, np.ndarray))
+            else np.nan if nationality is None else nationality
+            for nationality in df["Artist Nationality"].tolist()
+        ]
+
+        seen_artists = set()
+        for artist_class, display_name, nationality, wikidata_uri in zip(
+            artist_classes,
+            display_names,
+            nationalities,
+            df["Artist Wikidata URL"].tolist(),
+        ):
+            if compact:
+                key = tuple(
+                    None if pd.isna(value) else value
+                    for value in (
+                        display_name[0] if display_name else None,
+                        nationality,
+                        wikidata_uri,
+                    )
+                )
+                if key in seen_artists:
+                    continue
+                seen_artists.add(key)
+            collection.add_artist(artist_class(display_name, nationality, wikidata_uri))
+
+        return collection
+
+    @classmethod
+    def from_parquet(cls, name, path, filters=None, compact=False, typed=False):
+        # builds a collection from the Parquet form of the cleaned dataset (see storage.csv_to_parquet),
+        # reading only the columns the objects need. filters are pushed down to the reader,
+        # e.g. [("Culture", "==", "Roman")]. typed: see from_dataframe
+        df = read_parquet(path, columns=COLLECTION_COLUMNS, filters=filters)
+        return cls.from_dataframe(name, df, compact=compact, typed=typed)
+
     def add_artifact(
         self, artifact: Artifact
     ):  # adding the objects of the Artifact classes into the created Lists self.artifact
@@ -32,6 +178,33 @@ class Collection:
             raise TypeError("Expected an instance of Artifact")
 
         self.artifacts.append(artifact)
+        self._artifacts_by_author.setdefault(artifact.author_name, []).append(artifact)
+
+        artifact._collections = (artifact._collections or ()) + (self,)
+        self._mark_dirty(artifact, added=True)
+        self._index_artifact(artifact, len(self.artifacts) - 1)
+
+    def _index_artifact(self, artifact, position):
+        # adds an artifact to the indexes used by query
+        for attribute, index in self._hash_indexes.items():
+            index.add(getattr(artifact, attribute), position)
+        for attribute, index in self._sorted_indexes.items():
+            index.add(getattr(artifact, attribute), position)
+        if isinstance(artifact.tags, list):
+            self._tag_index.add_many(artifact.tags, position)
+
+    def _rebuild_indexes(self):
+        # indexes all artifacts again with their current values, after some of them changed
+        self._hash_indexes = {
+            attribute: HashIndex() for attribute in HASH_INDEXED_ATTRIBUTES
+        }
+        self._sorted_indexes = {
+            attribute: SortedIndex() for attribute in SORTED_INDEXED_ATTRIBUTES
+        }
+        self._tag_index = HashIndex()
+        for position, artifact in enumerate(self.artifacts):
+            self._index_artifact(artifact, position)
+        self._indexes_stale = False
 
     def add_artist(
         self, artist: Artist
@@ -40,111 +213,495 @@ class Collection:
             raise TypeError("Expected an instance of Artist")
 
         self.artists.append(artist)
-
-    def to_rdf(self):
+        self._artists_by_name.setdefault(artist.display_name, []).append(artist)
+
+        artist._collections = (artist._collections or ()) + (self,)
+        self._mark_dirty(artist, added=True)
+
+    def query(
+        self,
+        culture=None,
+        classification=None,
+        department=None,
+        author=None,
+        tag=None,
+        year_range=None,
+        cm_range=None,
+    ):
+        # finds the artifacts matching all given criteria using the indexes instead of scanning the list:
+        # exact values for culture, classification, department, author (author_name) and tag,
+        # (low, high) bounds for year_range (accessionYear) and cm_range (cm_value), None for an open end.
+        # After an artifact changed (see Artifact.mark_changed) the indexes are rebuilt once, by the next query.
+        # Returns the matching artifacts in the order they were added
+        if self._indexes_stale:
+            self._rebuild_indexes()
+
+        exact = []  # sets of positions
+        ranges = []  # (number of matches, index, low, high)
+        for attribute, value in (
+            ("culture", culture),
+            ("classification", classification),
+            ("department", department),
+            ("author_name", author),
+        ):
+            if value is not None:
+                exact.append(self._hash_indexes[attribute].lookup(value))
+        if tag is not None:
+            exact.append(self._tag_index.lookup(tag))
+        for attribute, bounds in (("accessionYear", year_range), ("cm_value", cm_range)):
+            if bounds is not None:
+                index = self._sorted_indexes[attribute]
+                ranges.append((index.count(*bounds), index, *bounds))
+
+        if not exact and not ranges:
+            return list(self.artifacts)
+
+        # start from the most selective criterion and narrow it down with the others
+        exact.sort(key=len)
+        ranges.sort(key=lambda criterion: criterion[0])
+        if exact and (not ranges or len(exact[0]) <= ranges[0][0]):
+            positions = set(exact[0])
+            exact = exact[1:]
+        else:
+            _, index, low, high = ranges.pop(0)
+            positions = set(index.range(low, high))
+
+        for other in exact:
+            positions &= other
+        for count, index, low, high in ranges:
+            if count <= 4 * len(positions):
+                positions.intersection_update(index.range(low, high))
+            else:
+                # a wide range: checking the few remaining positions is cheaper than collecting it
+                positions = {
+                    position for position in positions if index.contains(position, low, high)
+                }
+
+        return [self.artifacts[position] for position in sorted(positions)]
+
+    def to_rdf(self, graph=None, workers=None):
         # returns an rdflib.Graph with all RDF triples from the collection –
         # artifacts and their creators must be linked!
         # **Not every single attribute needs to be represented in RDF, keep it simple as a proof of concept**
-
-        g_artist_plus_artifact = Graph()
-        CRM = Namespace(
-            "http://www.cidoc-crm.org/cidoc-crm/"
-        )  # creating a namespace object
-        g_artist_plus_artifact.bind(
-            "crm", CRM
-        )  # binding it to the graph so when we serialize it, it will use
-        # crm:something instead of the full namespace
-
+        # The collection keeps its graph: the first call builds it, later calls only update the triples of
+        # the objects added or changed since, so they cost time proportional to the edit.
+        # Returns that graph, if a graph is passed, the triples are added to it instead.
+        # With workers > 1 a separate graph is built from scratch instead: the collection is split into
+        # shards whose N-Triples are produced in that many processes and then loaded into the graph
+
+        if workers is not None and workers > 1:
+            from Classes.parallel import iter_shard_rdf
+
+            graph = bind_namespaces(Graph() if graph is None else graph)
+            for data in iter_shard_rdf(self, workers):
+                graph.parse(data=data, format="nt")
+            return graph
+
+        if self._graph is None:
+            # names changed before are only noticed from now on, so the name indexes are rebuilt once
+            self._sync_name_indexes()
+            self._graph = bind_namespaces(
+                Graph()
+            )  # binding the prefixes to the graph so when we serialize it, it will use
+            # crm:something instead of the full namespace
+            self._dirty.update(self.artists)
+            self._dirty.update(self.artifacts)
+        self._update_graph()
+
+        if graph is None:
+            return self._graph
+        graph.addN((s, p, o, graph) for s, p, o in self._graph)
+        return bind_namespaces(graph)
+
+    def _mark_dirty(self, obj, added=False):
+        # called when an object of the collection is added or changed. Nothing has to be tracked
+        # before the graph is built
+        self._change_count += 1
+        if not added and isinstance(obj, Artifact):
+            self._indexes_stale = True
+        if self._graph is not None:
+            self._dirty.add(obj)
+
+    def _sync_name_indexes(self):
+        # brings _artists_by_name / _artifacts_by_author up to date with the current names before they are
+        # read. Once the graph is built, updating it moves the changed objects. Before, changes are not
+        # tracked per object, so the indexes (and the cached artist uris) are rebuilt if anything changed
+        if self._graph is not None:
+            self._update_graph()
+            return
+        if self._names_synced_at == self._change_count:
+            return
+        self._artists_by_name = {}
         for artist in self.artists:
-            g_artist_plus_artifact += artist.to_rdf()
+            self._artists_by_name.setdefault(artist.display_name, []).append(artist)
+        self._artifacts_by_author = {}
         for artifact in self.artifacts:
-            g_artist_plus_artifact += artifact.to_rdf()
-
-        for artist in self.artists:
-            for artifact in self.artifacts:
-                if artist.display_name == artifact.author_name:
-                    if (
-                        artist.wikidata_uri is None
-                        or pd.isna(artist.wikidata_uri)
-                        or artist.wikidata_uri == "nan"
-                    ):
-                        artist.wikidata_uri = f'http://w3id.org/example/artist/{artist.display_name.replace(" ", "_")}'  # if there is no wikidata_uri in the dataframe, this line creates one out of the display_name. Spaces have to be replaced by _ to create a valid link.
-                    artist_uri = URIRef(
-                        artist.wikidata_uri
-                    )  # creates a artist_uri out of the wikidata_uri
-                    if (
-                        artifact.objectWikidataURL is None
-                        or pd.isna(artifact.objectWikidataURL)
-                        or artifact.objectWikidataURL == "nan"
-                    ):
-                        artifact.objectWikidataURL = f"http://w3id.org/example/artifact/{artifact.title.replace(' ', '_')}"
-                    artifact_uri = URIRef(artifact.objectWikidataURL)
-                    g_artist_plus_artifact.add(
-                        (artist_uri, CRM["P94_has_created"], artifact_uri)
-                    )
-
-        return g_artist_plus_artifact
+            self._artifacts_by_author.setdefault(artifact.author_name, []).append(
+                artifact
+            )
+        self._artist_uris = {}
+        self._names_synced_at = self._change_count
+
+    def _update_graph(self):
+        # brings the graph up to date with the dirty objects: their old triples are replaced by the new ones.
+        # Triples are reference counted, so a triple shared by several objects (e.g. the description of a tag,
+        # or duplicate artists) stays in the graph as long as one object still contributes it
+        dirty = self._dirty
+        if not dirty:
+            return
+        self._dirty = set()
+        self._graph_version += 1
+        added = []
+
+        # artists first, artifacts whose creator links depend on them are updated afterwards
+        dirty_artifacts = {obj for obj in dirty if isinstance(obj, Artifact)}
+        names = set()
+        for artist in dirty - dirty_artifacts:
+            old_name = self._replace_triples(
+                artist, artist.display_name, artist.triples(), added
+            )
+            if old_name != artist.display_name:  # renamed: move it in the name index
+                self._artists_by_name[old_name].remove(artist)
+                self._artists_by_name.setdefault(artist.display_name, []).append(artist)
+            names.update((old_name, artist.display_name))
+        # the links of the artifacts only change if the distinct uris of the artists with their name do
+        for name in names:
+            uris = self._artist_uris.pop(name, None)
+            if uris != self._uris_of_artists(name):
+                dirty_artifacts.update(self._artifacts_by_author.get(name, ()))
+
+        for artifact in dirty_artifacts:
+            old_name = self._replace_triples(
+                artifact,
+                artifact.author_name,
+                itertools.chain(artifact.triples(), self._links(artifact)),
+                added,
+            )
+            if old_name != artifact.author_name:
+                self._artifacts_by_author[old_name].remove(artifact)
+                self._artifacts_by_author.setdefault(artifact.author_name, []).append(
+                    artifact
+                )
 
-    def visualize_metadata(self):
-        # generates visualizations from the raw dataset (e.g. pie charts, bar charts) up to you which ones
+        self._graph.addN((s, p, o, self._graph) for s, p, o in added)
+
+    def _replace_triples(self, obj, name, triples, added):
+        # records the new triples of an object, removes the triples no object contributes anymore from the
+        # graph and collects the ones that are new to it in added. Returns the name the object was indexed
+        # under when its triples were last recorded
+        counts = self._triple_counts
+        triples = tuple(dict.fromkeys(triples))  # without duplicates, in order
+        old_name, old_triples = self._rdf_records.get(obj, (name, ()))
+        self._rdf_records[obj] = (name, triples)
+
+        if old_triples:
+            old_set = set(old_triples)
+            new_set = set(triples)
+            for triple in old_set - new_set:
+                counts[triple] -= 1
+                if not counts[triple]:
+                    del counts[triple]
+                    self._graph.remove(triple)
+            triples = [triple for triple in triples if triple not in old_set]
+
+        for triple in triples:
+            count = counts.get(triple, 0)
+            counts[triple] = count + 1
+            if not count:
+                added.append(triple)
+        return old_name
+
+    def _links(self, artifact):
+        # generates the P94_has_created triples linking the artists named like the author to the artifact,
+        # once per distinct artist uri
+        artifact_uri = artifact.uri()
+        for artist_uri in self._uris_of_artists(artifact.author_name):
+            yield (artist_uri, CRM["P94_has_created"], artifact_uri)
+
+    def _uris_of_artists(self, name):
+        # the distinct uris of the artists with a name, cached until one of them changes
+        if name not in self._artist_uris:
+            self._artist_uris[name] = tuple(
+                dict.fromkeys(
+                    artist.uri() for artist in self._artists_by_name.get(name, ())
+                )
+            )
+        return self._artist_uris[name]
+
+    def triples(self):
+        # generates all triples of the collection one after another (artists, artifacts and the links
+        # between them), so they can be streamed without building the whole graph first.
+        # Artists are added once per row, identical duplicates are only emitted once
+        self._sync_name_indexes()
+        for artists in self._artists_by_name.values():
+            seen = set()
+            for artist in artists:
+                artist_triples = tuple(artist.triples())
+                if artist_triples not in seen:
+                    seen.add(artist_triples)
+                    yield from artist_triples
 
-        df = pd.read_csv("../Data/MetObjects_Cleaned.csv", low_memory=False)
-        df["AccessionYear"] = pd.to_datetime(df["AccessionYear"], errors="coerce")
+        for artifact in self.artifacts:
+            yield from artifact.triples()
+
+        # only names that appear both as artist and as author have to be linked.
+        # Duplicate artists (same name and uri) are collapsed and every artifact
+        # is linked once per distinct artist uri
+        for name, artists in self._artists_by_name.items():
+            artifacts = self._artifacts_by_author.get(name)
+            if not artifacts:
+                continue
+
+            artist_uris = set(artist.uri() for artist in artists)
+            for artifact in artifacts:
+                artifact_uri = artifact.uri()
+                for artist_uri in artist_uris:
+                    yield (artist_uri, CRM["P94_has_created"], artifact_uri)
+
+    def export_rdf(
+        self, path, format="nt", chunk_size=10000, compress=None, workers=None
+    ):
+        # writes the RDF of the collection to a file without holding the whole graph or its serialization
+        # in memory: the triples are streamed from the objects and serialized chunk by chunk
+        # (chunk_size triples at a time). format is "nt" (N-Triples, one triple per line) or "ttl"
+        # (Turtle, every chunk is grouped by subject and uses the crm:/dc:/... prefixes).
+        # The file is gzip-compressed if compress is True or, by default, if the path ends with ".gz".
+        # With workers > 1 the collection is split into that many shards serialized in parallel processes,
+        # their outputs are written one after another (see parallel.speedup_curve to compare)
+        if format not in RDF_EXPORT_FORMATS:
+            raise ValueError(
+                f"Unsupported format {format!r}, expected one of {sorted(RDF_EXPORT_FORMATS)}"
+            )
+        if compress is None:
+            compress = str(path).endswith(".gz")
+
+        open_file = gzip.open if compress else open
+        self._sync_name_indexes()
+        if workers is not None and workers > 1:
+            from Classes.parallel import iter_shard_rdf
+
+            with open_file(path, "wb") as f:
+                for data in iter_shard_rdf(self, workers, RDF_EXPORT_FORMATS[format]):
+                    f.write(data)
+            return
+
+        triples = self.triples()
+        with open_file(path, "wb") as f:
+            while True:
+                chunk = bind_namespaces(Graph())
+                chunk.addN(
+                    (s, p, o, chunk) for s, p, o in itertools.islice(triples, chunk_size)
+                )
+                if not len(chunk):
+                    break
+                chunk.serialize(
+                    destination=f, format=RDF_EXPORT_FORMATS[format], encoding="utf-8"
+                )
 
-        date_counts = df["AccessionYear"].value_counts().sort_index()
-        cumulative_counts = date_counts.cumsum()
+    def sparql_store(self, path=None, backend=None):
+        # loads the RDF of the collection into a SparqlStore (by default Oxigraph if installed, else rdflib).
+        # With a path the store is written to disk: later sessions can open it with SparqlStore(path) and
+        # query it right away, without building the collection or parsing Turtle again.
+        # It can also be served over HTTP with store.serve()
+        from Classes.sparql_store import SparqlStore
+
+        store = SparqlStore(path, backend)
+        store.load(self.to_rdf(), version=(self._token, self._graph_version))
+        return store
+
+    def sparql(self, query, store=None):
+        # runs a SPARQL query over the RDF of the collection, the prefixes crm:, dc:, foaf:, ... are predeclared.
+        # By default the store is kept with the collection and only reloaded when the collection changed since
+        # the last query. A store from sparql_store can be passed instead, it is brought up to date the same way.
+        # Returns a list of dicts for SELECT, a bool for ASK and a graph for CONSTRUCT / DESCRIBE
+        graph = self.to_rdf()  # updates the graph and the version
+        if store is None:
+            if self._sparql_store is None:
+                from Classes.sparql_store import SparqlStore
+
+                self._sparql_store = SparqlStore()
+            store = self._sparql_store
+        version = (self._token, self._graph_version)
+        if store.version != version:
+            store.load(graph, version=version)
+        return store.query(query)
+
+    def wikidata_enrich(self, batch_size=50, endpoint=WIKIDATA_URL):
+        # enriches all artifacts and artists of the collection at once: the distinct QIDs of all tags and
+        # artists are resolved with batched VALUES queries (batch_size QIDs per query) instead of one
+        # query per tag / artist, the results are then fanned back out to enriched_tags and date_of_birth
+
+        tag_qids = {
+            qid_from_uri(uri)
+            for artifact in self.artifacts
+            if isinstance(artifact.tagsWikidataURL, list)
+            for uri in artifact.tagsWikidataURL
+        }
+        tag_qids.discard(None)
+        descriptions = query_descriptions(tag_qids, endpoint, batch_size)
+        for artifact in self.artifacts:
+            artifact.enrich_tags(descriptions)
 
-        # Plot
-        fig, ax = plt.subplots(figsize=(10, 4))
-        ax.plot(cumulative_counts.index, cumulative_counts.values, marker="o")
-        ax.set_title("Number of Items over Time")
-        ax.set_xlabel("Year")
-        ax.set_ylabel("Number of Items")
-        ax.grid(True)
+        artist_qids = {qid_from_uri(artist.wikidata_uri) for artist in self.artists}
+        artist_qids.discard(None)
+        dates_of_birth = query_dates_of_birth(artist_qids, endpoint, batch_size)
+        for artist in self.artists:
+            qid = qid_from_uri(artist.wikidata_uri)
+            if qid in dates_of_birth and artist.date_of_birth != dates_of_birth[qid]:
+                artist.date_of_birth = dates_of_birth[qid]
 
-        # Set x-axis ticks every 25 years
-        ax.xaxis.set_major_locator(mdates.YearLocator(25))
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
-        plt.xticks(rotation=45)
+    def visualize_metadata(self, path="../Data/MetObjects_Cleaned.csv", cache=None):
+        # generates visualizations from the raw dataset (e.g. pie charts, bar charts) up to you which ones
 
-        plt.tight_layout()
-        plt.show()
+        # the summaries are computed once per version of the dataset (path may also point to its Parquet form,
+        # None uses the artifacts of this collection) and cached, so redrawing does not read the dataset again.
+        # aggregates.dashboard draws all charts of meta_data_visualizations.ipynb from the same cache
+        aggregates = get_aggregates(self if path is None else path, cache)
+        plot_cumulative_counts(aggregates)
 
-    def visualize_rdf(self):
-        # generates RDF visualizations
+    def visualize_rdf(self, output=None, scalable=None, **options):
+        # generates RDF visualizations.
+        # Collections with more than SCALABLE_VISUALIZATION_TRIPLES triples (or with scalable=True) use the
+        # scalable mode of visualize_rdf_graph: titles, types, ... become node attributes, the layout is fast
+        # and cached. output can be a ".html" (interactive) or ".gexf" path to export instead of plotting,
+        # further options (predicates, node_filter, cache_dir, ...) are passed on, see graph_viz.visualize
 
         from Classes.utils import visualize_rdf_graph
 
-        visualize_rdf_graph(self.to_rdf())
-
-    def cross_api_enrich(self, limit=1):
+        graph = self.to_rdf()
+        if scalable is None:
+            scalable = output is not None or len(graph) > SCALABLE_VISUALIZATION_TRIPLES
+        if not scalable:
+            return visualize_rdf_graph(graph)
+        return visualize_rdf_graph(graph, scalable=True, output=output, **options)
+
+    def similar_artworks_all(self, limit=5, client=None, index=None):
+        # batch version of Artifact.similar_artworks: the Chicago and Cleveland searches of all artifacts
+        # are sent concurrently (and only once per distinct culture) through a MuseumClient.
+        # With an index (search_index.SearchIndex) they are answered offline instead, once per culture.
+        # Returns one list of similar artworks per artifact, in the order of self.artifacts
+
+        if index is not None:
+            by_culture = {}
+            for artifact in self.artifacts:
+                if artifact.classification and artifact.culture not in by_culture:
+                    by_culture[artifact.culture] = artifact.similar_artworks_offline(
+                        index, limit
+                    )
+            return [
+                list(by_culture[artifact.culture]) if artifact.classification else []
+                for artifact in self.artifacts
+            ]
+
+        from Classes.museum_client import MuseumClient
+
+        own_client = client is None  # a client created here is closed again when the responses are in
+        client = client or MuseumClient()
+        try:
+            searchable = [
+                artifact for artifact in self.artifacts if artifact.classification
+            ]
+            requests_ = []
+            for artifact in searchable:
+                requests_.append((client.chicago_url, artifact.chicago_params(limit)))
+                requests_.append((client.cleveland_url, artifact.cleveland_params(limit)))
+            responses = iter(client.get_many(requests_))
+        finally:
+            if own_client:
+                client.close()
+
+        similar = {}
+        for artifact in searchable:
+            results = []
+            for parse, response, source in (
+                (artifact.parse_chicago, next(responses), "Chicago"),
+                (artifact.parse_cleveland, next(responses), "Cleveland"),
+            ):
+                if isinstance(response, Exception):
+                    print(f"Error fetching from {source}: {response}")
+                else:
+                    results += parse(response)
+            similar[id(artifact)] = results
+
+        return [similar.get(id(artifact), []) for artifact in self.artifacts]
+
+    def cross_api_enrich(self, limit=1, client=None, index=None):
         # finds additional works by the artists in the collection from the AIC or Cleveland API,
         # adds the items to the collection (with the metadata that they have from the APIs,
         # so you should consider about their metadata as well when you create attributes.
-        # Remember you can put default attributes as None for things that are not shared between the APIs
+        # Remember you can put default attributes as None for things that are not shared between the APIs.
+        # Every artist name is searched once, up to limit works per museum are kept for it.
+        # With an index (search_index.SearchIndex of mirrored records) nothing is sent over the network:
+        # the works are looked up locally by normalized (or fuzzily matched) artist name
 
-        additional_works = []
+        names = list(dict.fromkeys(artist.display_name for artist in self.artists))
 
-        for artist in self.artists:
+        if index is not None:
+            additional_works = []
+            for name in names:
+                for record in index.match_artist(name, limit, "aic"):
+                    additional_works.append(
+                        {
+                            "source": "Art Institut of Chicago",
+                            "id": record["id"],
+                            "title": record["title"],
+                            "date": record["date"] or "Unknown",
+                            "url": record["url"],
+                            "artist": record["artist"] or "Unknown",
+                        }
+                    )
+                for record in index.match_artist(name, limit, "cleveland"):
+                    additional_works.append(
+                        {
+                            "source": "Cleveland Museum of Art",
+                            "id": record["id"],
+                            "title": record["title"],
+                            "url": record["url"],
+                            "artist": record["artist"] or "Unknown",
+                        }
+                    )
+            return additional_works
+
+        from Classes.museum_client import MuseumClient
+        from Classes.search_index import normalize_name
+
+        own_client = client is None  # a client created here is closed again when the responses are in
+        client = client or MuseumClient()
+
+        requests_ = []
+        for name in names:
             # parameter of the two museum that we use to enrich the data
             # Art Institut of Chichaco
             chicago_params = {
-                "q": artist.display_name,
+                "q": name,
                 "limit": limit,  # limit (int): Number of results to return
                 "fields": "id,title, artist_title",  # concentrating on the id and title for now
             }
             # Cleveland Museum of Art
             cleveland_params = {
-                "q": artist.display_name,
+                "q": name,
                 "limit": limit,  # limit (int): Number of results to return
             }
+            requests_.append((client.chicago_url, chicago_params))
+            requests_.append((client.cleveland_url, cleveland_params))
+
+        # all searches are sent concurrently, failed ones are returned as exceptions
+        try:
+            responses = iter(client.get_many(requests_))
+        finally:
+            if own_client:
+                client.close()
+
+        filtered_works = []
+        for name in names:
+            additional_works = []
 
             # search for additional artefacts in the Art Institut of Chicago
             # results will be stored in the list additional_works with their institution, id, title, date and the corresponding url
             try:
-                response_chicago = requests.get(CHICAGO_URL, params=chicago_params)
-                response_chicago.raise_for_status()
-                data = response_chicago.json()
+                data = next(responses)
+                if isinstance(data, Exception):
+                    raise data
                 for item in data.get("data", []):
                     additional_works.append(
                         {
@@ -162,12 +719,9 @@ class Collection:
             # search for additional artfacts in the Cleveland Museum of Art
             # results will be stored in the list additional_works with their Institut, id, title and url
             try:
-                response_cleveland = requests.get(
-                    CLEVELAND_URL, params=cleveland_params
-                )
-                response_cleveland.raise_for_status()
-
-                data = response_cleveland.json()
+                data = next(responses)
+                if isinstance(data, Exception):
+                    raise data
 
                 for result in data.get("data", []):
                     artist_name = "Unknown"
@@ -187,10 +741,13 @@ class Collection:
                     )
             except Exception as e:
                 print(f"Error fetching similar artworks: {e}")
-                return []
 
-        filtered_works = [
-            work for work in additional_works if artist.display_name in work["artist"]
-        ]
+            # the full-text searches also return works that only mention the artist, keep the artist's own works
+            normalized = normalize_name(name)
+            filtered_works += [
+                work
+                for work in additional_works
+                if normalized and normalized in normalize_name(work["artist"])
+            ]
 
-        return filtered_works[:limit * 2]
+        return filtered_works
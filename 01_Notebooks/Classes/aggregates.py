@@ -0,0 +1,434 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+import pandas as pd
+
+from .storage import load_columns
+from .utils import parse_list_column, parse_year_column
+
+# columns of the cleaned MET dataset the metadata charts are computed from
+AGGREGATE_COLUMNS = [
+    "AccessionYear",
+    "Credit Line",
+    "Culture",
+    "Tags",
+    "cm_value",
+    "Classification",
+    "Medium",
+]
+
+# Artifact attribute of each column, to aggregate a Collection
+ARTIFACT_ATTRIBUTES = {
+    "AccessionYear": "accessionYear",
+    "Credit Line": "creditLine",
+    "Culture": "culture",
+    "Tags": "tags",
+    "cm_value": "cm_value",
+    "Classification": "classification",
+    "Medium": "medium",
+}
+
+
+def aggregate_frame(source):
+    """
+    Collect the columns the aggregates are computed from.
+
+    Args:
+        source (Collection, pd.DataFrame or str): A collection, the cleaned dataset, or the path of its
+            CSV or Parquet form (only the needed columns are read).
+
+    Returns:
+        pd.DataFrame: AGGREGATE_COLUMNS with real lists in Tags, a float "Year" instead of AccessionYear
+        and plain (not categorical) text columns.
+    """
+    if hasattr(source, "artifacts"):
+        df = pd.DataFrame(
+            {
+                column: [getattr(artifact, attribute) for artifact in source.artifacts]
+                for column, attribute in ARTIFACT_ATTRIBUTES.items()
+            }
+        )
+    elif isinstance(source, pd.DataFrame):
+        df = source[AGGREGATE_COLUMNS].copy()
+    else:
+        df = load_columns(source, AGGREGATE_COLUMNS)
+
+    df["Tags"] = parse_list_column(df["Tags"])
+    if hasattr(source, "artifacts"):  # artifacts already hold the year
+        df["Year"] = pd.to_numeric(df.pop("AccessionYear"), errors="coerce")
+    else:
+        df["Year"] = parse_year_column(df.pop("AccessionYear"))
+    df["cm_value"] = pd.to_numeric(df["cm_value"], errors="coerce")
+    for column in ("Credit Line", "Culture", "Classification", "Medium"):
+        df[column] = df[column].astype(object)
+    return df
+
+
+def top_by_bin(df, column, top=10):
+    """
+    Count the most common values of a column per bin of years.
+
+    Args:
+        df (pd.DataFrame): Frame with a "YearBin" column.
+        column (str): The column to count.
+        top (int): Values kept per bin.
+
+    Returns:
+        pd.DataFrame: YearBin, value and Count of the `top` values of every bin.
+    """
+    return (
+        df.groupby("YearBin")[column]
+        .value_counts()
+        .groupby("YearBin")
+        .head(top)
+        .reset_index(name="Count")
+    )
+
+
+def compute_aggregates(source, top=10, bin_size=50):
+    """
+    Compute every summary the metadata charts need in one go.
+
+    Args:
+        source (Collection, pd.DataFrame or str): See `aggregate_frame`.
+        top (int): Number of values kept in the top-n summaries.
+        bin_size (int): Width of the year bins in years.
+
+    Returns:
+        dict: The summaries (pandas Series / DataFrames), keyed by name:
+        year_counts, cumulative_counts, credit_lines, cultures, tags, avg_size_by_year,
+        classification_medium, tags_by_bin, classifications_by_bin, mediums_by_bin.
+    """
+    df = aggregate_frame(source)
+    tags = df[["Year", "Tags"]].explode("Tags").dropna(subset=["Tags"])
+
+    year_counts = df["Year"].value_counts().sort_index()
+    year_counts.index = year_counts.index.astype(int)
+
+    avg_size_by_year = df.groupby("Year")["cm_value"].mean()
+    avg_size_by_year.index = avg_size_by_year.index.astype(int)
+
+    top_classifications = df["Classification"].value_counts().nlargest(top).index
+    top_mediums = df["Medium"].value_counts().nlargest(top).index
+    filtered = df[
+        df["Classification"].isin(top_classifications) & df["Medium"].isin(top_mediums)
+    ]
+
+    df["YearBin"] = (df["Year"] // bin_size) * bin_size
+    tags["YearBin"] = (tags["Year"] // bin_size) * bin_size
+
+    return {
+        "year_counts": year_counts,
+        "cumulative_counts": year_counts.cumsum(),
+        "credit_lines": df["Credit Line"].value_counts().head(top),
+        "cultures": df["Culture"].value_counts().head(top),
+        "tags": tags["Tags"].value_counts().head(top),
+        "avg_size_by_year": avg_size_by_year,
+        "classification_medium": pd.crosstab(
+            filtered["Medium"], filtered["Classification"]
+        ),
+        "tags_by_bin": top_by_bin(tags, "Tags", top),
+        "classifications_by_bin": top_by_bin(df, "Classification", top),
+        "mediums_by_bin": top_by_bin(df, "Medium", top),
+    }
+
+
+def dataset_fingerprint(source):
+    """
+    Fingerprint a dataset, so its aggregates are only recomputed when it changes.
+
+    Files are fingerprinted by path, size and modification time, DataFrames by a hash of the
+    aggregated columns and collections by a token minted when they are created (object ids are
+    reused once a collection is garbage-collected) and their number of changes.
+
+    Args:
+        source (Collection, pd.DataFrame or str): See `aggregate_frame`.
+
+    Returns:
+        str: The fingerprint. Fingerprints of collections start with "collection:" and are only
+        valid within the session.
+    """
+    if hasattr(source, "artifacts"):
+        return f"collection:{source._token}:{source._change_count}"
+    if isinstance(source, pd.DataFrame):
+        df = source[AGGREGATE_COLUMNS].astype(str)
+        hashes = pd.util.hash_pandas_object(df, index=False).values
+        return "frame:" + hashlib.sha1(hashes.tobytes()).hexdigest()
+    stat = os.stat(source)
+    return f"file:{os.path.abspath(source)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class AggregateCache:
+    """
+    Keeps computed aggregates by dataset fingerprint, in memory and optionally as pickle files in a directory.
+
+    At most `max_entries` aggregate sets are kept in memory, the least recently used are evicted
+    (aggregates of outdated versions of a collection are never asked for again).
+    """
+
+    def __init__(self, directory=None, max_entries=32):
+        """
+        Args:
+            directory (str, optional): Where to persist the aggregates of files and DataFrames across sessions.
+            max_entries (int): Number of aggregate sets kept in memory.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def _path(self, key):
+        if self.directory is None or key.startswith("collection:"):
+            return None
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"aggregates_{name}.pickle")
+
+    def get(self, key):
+        """
+        Args:
+            key (str): Fingerprint and options of the aggregates.
+
+        Returns:
+            dict or None: The cached aggregates, None if there are none.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        path = self._path(key)
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                aggregates = pickle.load(f)
+            self._remember(key, aggregates)
+            return aggregates
+        return None
+
+    def _remember(self, key, aggregates):
+        self._entries[key] = aggregates
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key, aggregates):
+        """
+        Args:
+            key (str): Fingerprint and options of the aggregates.
+            aggregates (dict): The aggregates to cache.
+        """
+        self._remember(key, aggregates)
+        path = self._path(key)
+        if path:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "wb") as f:
+                pickle.dump(aggregates, f)
+
+    def clear(self):
+        """
+        Forget the aggregates kept in memory (files in the directory are kept).
+        """
+        self._entries.clear()
+
+
+_default_cache = AggregateCache()
+
+
+def get_aggregates(source, cache=None, top=10, bin_size=50):
+    """
+    Get the aggregates of a dataset, computing them only if the dataset changed since they were cached.
+
+    Args:
+        source (Collection, pd.DataFrame or str): See `aggregate_frame`.
+        cache (AggregateCache, optional): Cache to use, by default one kept in memory for the session.
+        top (int): Number of values kept in the top-n summaries.
+        bin_size (int): Width of the year bins in years.
+
+    Returns:
+        dict: See `compute_aggregates`.
+    """
+    cache = cache or _default_cache
+    key = f"{dataset_fingerprint(source)}:top={top}:bin={bin_size}"
+    aggregates = cache.get(key)
+    if aggregates is None:
+        aggregates = compute_aggregates(source, top, bin_size)
+        cache.set(key, aggregates)
+    return aggregates
+
+
+def _year_dates(years):
+    return pd.to_datetime(pd.DataFrame({"year": years, "month": 1, "day": 1}))
+
+
+def _plot_over_years(series, title, ylabel):
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.plot(_year_dates(series.index), series.values, marker="o")
+    ax.set_title(title)
+    ax.set_xlabel("Year")
+    ax.set_ylabel(ylabel)
+    ax.grid(True)
+
+    # Set x-axis ticks every 25 years
+    ax.xaxis.set_major_locator(mdates.YearLocator(25))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
+    plt.xticks(rotation=45)
+
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_cumulative_counts(aggregates):
+    """
+    Plot the number of items over time.
+    """
+    _plot_over_years(
+        aggregates["cumulative_counts"], "Number of Items over Time", "Number of Items"
+    )
+
+
+def plot_year_counts(aggregates):
+    """
+    Plot the number of new items per year.
+    """
+    _plot_over_years(
+        aggregates["year_counts"], "Number of New Items per Year", "Number of Items"
+    )
+
+
+def plot_avg_size_by_year(aggregates):
+    """
+    Plot the average size of the items per accession year.
+    """
+    _plot_over_years(
+        aggregates["avg_size_by_year"], "Average Size by Year", "Average Size [cm]"
+    )
+
+
+def plot_top(aggregates, key, title, xlabel, horizontal=False):
+    """
+    Plot a top-n summary as a bar chart.
+
+    Args:
+        aggregates (dict): See `compute_aggregates`.
+        key (str): The summary, e.g. "cultures", "credit_lines" or "tags".
+        title (str): Title of the chart.
+        xlabel (str): Label of the values.
+        horizontal (bool): Horizontal bars, for long labels such as credit lines.
+    """
+    import matplotlib.pyplot as plt
+
+    top_items = aggregates[key]
+    if horizontal:
+        top_items.sort_values().plot(kind="barh", figsize=(10, 6))
+        plt.xlabel("Frequency")
+        plt.ylabel(xlabel)
+        plt.grid(axis="x")
+    else:
+        plt.figure(figsize=(10, 5))
+        top_items.plot(kind="bar")
+        plt.xlabel(xlabel)
+        plt.ylabel("Frequency")
+        plt.xticks(rotation=45)
+        plt.grid(axis="y")
+    plt.title(title)
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_co_occurrence(aggregates):
+    """
+    Plot the log-scaled co-occurrence of the top mediums and classifications as a heatmap (needs seaborn).
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from matplotlib.colors import LogNorm
+
+    co_occurrence = aggregates["classification_medium"]
+    plt.figure(figsize=(12, 8))
+    sns.heatmap(
+        co_occurrence,
+        cmap="YlGnBu",
+        linewidths=0.5,
+        norm=LogNorm(
+            vmin=co_occurrence[co_occurrence > 0].min().min(),
+            vmax=co_occurrence.max().max(),
+        ),
+        cbar_kws={"label": "Log-scaled Count"},
+        annot=True,
+        fmt="d",
+    )
+    plt.title("Log-Scaled Co-occurrence of Top Medium vs Top Classification")
+    plt.xlabel("Classification")
+    plt.ylabel("Medium")
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_top_by_bin(aggregates, key, column, title):
+    """
+    Plot the most common values of a column per bin of years, one bar chart per bin (needs seaborn).
+
+    Args:
+        aggregates (dict): See `compute_aggregates`.
+        key (str): "tags_by_bin", "classifications_by_bin" or "mediums_by_bin".
+        column (str): The counted column ("Tags", "Classification" or "Medium").
+        title (str): Title of every chart, "{col_name}" is replaced by the bin.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    g = sns.catplot(
+        data=aggregates[key],
+        x=column,
+        y="Count",
+        col="YearBin",
+        kind="bar",
+        col_wrap=2,
+        height=4,
+        aspect=1.5,
+        sharex=False,
+        sharey=False,
+    )
+    g.set_titles(title)
+    g.set_xticklabels(rotation=45)
+    plt.tight_layout()
+    plt.show()
+
+
+def dashboard(source, cache=None):
+    """
+    Draw all metadata charts of meta_data_visualizations.ipynb from the cached aggregates.
+
+    Args:
+        source (Collection, pd.DataFrame or str): See `aggregate_frame`.
+        cache (AggregateCache, optional): See `get_aggregates`.
+
+    Returns:
+        dict: The aggregates the charts were drawn from.
+    """
+    aggregates = get_aggregates(source, cache)
+    plot_cumulative_counts(aggregates)
+    plot_year_counts(aggregates)
+    plot_top(
+        aggregates,
+        "credit_lines",
+        "Top 10 Most Common Credit Lines",
+        "Credit Line",
+        horizontal=True,
+    )
+    plot_top(aggregates, "cultures", "Top 10 Most Common Cultures", "Culture")
+    plot_top(aggregates, "tags", "Top 10 Most Common Tags", "Tag")
+    plot_avg_size_by_year(aggregates)
+    plot_co_occurrence(aggregates)
+    plot_top_by_bin(aggregates, "tags_by_bin", "Tags", "Top Tags in {col_name}")
+    plot_top_by_bin(
+        aggregates,
+        "classifications_by_bin",
+        "Classification",
+        "Top Classification in {col_name}",
+    )
+    plot_top_by_bin(
+        aggregates, "mediums_by_bin", "Medium", "Top Mediums in {col_name}"
+    )
+    return aggregates
@@ -0,0 +1,381 @@
+import time
+
+import numpy as np
+
+
+def normalize_rows(vectors):
+    """
+    Scale vectors to unit length, so that cosine similarity becomes a dot product.
+
+    Args:
+        vectors (array-like): Vectors of shape (n, ...), flattened to (n, dimension).
+
+    Returns:
+        np.ndarray: The normalized float32 vectors, zero vectors stay zero.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors = vectors.reshape(len(vectors), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def top_k(scores, k):
+    """
+    Args:
+        scores (np.ndarray): Scores of shape (n, m).
+        k (int): Number of best scores to keep per row.
+
+    Returns:
+        np.ndarray: Column indices of the k best scores of every row, best first.
+    """
+    k = min(k, scores.shape[1])
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, best, axis=1), axis=1)
+    return np.take_along_axis(best, order, axis=1)
+
+
+class IVFIndex:
+    """
+    Approximate nearest-neighbour search by cosine similarity over artwork embeddings (NumPy only).
+
+    An inverted file index: the vectors are split into `n_lists` cells by spherical k-means, and a
+    query only scans the `n_probe` cells whose centroids are closest to it instead of all vectors.
+    More probes give a higher recall (see `recall_curve`), `n_probe = n_lists` is an exact search.
+
+    Each cell keeps its vectors in one contiguous array that grows by doubling, so vectors can be
+    added at any time. Queries are batched: every probed cell is scanned once for all queries probing it.
+    """
+
+    def __init__(self, n_lists=None, n_probe=8, random_state=0):
+        """
+        Args:
+            n_lists (int, optional): Number of cells, by default the square root of the number of
+                vectors the index is trained on.
+            n_probe (int): Cells scanned per query by default.
+            random_state (int): Seed of the k-means training.
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.random_state = random_state
+        self.centroids = None
+        self._vectors = []  # cell -> array of its vectors (with spare capacity)
+        self._rows = []  # cell -> array of the positions of its vectors in self.ids
+        self._sizes = []  # cell -> number of vectors
+        self.ids = []  # artwork id of every vector, in insertion order
+        self._location = {}  # artwork id -> (cell, position in the cell)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, artwork_id):
+        return artwork_id in self._location
+
+    def train(self, vectors, iterations=10, sample=100_000):
+        """
+        Learn the cells with spherical k-means on (a sample of) the vectors.
+
+        Args:
+            vectors (array-like): Training vectors, e.g. the matrix of an EmbeddingStore.
+            iterations (int): k-means iterations.
+            sample (int): At most this many vectors are used.
+
+        Returns:
+            IVFIndex: self.
+        """
+        rng = np.random.default_rng(self.random_state)
+        if len(vectors) > sample:
+            chosen = np.sort(rng.choice(len(vectors), sample, replace=False))
+            vectors = np.asarray(vectors)[chosen]
+        vectors = normalize_rows(vectors)
+        if self.n_lists is None:
+            self.n_lists = max(1, int(np.sqrt(len(vectors))))
+        if len(vectors) < self.n_lists:
+            raise ValueError(
+                f"Training needs at least {self.n_lists} vectors, got {len(vectors)}"
+            )
+
+        centroids = vectors[rng.choice(len(vectors), self.n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            empty = np.bincount(assignment, minlength=self.n_lists) == 0
+            sums[empty] = vectors[rng.choice(len(vectors), empty.sum())]  # reseeded
+            centroids = normalize_rows(sums)
+        self.centroids = centroids
+
+        dimension = vectors.shape[1]
+        self._vectors = [
+            np.empty((0, dimension), np.float32) for _ in range(self.n_lists)
+        ]
+        self._rows = [np.empty(0, np.int64) for _ in range(self.n_lists)]
+        self._sizes = [0] * self.n_lists
+        return self
+
+    def add(self, artwork_ids, vectors):
+        """
+        Insert vectors, artworks that are already indexed are skipped.
+
+        The index is trained on the first vectors if it is not trained yet.
+
+        Args:
+            artwork_ids (list): One artwork id per vector.
+            vectors (array-like): The vectors, e.g. from EmbeddingStore.compute.
+        """
+        if self.centroids is None:
+            self.train(vectors)
+        keep = []
+        seen = set()
+        for row, artwork_id in enumerate(artwork_ids):
+            if artwork_id not in self._location and artwork_id not in seen:
+                seen.add(artwork_id)
+                keep.append(row)
+        if not keep:
+            return
+
+        vectors = normalize_rows(np.asarray(vectors)[keep])
+        artwork_ids = [artwork_ids[row] for row in keep]
+        cells = np.argmax(vectors @ self.centroids.T, axis=1)
+        first_row = len(self.ids)
+        self.ids.extend(artwork_ids)
+
+        for cell in np.unique(cells):
+            members = np.flatnonzero(cells == cell)
+            size = self._sizes[cell]
+            needed = size + len(members)
+            if needed > len(self._vectors[cell]):  # grow by doubling
+                capacity = max(needed, 2 * len(self._vectors[cell]), 16)
+                grown = np.empty((capacity, vectors.shape[1]), np.float32)
+                grown[:size] = self._vectors[cell][:size]
+                self._vectors[cell] = grown
+                rows = np.empty(capacity, np.int64)
+                rows[:size] = self._rows[cell][:size]
+                self._rows[cell] = rows
+            self._vectors[cell][size:needed] = vectors[members]
+            self._rows[cell][size:needed] = first_row + members
+            self._sizes[cell] = needed
+            for position, member in enumerate(members, start=size):
+                self._location[artwork_ids[member]] = (int(cell), position)
+
+    def vector(self, artwork_id):
+        """
+        Args:
+            artwork_id: An indexed artwork.
+
+        Returns:
+            np.ndarray: Its normalized vector.
+
+        Raises:
+            KeyError: If the artwork is not indexed.
+        """
+        cell, position = self._location[artwork_id]
+        return self._vectors[cell][position]
+
+    def search(self, queries, k=10, n_probe=None):
+        """
+        Find the most similar indexed artworks of a batch of query vectors.
+
+        Args:
+            queries (array-like): Query vectors of shape (n, dimension) (or a single vector).
+            k (int): Number of neighbours per query.
+            n_probe (int, optional): Cells scanned per query, by default `self.n_probe`.
+
+        Returns:
+            tuple: (ids, scores) – lists with the artwork ids and cosine similarities of the
+            neighbours of each query, most similar first.
+        """
+        queries = np.asarray(queries)
+        if queries.ndim == 1:
+            queries = queries[None]
+        queries = normalize_rows(queries)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        probes = top_k(queries @ self.centroids.T, n_probe)
+
+        # candidates of every query: the k best of each probed cell
+        scores = np.full((len(queries), n_probe, k), -np.inf, np.float32)
+        rows = np.full((len(queries), n_probe, k), -1, np.int64)
+        for cell in np.unique(probes):
+            size = self._sizes[cell]
+            if not size:
+                continue
+            queries_of_cell, slots = np.nonzero(probes == cell)
+            cell_scores = queries[queries_of_cell] @ self._vectors[cell][:size].T
+            best = top_k(cell_scores, k)
+            found = best.shape[1]
+            scores[queries_of_cell, slots, :found] = np.take_along_axis(
+                cell_scores, best, axis=1
+            )
+            rows[queries_of_cell, slots, :found] = self._rows[cell][best]
+        return self._merge(
+            scores.reshape(len(queries), -1), rows.reshape(len(queries), -1), k
+        )
+
+    def _merge(self, scores, rows, k):
+        best = top_k(scores, k)
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        best_rows = np.take_along_axis(rows, best, axis=1)
+        ids, similarities = [], []
+        for query_rows, query_scores in zip(best_rows, best_scores):
+            found = query_rows >= 0
+            ids.append([self.ids[row] for row in query_rows[found]])
+            similarities.append(query_scores[found].tolist())
+        return ids, similarities
+
+    def exact_search(self, queries, k=10, batch_size=256):
+        """
+        Brute-force cosine search over all indexed vectors, the reference for `recall_curve`.
+
+        Args:
+            queries (array-like): Query vectors.
+            k (int): Number of neighbours per query.
+            batch_size (int): Queries scored at once (bounds the memory of the score matrix).
+
+        Returns:
+            tuple: (ids, scores), see `search`.
+        """
+        queries = np.asarray(queries)
+        if queries.ndim == 1:
+            queries = queries[None]
+        queries = normalize_rows(queries)
+        cells = [cell for cell in range(self.n_lists) if self._sizes[cell]]
+        vectors = np.concatenate(
+            [self._vectors[cell][: self._sizes[cell]] for cell in cells]
+        )
+        rows = np.concatenate([self._rows[cell][: self._sizes[cell]] for cell in cells])
+        ids, similarities = [], []
+        for start in range(0, len(queries), batch_size):
+            scores = queries[start : start + batch_size] @ vectors.T
+            batch_ids, batch_scores = self._merge(
+                scores, np.broadcast_to(rows, scores.shape), k
+            )
+            ids += batch_ids
+            similarities += batch_scores
+        return ids, similarities
+
+    def similar_visual(self, artwork_ids, k=10, n_probe=None):
+        """
+        Find the artworks that look most like indexed artworks.
+
+        Args:
+            artwork_ids: An indexed artwork id, or a list of them for a batched query.
+            k (int): Number of similar artworks per artwork (the artwork itself is left out).
+            n_probe (int, optional): Cells scanned per query, see `search`.
+
+        Returns:
+            list: (artwork id, cosine similarity) pairs, most similar first. For a list of artworks one
+            such list per artwork.
+
+        Raises:
+            KeyError: If an artwork is not indexed.
+        """
+        batched = isinstance(artwork_ids, (list, tuple, np.ndarray))
+        queries = artwork_ids if batched else [artwork_ids]
+        ids, scores = self.search(
+            np.stack([self.vector(artwork_id) for artwork_id in queries]), k + 1, n_probe
+        )
+        results = [
+            [
+                (neighbour, score)
+                for neighbour, score in zip(neighbours, neighbour_scores)
+                if neighbour != query
+            ][:k]
+            for query, neighbours, neighbour_scores in zip(queries, ids, scores)
+        ]
+        return results if batched else results[0]
+
+    def save(self, path):
+        """
+        Write the index to a `.npz` file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        cells = list(range(self.n_lists))
+        np.savez(
+            path,
+            centroids=self.centroids,
+            vectors=np.concatenate(
+                [self._vectors[cell][: self._sizes[cell]] for cell in cells]
+            ),
+            rows=np.concatenate(
+                [self._rows[cell][: self._sizes[cell]] for cell in cells]
+            ),
+            sizes=np.array(self._sizes, np.int64),
+            ids=np.array(self.ids),
+            settings=np.array([self.n_probe, self.random_state]),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an index written by `save`, it can be searched and extended right away.
+
+        Args:
+            path (str): Path of the `.npz` file.
+
+        Returns:
+            IVFIndex: The index.
+        """
+        with np.load(path) as data:
+            n_probe, random_state = data["settings"].tolist()
+            index = cls(len(data["centroids"]), n_probe, random_state)
+            index.centroids = data["centroids"]
+            vectors, rows = data["vectors"], data["rows"]
+            index.ids = data["ids"].tolist()
+            index._sizes = data["sizes"].tolist()
+
+        starts = np.cumsum([0] + index._sizes)
+        cells = range(index.n_lists)
+        index._vectors = [vectors[starts[cell] : starts[cell + 1]] for cell in cells]
+        index._rows = [rows[starts[cell] : starts[cell + 1]] for cell in cells]
+        for cell, cell_rows in enumerate(index._rows):
+            for position, row in enumerate(cell_rows.tolist()):
+                index._location[index.ids[row]] = (cell, position)
+        return index
+
+    @classmethod
+    def from_store(cls, store, model, n_lists=None, n_probe=8):
+        """
+        Build an index over the vectors of a model in an EmbeddingStore.
+
+        Args:
+            store (EmbeddingStore): The store.
+            model (str): Name of the model, e.g. "vgg16".
+            n_lists (int, optional): Number of cells, see `__init__`.
+            n_probe (int): Cells scanned per query by default.
+
+        Returns:
+            IVFIndex: The index.
+        """
+        index = cls(n_lists, n_probe)
+        matrix = store.matrix(model)
+        index.train(matrix)
+        index.add(store.ids(model), matrix)
+        return index
+
+
+def recall_curve(index, queries, k=10, n_probes=(1, 2, 4, 8, 16, 32)):
+    """
+    Compare the index with an exact brute-force cosine search.
+
+    Args:
+        index (IVFIndex): A filled index.
+        queries (array-like): Query vectors, searched as one batch.
+        k (int): Number of neighbours per query.
+        n_probes (iterable): Numbers of probed cells to try.
+
+    Returns:
+        dict: n_probe -> (recall@k, seconds per query), and "exact" -> (1.0, seconds per query of the
+        brute-force search).
+    """
+    start = time.perf_counter()
+    exact, _ = index.exact_search(queries, k)
+    results = {"exact": (1.0, (time.perf_counter() - start) / len(queries))}
+
+    for n_probe in n_probes:
+        start = time.perf_counter()
+        found, _ = index.search(queries, k, n_probe)
+        seconds = (time.perf_counter() - start) / len(queries)
+        hits = sum(len(set(a) & set(b)) for a, b in zip(found, exact))
+        results[n_probe] = (hits / sum(len(b) for b in exact), seconds)
+    return results
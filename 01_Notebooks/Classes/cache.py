@@ -0,0 +1,272 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "ACTH_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "acthproject", "responses.sqlite"),
+)
+DEFAULT_TTL = 7 * 24 * 60 * 60  # one week, the APIs barely change between runs
+DEFAULT_MAX_ENTRIES = 100_000
+SQL_BATCH_SIZE = 500  # keys per SELECT, below SQLite's limit on the number of parameters
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """
+    A persistent, SQLite-backed cache for responses of Wikidata and the museum APIs.
+
+    Entries are keyed by endpoint plus normalized parameters and stored as JSON.
+    They expire after `ttl` seconds, and once more than `max_entries` are stored the
+    least recently used ones are evicted. Hits and misses are counted.
+    """
+
+    def __init__(
+        self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Open (or create) a response cache.
+
+        Args:
+            path (str): Path of the SQLite file, ":memory:" for a cache that is not persisted.
+            ttl (float): Seconds after which an entry expires, None to never expire.
+            max_entries (int): Maximum number of entries kept.
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        """
+        Build the cache key of a request.
+
+        Parameter names and values are converted to strings and sorted, so the same request
+        always maps to the same key regardless of the order of its parameters.
+
+        Args:
+            endpoint (str): URL of the API endpoint.
+            params (dict): Request parameters.
+
+        Returns:
+            str: The cache key.
+        """
+        normalized = sorted((str(k), str(v).strip()) for k, v in (params or {}).items())
+        return json.dumps([endpoint.rstrip("/"), normalized], ensure_ascii=False)
+
+    def get(self, endpoint, params=None, default=None):
+        """
+        Look up a cached response.
+
+        Args:
+            endpoint (str): URL of the API endpoint.
+            params (dict): Request parameters.
+            default: Value returned if there is no valid entry.
+
+        Returns:
+            The cached value, or `default` on a miss.
+        """
+        return self.get_many(endpoint, [params], default)[0]
+
+    def get_many(self, endpoint, params_list, default=None):
+        """
+        Look up many cached responses of an endpoint in a single transaction.
+
+        Args:
+            endpoint (str): URL of the API endpoint.
+            params_list (list): Request parameters (dicts), one per lookup.
+            default: Value returned for lookups without a valid entry.
+
+        Returns:
+            list: The cached value of each lookup, or `default` on a miss.
+        """
+        keys = [self.make_key(endpoint, params) for params in params_list]
+        now = time.time()
+        rows = {}
+        with self._lock:
+            distinct = list(dict.fromkeys(keys))
+            for start in range(0, len(distinct), SQL_BATCH_SIZE):
+                batch = distinct[start : start + SQL_BATCH_SIZE]
+                rows.update(
+                    (key, (value, created))
+                    for key, value, created in self._connection.execute(
+                        "SELECT key, value, created FROM responses WHERE key IN "
+                        f"({', '.join('?' * len(batch))})",
+                        batch,
+                    )
+                )
+
+            if self.ttl is not None:
+                expired = [key for key, (_, created) in rows.items() if now - created > self.ttl]
+                self._connection.executemany(
+                    "DELETE FROM responses WHERE key = ?", [(key,) for key in expired]
+                )
+                for key in expired:
+                    del rows[key]
+
+            self._connection.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(now, key) for key in rows],
+            )
+            self._connection.commit()
+
+            values = []
+            for key in keys:
+                if key in rows:
+                    self.hits += 1
+                    values.append(json.loads(rows[key][0]))
+                else:
+                    self.misses += 1
+                    values.append(default)
+            return values
+
+    def set(self, endpoint, params, value):
+        """
+        Store a response, evicting the least recently used entries if the cache is full.
+
+        Args:
+            endpoint (str): URL of the API endpoint.
+            params (dict): Request parameters.
+            value: JSON-serializable response.
+        """
+        self.set_many(endpoint, [(params, value)])
+
+    def set_many(self, endpoint, items):
+        """
+        Store many responses of an endpoint in a single transaction, see `set`.
+
+        Args:
+            endpoint (str): URL of the API endpoint.
+            items (list): (params, value) pairs.
+        """
+        now = time.time()
+        entries = [
+            (self.make_key(endpoint, params), json.dumps(value), now, now)
+            for params, value in items
+        ]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                entries,
+            )
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+            if count > self.max_entries:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._connection.commit()
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of entries, hits and misses.
+        """
+        with self._lock:
+            (entries,) = self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self):
+        return self.stats()["entries"]
+
+
+_default_cache = _MISSING
+
+
+def get_default_cache():
+    """
+    Return the cache shared by all API lookups of the project, creating it on first use.
+
+    Returns:
+        ResponseCache or None: The shared cache, None if caching has been disabled.
+    """
+    global _default_cache
+    if _default_cache is _MISSING:
+        _default_cache = ResponseCache()
+    return _default_cache
+
+
+def set_default_cache(cache):
+    """
+    Replace the cache shared by all API lookups, e.g. with one at another path or TTL.
+
+    Args:
+        cache (ResponseCache or None): The new cache, None to disable caching.
+    """
+    global _default_cache
+    _default_cache = cache
+
+
+def cached_get_json(url, params=None, session=None, **kwargs):
+    """
+    GET a JSON API response, served from the shared cache if possible.
+
+    Failed requests raise as with `requests` and are not cached.
+
+    Args:
+        url (str): URL of the API endpoint.
+        params (dict): Query parameters.
+        session (requests.Session): Session to send the request with, by default a new connection is used.
+        **kwargs: Further arguments passed to `requests.get` (e.g. timeout).
+
+    Returns:
+        The decoded JSON response.
+    """
+    cache = get_default_cache()
+    if cache is not None:
+        data = cache.get(url, params, default=_MISSING)
+        if data is not _MISSING:
+            return data
+
+    if session is None:
+        import requests
+
+        session = requests
+    response = session.get(url, params=params, **kwargs)
+    response.raise_for_status()
+    data = response.json()
+
+    if cache is not None:
+        cache.set(url, params, data)
+    return data
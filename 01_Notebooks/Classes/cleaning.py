@@ -0,0 +1,193 @@
+import pandas as pd
+
+from .storage import write_parquet, write_parquet_chunks
+
+# columns of MetObjects.csv kept in MetObjects_Cleaned.csv
+SELECTED_COLUMNS = [
+    "Object ID",
+    "Department",
+    "AccessionYear",
+    "Object Name",
+    "Title",
+    "Culture",
+    "Period",
+    "Medium",
+    "Classification",
+    "Credit Line",
+    "Object Wikidata URL",
+    "Tags",
+    "Tags AAT URL",
+    "Tags Wikidata URL",
+    "Artist Display Name",
+    "Artist Wikidata URL",
+    "Artist ULAN URL",
+    "Artist Nationality",
+    "Dimensions",
+]
+
+# columns holding "|"-separated lists
+PIPE_COLUMNS = [
+    "Tags",
+    "Tags Wikidata URL",
+    "Tags AAT URL",
+    "Artist Nationality",
+    "Artist Display Name",
+]
+
+# repeated values, read as categoricals to keep every chunk small
+CATEGORICAL_COLUMNS = [
+    "Department",
+    "Object Name",
+    "Culture",
+    "Period",
+    "Medium",
+    "Classification",
+    "Credit Line",
+]
+
+DEFAULT_DEPARTMENT = "Greek and Roman Art"
+
+
+def split_pipes(series):
+    """
+    Split a "|"-separated column into lists, missing values stay missing.
+
+    Args:
+        series (pd.Series): Column of MetObjects.csv.
+
+    Returns:
+        pd.Series: Column of lists.
+    """
+    return series.astype("object").str.split("|")
+
+
+def extract_cm_value(dimensions):
+    """
+    Extract the first size in centimeters from the Dimensions column.
+
+    The first parenthesized block ending with "cm" is taken (e.g. "(134.6 × 50 cm)") and
+    its first number is returned. Dimensions that do not follow this pattern become NaN.
+
+    Args:
+        dimensions (pd.Series): The Dimensions column.
+
+    Returns:
+        tuple: (first_cm_raw, cm_value) Series with the matched block and the parsed number.
+    """
+    # \(           – match literal opening parenthesis
+    # ([^()]*?cm)  – capture shortest content not containing () that ends in 'cm'
+    # \)           – match literal closing parenthesis
+    first_cm_raw = dimensions.astype("object").str.extract(r"\(([^()]*?cm)\)")[0]
+
+    cm_value = (
+        first_cm_raw.str.replace("cm", "", regex=False)
+        .str.split("×")  # handles multi-dimensional sizes
+        .str[0]
+        .str.strip()
+    )
+    return first_cm_raw, pd.to_numeric(cm_value, errors="coerce")
+
+
+def clean_chunk(chunk, department=DEFAULT_DEPARTMENT):
+    """
+    Clean one chunk of MetObjects.csv the way clean_data.ipynb does.
+
+    Args:
+        chunk (pd.DataFrame): Rows of MetObjects.csv (at least the SELECTED_COLUMNS).
+        department (str or list, optional): Department(s) to keep, None to keep all.
+
+    Returns:
+        pd.DataFrame: The cleaned rows.
+    """
+    if department is not None:
+        departments = [department] if isinstance(department, str) else list(department)
+        chunk = chunk[chunk["Department"].isin(departments)]
+
+    selected = chunk[SELECTED_COLUMNS].copy()
+
+    # nationalities that consist only of separators and blanks (e.g. " | ") are missing
+    nationality = selected["Artist Nationality"].astype("object")
+    blank = nationality.str.replace("|", "", regex=False).str.strip() == ""
+    selected["Artist Nationality"] = nationality.mask(blank)
+
+    for column in PIPE_COLUMNS:
+        selected[column] = split_pipes(selected[column])
+
+    selected["first_cm_raw"], selected["cm_value"] = extract_cm_value(
+        selected["Dimensions"]
+    )
+
+    selected["AccessionYear"] = pd.to_datetime(
+        chunk["AccessionYear"].astype("object"), format="%Y", errors="coerce"
+    )
+    return selected
+
+
+def iter_clean_chunks(path, department=DEFAULT_DEPARTMENT, chunksize=50_000):
+    """
+    Read MetObjects.csv chunk by chunk and yield the cleaned rows of each chunk.
+
+    Only the needed columns are read, repeated values as categoricals, so memory stays
+    bounded by the chunk size.
+
+    Args:
+        path (str): Path of MetObjects.csv.
+        department (str or list, optional): Department(s) to keep, None to keep all.
+        chunksize (int): Rows per chunk.
+
+    Yields:
+        pd.DataFrame: The cleaned rows of one chunk (indexed by their row in MetObjects.csv).
+    """
+    dtypes = {column: "category" for column in CATEGORICAL_COLUMNS}
+    dtypes.update(
+        {
+            column: "object"
+            for column in SELECTED_COLUMNS
+            if column not in CATEGORICAL_COLUMNS and column != "Object ID"
+        }
+    )
+    reader = pd.read_csv(
+        path, usecols=SELECTED_COLUMNS, dtype=dtypes, chunksize=chunksize
+    )
+    for chunk in reader:
+        cleaned = clean_chunk(chunk, department)
+        if len(cleaned):
+            yield cleaned
+
+
+def clean_met_objects(
+    path, output_path=None, department=DEFAULT_DEPARTMENT, chunksize=50_000
+):
+    """
+    Run the clean_data pipeline on the full MetObjects.csv.
+
+    Args:
+        path (str): Path of MetObjects.csv.
+        output_path (str, optional): Where to write the result, chunk by chunk. A ".parquet" path is
+            written with typed columns, one row group per chunk (see storage.write_parquet_chunks).
+            Any other path is written as CSV like MetObjects_Cleaned.csv.
+        department (str or list, optional): Department(s) to keep, None to keep all.
+        chunksize (int): Rows per chunk.
+
+    Returns:
+        pd.DataFrame or None: Without an output_path the cleaned dataset, the chunks are concatenated
+        so it has to fit in memory. When writing a file nothing is returned and only one chunk is held
+        in memory at a time, so even the unfiltered dataset can be cleaned.
+    """
+    chunks = iter_clean_chunks(path, department, chunksize)
+    empty = clean_chunk(pd.DataFrame(columns=SELECTED_COLUMNS))
+
+    if output_path is not None and str(output_path).endswith(".parquet"):
+        if not write_parquet_chunks(chunks, output_path):
+            write_parquet(empty, output_path)
+        return None
+
+    if output_path is not None:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(output_path, mode="w" if header else "a", header=header)
+            header = False
+        return None
+
+    parts = list(chunks)
+    return pd.concat(parts) if parts else empty
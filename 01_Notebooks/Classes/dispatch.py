@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from .Artifact import Artifact
+from .ArtifactGreek import ArtifactGreek
+from .ArtifactRoman import ArtifactRoman
+from .Artist import Artist
+from .ArtistPainter import ArtistPainter
+from .ArtistPotter import ArtistPotter
+
+# specialized classes in order of precedence, the first whose KEYWORD matches is used
+ARTIFACT_SUBCLASSES = [ArtifactGreek, ArtifactRoman]
+ARTIST_SUBCLASSES = [ArtistPainter, ArtistPotter]
+
+
+def classify(values, subclasses, base):
+    """
+    Pick the class of every row in one vectorized pass.
+
+    A row gets the first subclass whose KEYWORD its value contains (case-insensitive),
+    the base class if none matches or the value is missing.
+
+    Args:
+        values (iterable): One value per row, e.g. the Culture column.
+        subclasses (list): Candidate classes with a KEYWORD attribute, in order of precedence.
+        base (type): Class of the rows no subclass matches.
+
+    Returns:
+        np.ndarray: One class per row.
+    """
+    values = pd.Series(values, dtype=object)
+    classes = np.full(len(values), base, dtype=object)
+    unmatched = np.ones(len(values), dtype=bool)
+    for subclass in subclasses:
+        hits = unmatched & values.str.contains(
+            subclass.KEYWORD, case=False, regex=False, na=False
+        ).to_numpy(dtype=bool)
+        classes[hits] = subclass
+        unmatched &= ~hits
+    return classes
+
+
+def classify_artifacts(cultures):
+    """
+    Args:
+        cultures (iterable): The Culture of every row.
+
+    Returns:
+        np.ndarray: ArtifactGreek, ArtifactRoman or Artifact per row.
+    """
+    return classify(cultures, ARTIFACT_SUBCLASSES, Artifact)
+
+
+def classify_artists(display_names):
+    """
+    Args:
+        display_names (iterable): The parsed Artist Display Name lists of every row, an artist is
+            named after the first name of its list.
+
+    Returns:
+        np.ndarray: ArtistPainter, ArtistPotter or Artist per row.
+    """
+    first_names = [names[0] if names else None for names in display_names]
+    return classify(first_names, ARTIST_SUBCLASSES, Artist)
@@ -0,0 +1,258 @@
+import json
+import os
+from urllib.parse import quote
+
+import numpy as np
+
+from .cache import DEFAULT_CACHE_PATH
+
+DEFAULT_EMBEDDING_DIR = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "embeddings")
+
+
+def plain_id(artwork_id):
+    """
+    Args:
+        artwork_id: An artwork id, e.g. a NumPy integer taken from a DataFrame column.
+
+    Returns:
+        int or str: The id as a plain Python value, as it is stored in the JSON index.
+
+    Raises:
+        TypeError: If the id is neither an integer nor a string.
+    """
+    if isinstance(artwork_id, (bool, np.bool_)):
+        raise TypeError(f"Artwork ids must be integers or strings, got {artwork_id!r}")
+    if isinstance(artwork_id, (int, np.integer)):
+        return int(artwork_id)
+    if isinstance(artwork_id, (str, np.str_)):
+        return str(artwork_id)
+    raise TypeError(f"Artwork ids must be integers or strings, got {artwork_id!r}")
+
+
+class EmbeddingStore:
+    """
+    Persistent feature vectors of artworks, keyed by artwork id and model name.
+
+    The vectors of each model are kept in a `.npy` matrix that is opened as a memory map, with a
+    JSON index of the artwork id of each row. Only the vectors of new artworks have to be computed,
+    and `matrix` hands the stored vectors to clustering (e.g. KMeans) without copying them.
+
+    The matrix grows by doubling its capacity, so adding vectors batch by batch stays cheap. The
+    index is written after the rows it refers to, an interrupted run loses at most the last batch.
+    """
+
+    def __init__(self, directory=DEFAULT_EMBEDDING_DIR, dtype="float32"):
+        """
+        Args:
+            directory (str): Where the matrices are stored, by default next to the response cache.
+            dtype (str): "float32", or "float16" to halve the size on disk (used for new models only,
+                existing matrices keep their type).
+        """
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self._models = {}  # model -> (memory map, list of ids, id -> row)
+
+    def _paths(self, model):
+        name = quote(model, safe="")
+        return (
+            os.path.join(self.directory, f"{name}.npy"),
+            os.path.join(self.directory, f"{name}.ids.json"),
+        )
+
+    def _open(self, model):
+        if model not in self._models:
+            matrix_path, ids_path = self._paths(model)
+            if os.path.exists(ids_path):
+                with open(ids_path, encoding="utf-8") as f:
+                    ids = json.load(f)
+                matrix = np.load(matrix_path, mmap_mode="r+")
+            else:
+                ids, matrix = [], None
+            self._models[model] = (matrix, ids, {key: row for row, key in enumerate(ids)})
+        return self._models[model]
+
+    def _reserve(self, model, rows, dimension):
+        # makes room for `rows` more vectors, doubling the capacity of the matrix if it is full
+        matrix, ids, index = self._open(model)
+        needed = len(ids) + rows
+        if matrix is not None:
+            if matrix.shape[1] != dimension:
+                raise ValueError(
+                    f"Vectors of {model!r} have {matrix.shape[1]} dimensions, got {dimension}"
+                )
+            if matrix.shape[0] >= needed:
+                return matrix
+
+        os.makedirs(self.directory, exist_ok=True)
+        matrix_path, _ = self._paths(model)
+        capacity = max(needed, 2 * (matrix.shape[0] if matrix is not None else 0), 64)
+        dtype = matrix.dtype if matrix is not None else self.dtype
+        temporary = f"{matrix_path}.tmp"
+        grown = np.lib.format.open_memmap(
+            temporary, mode="w+", dtype=dtype, shape=(capacity, dimension)
+        )
+        if ids:
+            grown[: len(ids)] = matrix[: len(ids)]
+        grown.flush()
+        # every map of the old file has to be closed before it is replaced (Windows refuses otherwise)
+        self._models.pop(model)
+        del grown, matrix
+        os.replace(temporary, matrix_path)
+        matrix = np.load(matrix_path, mmap_mode="r+")
+        self._models[model] = (matrix, ids, index)
+        return matrix
+
+    def ids(self, model):
+        """
+        Args:
+            model (str): Name of the model.
+
+        Returns:
+            list: The artwork ids with a stored vector, in the order of the rows of `matrix`.
+        """
+        return list(self._open(model)[1])
+
+    def __contains__(self, key):
+        model, artwork_id = key
+        return artwork_id in self._open(model)[2]
+
+    def missing(self, model, artwork_ids):
+        """
+        Args:
+            model (str): Name of the model.
+            artwork_ids (iterable): Artwork ids.
+
+        Returns:
+            list: The ids without a stored vector (each once, in order).
+        """
+        index = self._open(model)[2]
+        return [key for key in dict.fromkeys(artwork_ids) if key not in index]
+
+    def add(self, model, artwork_ids, vectors):
+        """
+        Store the vectors of artworks, ids that are already stored are skipped.
+
+        Args:
+            model (str): Name of the model.
+            artwork_ids (list): One artwork id per vector.
+            vectors (array-like): The vectors, of shape (n, ...), flattened to (n, dimension).
+
+        Raises:
+            TypeError: If an id is neither an integer nor a string (see `plain_id`).
+        """
+        artwork_ids = [plain_id(key) for key in artwork_ids]  # checked before anything is changed
+        vectors = np.asarray(vectors)
+        vectors = vectors.reshape(len(vectors), -1)
+        _, _, index = self._open(model)
+        new = {}
+        for row, key in enumerate(artwork_ids):
+            if key not in index and key not in new:
+                new[key] = row
+        if not new:
+            return
+
+        matrix = self._reserve(model, len(new), vectors.shape[1])
+        _, ids, index = self._models[model]
+        start = len(ids)
+        matrix[start : start + len(new)] = vectors[list(new.values())]
+        matrix.flush()
+
+        # the rows beyond the stored ids are unused, so the store stays consistent until the new index
+        # replaces the old one. Only then the ids are added in memory
+        _, ids_path = self._paths(model)
+        with open(f"{ids_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(ids + list(new), f)
+        os.replace(f"{ids_path}.tmp", ids_path)
+        for key in new:
+            index[key] = len(ids)
+            ids.append(key)
+
+    def matrix(self, model):
+        """
+        The stored vectors of a model, without copying them.
+
+        Args:
+            model (str): Name of the model.
+
+        Returns:
+            np.ndarray: Memory-mapped matrix of shape (n, dimension), one row per id of `ids`.
+            None if nothing is stored for the model.
+        """
+        matrix, ids, _ = self._open(model)
+        if matrix is None:
+            return None
+        return matrix[: len(ids)]
+
+    def get(self, model, artwork_ids):
+        """
+        Args:
+            model (str): Name of the model.
+            artwork_ids (list): Artwork ids, all stored.
+
+        Returns:
+            np.ndarray: Their vectors, one row per id. A copy, unless the ids are exactly the stored ones
+            in order, then the memory map itself (see `matrix`).
+
+        Raises:
+            KeyError: If an id has no stored vector.
+        """
+        matrix, ids, index = self._open(model)
+        if list(artwork_ids) == ids:
+            return matrix[: len(ids)]
+        return matrix[[index[key] for key in artwork_ids]]
+
+    def compute(self, model, artwork_ids, images, extract, batch_size=64):
+        """
+        Compute and store the vectors of the artworks that have none yet.
+
+        Args:
+            model (str): Name of the model.
+            artwork_ids (list): One artwork id per image.
+            images (array-like): The images, e.g. the memory map of images.build_image_array.
+                Only the images of new artworks are read.
+            extract (callable): Turns a batch of images into a batch of vectors, e.g. `keras_extractor`.
+            batch_size (int): Images per call of `extract`.
+
+        Returns:
+            np.ndarray: The vectors of `artwork_ids`, see `get`.
+        """
+        missing = set(self.missing(model, artwork_ids))
+        rows = [row for row, key in enumerate(artwork_ids) if key in missing]
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            self.add(
+                model, [artwork_ids[row] for row in batch], extract(np.asarray(images[batch]))
+            )
+        return self.get(model, artwork_ids)
+
+
+def keras_extractor(name, pooling=None):
+    """
+    Feature extractor of an ImageNet model from Keras (needs tensorflow), without its classification layers.
+
+    Args:
+        name (str): "vgg16" or "mobilenet_v2".
+        pooling (str, optional): None keeps the last feature maps (flattened by the store, e.g. 7x7x512
+            for VGG16), "avg" keeps one value per channel.
+
+    Returns:
+        callable: uint8 RGB images of shape (n, 224, 224, 3) -> features.
+    """
+    from tensorflow.keras import applications
+
+    models = {
+        "vgg16": (applications.VGG16, applications.vgg16.preprocess_input),
+        "mobilenet_v2": (
+            applications.MobileNetV2,
+            applications.mobilenet_v2.preprocess_input,
+        ),
+    }
+    constructor, preprocess_input = models[name]
+    model = constructor(
+        weights="imagenet", include_top=False, pooling=pooling, input_shape=(224, 224, 3)
+    )
+
+    def extract(images):
+        return model.predict(preprocess_input(images.astype("float32")), verbose=0)
+
+    return extract
@@ -0,0 +1,466 @@
+import hashlib
+import html
+import json
+import os
+
+import networkx as nx
+import numpy as np
+from rdflib import Literal, RDF
+
+# predicates whose values are shown as node labels, in order of preference
+LABEL_PREDICATES = ("dc:title", "foaf:name")
+
+# layouts computed in this session, keyed by graph fingerprint and layout options
+_layout_cache = {}
+
+
+def short_name(rdf_graph, term):
+    """
+    Shorten a URI with the prefixes bound to the graph (e.g. crm:P2_has_type), or to its last path segment.
+
+    Args:
+        rdf_graph (rdflib.Graph): Graph whose prefixes are used.
+        term (rdflib.URIRef): The URI.
+
+    Returns:
+        str: The short name.
+    """
+    try:
+        return rdf_graph.namespace_manager.qname(term)
+    except Exception:
+        return str(term).rstrip("/").rsplit("/", 1)[-1]
+
+
+def rdf_to_networkx(
+    rdf_graph,
+    predicates=None,
+    exclude_predicates=None,
+    node_filter=None,
+    aggregate_literals=True,
+):
+    """
+    Convert an RDF graph into a NetworkX graph that stays readable for large collections.
+
+    Literal-valued triples (titles, types, dates, ...) and rdf:type become attributes of their subject node
+    instead of nodes of their own, so only the links between resources (e.g. P94_has_created,
+    hasWikidataEntity) are drawn as edges.
+
+    Args:
+        rdf_graph (rdflib.Graph): The RDF graph.
+        predicates (iterable, optional): Only keep these predicates (URIs or short names such as "crm:P94_has_created").
+        exclude_predicates (iterable, optional): Drop these predicates.
+        node_filter (callable, optional): Called with the URI string of every resource, only resources for which
+            it returns True are kept (e.g. lambda uri: "wikidata" not in uri).
+        aggregate_literals (bool): Turn literal-valued triples and rdf:type into node attributes.
+            If False, every value becomes a node like in `visualize_rdf_graph`.
+
+    Returns:
+        nx.DiGraph: Nodes are URI strings with a "label" attribute (and the aggregated attributes),
+        edges have a "label" attribute with the short name of the predicate.
+    """
+    names = {}
+
+    def name(predicate):
+        if predicate not in names:
+            names[predicate] = short_name(rdf_graph, predicate)
+        return names[predicate]
+
+    def selected(predicate):
+        if predicates is not None and predicate not in wanted and name(predicate) not in wanted:
+            return False
+        if exclude_predicates is not None and (
+            predicate in unwanted or name(predicate) in unwanted
+        ):
+            return False
+        return True
+
+    wanted = set(predicates) if predicates is not None else set()
+    unwanted = set(exclude_predicates) if exclude_predicates is not None else set()
+
+    nx_graph = nx.DiGraph()
+    for subj, pred, obj in rdf_graph:
+        if not selected(pred):
+            continue
+        subject = str(subj)
+        if node_filter is not None and not node_filter(subject):
+            continue
+
+        if aggregate_literals and (isinstance(obj, Literal) or pred == RDF.type):
+            nx_graph.add_node(subject)
+            attributes = nx_graph.nodes[subject]
+            key = "type" if pred == RDF.type else name(pred)
+            value = name(obj) if pred == RDF.type else str(obj)
+            if key not in attributes:
+                attributes[key] = value
+            elif isinstance(attributes[key], list):
+                attributes[key].append(value)
+            else:
+                attributes[key] = [attributes[key], value]
+            continue
+
+        target = str(obj)
+        if node_filter is not None and not isinstance(obj, Literal) and not node_filter(target):
+            continue
+        nx_graph.add_edge(subject, target, label=name(pred))
+
+    for node, attributes in nx_graph.nodes(data=True):
+        label = next(
+            (attributes[key] for key in LABEL_PREDICATES if key in attributes), None
+        )
+        if isinstance(label, list):
+            label = label[0]
+        attributes["label"] = label or node.rstrip("/").rsplit("/", 1)[-1]
+
+    return nx_graph
+
+
+def force_layout(nx_graph, iterations=100, negative_samples=10, seed=0):
+    """
+    Compute a force-directed (Fruchterman-Reingold) layout in time linear in the size of the graph.
+
+    Instead of pushing every pair of nodes apart, every node is only pushed away from `negative_samples`
+    random nodes per iteration (scaled up accordingly), and all forces are computed with NumPy.
+    This gives an overview layout of tens of thousands of nodes in seconds, where nx.spring_layout
+    takes minutes.
+
+    Args:
+        nx_graph (nx.Graph): The graph.
+        iterations (int): Number of iterations.
+        negative_samples (int): Random nodes repelling each node per iteration.
+        seed (int): Seed of the random initial positions and samples.
+
+    Returns:
+        dict: node -> np.ndarray position, scaled to [-1, 1] like the NetworkX layouts.
+    """
+    nodes = list(nx_graph)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(2)}
+
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array(
+        [(index[u], index[v]) for u, v in nx_graph.edges() if u != v], dtype=np.int64
+    ).reshape(-1, 2)
+
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    k = 1 / np.sqrt(n)  # optimal distance between nodes
+    samples = min(negative_samples, n - 1)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        # repulsion from a few random nodes
+        others = rng.integers(0, n, size=(n, samples))
+        delta = pos[:, None, :] - pos[others]
+        distance = np.maximum(np.linalg.norm(delta, axis=2), 0.01)
+        displacement = (delta * (k * k / distance**2)[:, :, None]).sum(axis=1) * (
+            (n - 1) / samples
+        )
+
+        # attraction along the edges
+        if len(edges):
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            distance = np.maximum(np.linalg.norm(delta, axis=1), 0.01)
+            force = delta * (distance / k)[:, None]
+            np.add.at(displacement, edges[:, 0], -force)
+            np.add.at(displacement, edges[:, 1], force)
+
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 0.01)
+        pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    pos -= pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    if scale > 0:
+        pos /= scale
+    return dict(zip(nodes, pos))
+
+
+def graph_fingerprint(nx_graph):
+    """
+    Fingerprint the structure of a graph (its nodes and edges), e.g. to cache its layout.
+
+    Args:
+        nx_graph (nx.Graph): The graph.
+
+    Returns:
+        str: A SHA-1 hex digest, equal for graphs with the same nodes and edges.
+    """
+    digest = hashlib.sha1()
+    for node in sorted(nx_graph):
+        digest.update(node.encode("utf-8") + b"\n")
+    digest.update(b"\x00")
+    for u, v in sorted(nx_graph.edges()):
+        digest.update(u.encode("utf-8") + b"\t" + v.encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def cached_layout(nx_graph, cache_dir=None, small_graph=300, **options):
+    """
+    Compute the layout of a graph once and reuse it for the same graph.
+
+    Small graphs get nx.spring_layout, larger ones `force_layout`. Layouts are cached in memory and,
+    if cache_dir is given, as JSON files there, so they survive the session.
+
+    Args:
+        nx_graph (nx.Graph): The graph.
+        cache_dir (str, optional): Directory of the on-disk layout cache.
+        small_graph (int): Graphs with at most this many nodes use nx.spring_layout.
+        **options: Passed to `force_layout`.
+
+    Returns:
+        dict: node -> np.ndarray position.
+    """
+    key = graph_fingerprint(nx_graph) + json.dumps(
+        dict(options, small_graph=small_graph), sort_keys=True
+    )
+    key = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    if key in _layout_cache:
+        return _layout_cache[key]
+
+    path = os.path.join(cache_dir, f"layout_{key}.json") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            pos = {node: np.array(xy) for node, xy in json.load(f).items()}
+    else:
+        if len(nx_graph) <= small_graph:
+            pos = nx.spring_layout(nx_graph, k=0.5, seed=options.get("seed", 0))
+        else:
+            pos = force_layout(nx_graph, **options)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({node: [float(x), float(y)] for node, (x, y) in pos.items()}, f)
+
+    _layout_cache[key] = pos
+    return pos
+
+
+def _flat_attributes(attributes):
+    return {
+        key: "; ".join(map(str, value)) if isinstance(value, list) else value
+        for key, value in attributes.items()
+    }
+
+
+def write_gexf(nx_graph, pos, path):
+    """
+    Write a graph with its layout as GEXF, e.g. to explore it in Gephi.
+
+    Args:
+        nx_graph (nx.Graph): The graph (from `rdf_to_networkx`).
+        pos (dict): node -> position.
+        path (str): Path of the .gexf file.
+    """
+    export = nx.DiGraph()
+    for node, attributes in nx_graph.nodes(data=True):
+        x, y = pos[node]
+        export.add_node(
+            node,
+            **_flat_attributes(attributes),
+            viz={"position": {"x": float(x) * 1000, "y": float(y) * 1000, "z": 0.0}},
+        )
+    export.add_edges_from(nx_graph.edges(data=True))
+    nx.write_gexf(export, path)
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+  body {{ margin: 0; font-family: sans-serif; overflow: hidden; }}
+  #info {{ position: absolute; top: 8px; left: 8px; background: rgba(255,255,255,0.9);
+          padding: 6px 8px; font-size: 12px; max-width: 40%; white-space: pre-wrap; }}
+</style>
+</head>
+<body>
+<canvas id="graph"></canvas>
+<div id="info">{title}: {node_count} nodes, {edge_count} edges. Drag to pan, scroll to zoom, hover a node for details.</div>
+<script>
+const data = {data};
+const canvas = document.getElementById("graph");
+const info = document.getElementById("info");
+const ctx = canvas.getContext("2d");
+const colors = {{}};
+const palette = ["#4c72b0", "#dd8452", "#55a868", "#c44e52", "#8172b3", "#937860", "#da8bc3", "#8c8c8c"];
+data.nodes.forEach(n => {{ if (!(n.group in colors)) colors[n.group] = palette[Object.keys(colors).length % palette.length]; }});
+let scale = 1, offsetX = 0, offsetY = 0, dragging = null;
+function resize() {{ canvas.width = window.innerWidth; canvas.height = window.innerHeight; draw(); }}
+function toScreen(n) {{
+  const size = Math.min(canvas.width, canvas.height) * 0.45;
+  return [canvas.width / 2 + (n.x * size + offsetX) * scale, canvas.height / 2 + (n.y * size + offsetY) * scale];
+}}
+function draw() {{
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  ctx.strokeStyle = "rgba(120,120,120,0.25)";
+  ctx.beginPath();
+  data.edges.forEach(([a, b]) => {{
+    const [x1, y1] = toScreen(data.nodes[a]), [x2, y2] = toScreen(data.nodes[b]);
+    ctx.moveTo(x1, y1); ctx.lineTo(x2, y2);
+  }});
+  ctx.stroke();
+  const radius = Math.max(1.5, Math.min(6, 2 * Math.sqrt(scale)));
+  data.nodes.forEach(n => {{
+    const [x, y] = toScreen(n);
+    ctx.fillStyle = colors[n.group];
+    ctx.beginPath(); ctx.arc(x, y, radius, 0, 2 * Math.PI); ctx.fill();
+    if (scale > 4) {{ ctx.fillStyle = "#222"; ctx.font = "10px sans-serif"; ctx.fillText(n.label, x + radius + 2, y + 3); }}
+  }});
+}}
+canvas.addEventListener("mousedown", e => dragging = [e.clientX, e.clientY]);
+window.addEventListener("mouseup", () => dragging = null);
+canvas.addEventListener("mousemove", e => {{
+  if (dragging) {{
+    offsetX += (e.clientX - dragging[0]) / scale; offsetY += (e.clientY - dragging[1]) / scale;
+    dragging = [e.clientX, e.clientY]; draw(); return;
+  }}
+  let best = null, bestDistance = 64;
+  data.nodes.forEach(n => {{
+    const [x, y] = toScreen(n), d = (x - e.clientX) ** 2 + (y - e.clientY) ** 2;
+    if (d < bestDistance) {{ best = n; bestDistance = d; }}
+  }});
+  if (best) info.textContent = best.id + "\\n" + Object.entries(best.attributes).map(([k, v]) => k + ": " + v).join("\\n");
+}});
+canvas.addEventListener("wheel", e => {{
+  e.preventDefault(); scale *= e.deltaY < 0 ? 1.2 : 1 / 1.2; draw();
+}}, {{ passive: false }});
+window.addEventListener("resize", resize);
+resize();
+</script>
+</body>
+</html>
+"""
+
+
+def write_html(nx_graph, pos, path, title="RDF Graph Visualization"):
+    """
+    Write a graph with its layout as a self-contained interactive HTML page (pan, zoom, hover for attributes).
+
+    The page draws on a canvas and needs no external scripts, so it also works offline for large graphs.
+
+    Args:
+        nx_graph (nx.Graph): The graph (from `rdf_to_networkx`).
+        pos (dict): node -> position.
+        path (str): Path of the .html file.
+        title (str): Title of the page.
+    """
+    index = {node: i for i, node in enumerate(nx_graph)}
+    nodes = []
+    for node, attributes in nx_graph.nodes(data=True):
+        x, y = pos[node]
+        flat = _flat_attributes(attributes)
+        nodes.append(
+            {
+                "id": node,
+                "label": str(flat.get("label", node)),
+                "group": str(flat.get("type", "")),
+                "x": round(float(x), 5),
+                "y": round(float(-y), 5),  # the y axis points down on a canvas
+                "attributes": {key: str(value) for key, value in flat.items() if key != "label"},
+            }
+        )
+    edges = [[index[u], index[v]] for u, v in nx_graph.edges()]
+    data = json.dumps({"nodes": nodes, "edges": edges}, ensure_ascii=False)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            HTML_TEMPLATE.format(
+                title=html.escape(title),
+                node_count=len(nodes),
+                edge_count=len(edges),
+                data=data.replace("</", "<\\/"),
+            )
+        )
+
+
+def draw(nx_graph, pos, title="RDF Graph Visualization", labels=None):
+    """
+    Draw a large graph with matplotlib: small markers, no edge labels, node labels only for small graphs.
+
+    Args:
+        nx_graph (nx.Graph): The graph (from `rdf_to_networkx`).
+        pos (dict): node -> position.
+        title (str): Title of the figure.
+        labels (bool, optional): Whether to draw node labels, by default only up to 100 nodes.
+    """
+    import matplotlib.pyplot as plt
+
+    if labels is None:
+        labels = len(nx_graph) <= 100
+    groups = sorted({str(nx_graph.nodes[node].get("type", "")) for node in nx_graph})
+    colors = [
+        groups.index(str(nx_graph.nodes[node].get("type", ""))) for node in nx_graph
+    ]
+
+    plt.figure(figsize=(12, 8))
+    nx.draw_networkx_edges(
+        nx_graph, pos, alpha=0.2, width=0.5, arrows=len(nx_graph) <= 100
+    )
+    nx.draw_networkx_nodes(
+        nx_graph,
+        pos,
+        node_size=max(5, min(300, 20000 // max(len(nx_graph), 1))),
+        node_color=colors,
+        cmap="tab10",
+        vmin=0,
+        vmax=9,
+    )
+    if labels:
+        nx.draw_networkx_labels(
+            nx_graph, pos, nx.get_node_attributes(nx_graph, "label"), font_size=7
+        )
+    plt.title(title)
+    plt.axis("off")
+    plt.show()
+
+
+def visualize(
+    rdf_graph,
+    output=None,
+    predicates=None,
+    exclude_predicates=None,
+    node_filter=None,
+    cache_dir=None,
+    **layout_options,
+):
+    """
+    Visualize a (large) RDF graph: filter it, aggregate literal values into node attributes,
+    lay it out with a cached fast layout and either export it or draw it.
+
+    Args:
+        rdf_graph (rdflib.Graph): The RDF graph.
+        output (str, optional): Export to this path instead of drawing, ".html" for an interactive page,
+            ".gexf" for Gephi.
+        predicates (iterable, optional): Only keep these predicates, see `rdf_to_networkx`.
+        exclude_predicates (iterable, optional): Drop these predicates.
+        node_filter (callable, optional): Keep only the resources for which it returns True.
+        cache_dir (str, optional): Directory of the on-disk layout cache.
+        **layout_options: Passed to `force_layout`.
+
+    Returns:
+        nx.DiGraph: The visualized graph (positions in the "pos" graph attribute).
+
+    Raises:
+        ValueError: If the output path has an unsupported extension.
+    """
+    if output is not None and not str(output).endswith((".html", ".gexf")):
+        raise ValueError(f"Unsupported output {output!r}, expected a .html or .gexf path")
+
+    nx_graph = rdf_to_networkx(
+        rdf_graph, predicates, exclude_predicates, node_filter, aggregate_literals=True
+    )
+    pos = cached_layout(nx_graph, cache_dir, **layout_options)
+    nx_graph.graph["pos"] = pos
+
+    if output is None:
+        draw(nx_graph, pos)
+    elif str(output).endswith(".html"):
+        write_html(nx_graph, pos, output)
+    else:
+        write_gexf(nx_graph, pos, output)
+    return nx_graph
@@ -0,0 +1,339 @@
+import asyncio
+import json
+import math
+import os
+
+import pandas as pd
+
+from .museum_client import MuseumClient, run_sync
+
+# How to page through the open-access APIs of the two museums.
+# "records" and "total" are the paths to the records and to the total number of records in a response.
+SOURCES = {
+    "aic": {
+        "url": "https://api.artic.edu/api/v1/artworks",
+        "paging": "page",
+        "records": ("data",),
+        "total": ("pagination", "total"),
+        "max_page_size": 100,
+    },
+    "cleveland": {
+        "url": "https://openaccess-api.clevelandart.org/api/artworks/",
+        "paging": "skip",
+        "records": ("data",),
+        "total": ("info", "total"),
+        "max_page_size": 1000,
+    },
+}
+
+
+def _lookup(data, path):
+    for key in path:
+        data = data[key]
+    return data
+
+
+def repair_store(path):
+    """
+    Cut a JSONL store back to its last complete line.
+
+    A crash while a page is written can leave a partial last line, records appended after it would
+    be glued to it. The page itself is not checkpointed yet, so it is fetched again.
+
+    Args:
+        path (str): Path of the JSONL store.
+
+    Returns:
+        int: Number of bytes removed.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb+") as f:
+        size = end = f.seek(0, os.SEEK_END)
+        while end > 0:  # searches the last newline backwards, block by block
+            start = max(0, end - 65536)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+    return size - end
+
+
+def read_records(path, source=None):
+    """
+    Load a harvested JSONL store into a DataFrame.
+
+    Records that were written twice (a page re-fetched after a crash) and malformed lines are dropped.
+
+    Args:
+        path (str): Path of the JSONL store.
+        source (str, optional): Value of an added "source" column (e.g. "Chicago").
+
+    Returns:
+        pd.DataFrame: One row per harvested record.
+    """
+    # parsed line by line: a line cut off by a crash (see repair_store) is skipped instead of failing the read
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Skipping malformed line {number} of {path}")
+    df = pd.DataFrame(records)
+    if "id" in df.columns:
+        df = df.drop_duplicates(subset="id").reset_index(drop=True)
+    if source is not None:
+        df["source"] = source
+    return df
+
+
+class Harvester:
+    """
+    A resumable bulk harvester for the Art Institute of Chicago and Cleveland open-access APIs.
+
+    Pages are fetched concurrently through a MuseumClient and only the requested `fields` are asked for.
+    Records are appended to a JSONL store as soon as their page arrives. After each page the
+    set of finished pages is checkpointed, so an interrupted harvest continues where it stopped.
+    """
+
+    def __init__(
+        self,
+        source,
+        store_path,
+        fields=None,
+        page_size=100,
+        checkpoint_path=None,
+        url=None,
+        client=None,
+        retries=3,
+        params=None,
+    ):
+        """
+        Args:
+            source (str): "aic" or "cleveland".
+            store_path (str): Path of the append-only JSONL store.
+            fields (list, optional): Fields to request, all fields if omitted.
+            page_size (int): Records per request (capped at the API maximum).
+            checkpoint_path (str, optional): Path of the checkpoint, defaults to `store_path` + ".checkpoint.json".
+            url (str, optional): Overrides the API endpoint, e.g. for a local mock server.
+            client (MuseumClient, optional): Client used for the requests. By default a new one that bypasses the response cache,
+                closed after each harvest (see `close`).
+            retries (int): Attempts per page before the page is given up (it is retried on the next run).
+            params (dict, optional): Further query parameters, e.g. {"q": "Roman"}.
+
+        Raises:
+            ValueError: If the source is unknown.
+        """
+        if source not in SOURCES:
+            raise ValueError(f"Unknown source {source!r}, expected one of {sorted(SOURCES)}")
+
+        self.source = source
+        self.spec = SOURCES[source]
+        self.url = url or self.spec["url"]
+        self.store_path = store_path
+        self.checkpoint_path = checkpoint_path or f"{store_path}.checkpoint.json"
+        self.fields = list(fields) if fields else None
+        self.page_size = min(page_size, self.spec["max_page_size"])
+        self._own_client = client is None  # a client created here is closed by close()
+        self.client = client or MuseumClient(use_cache=False)
+        self.retries = retries
+        self.params = dict(params or {})
+
+    def page_params(self, page):
+        """
+        Build the query parameters of a page (pages are numbered from 1).
+
+        Args:
+            page (int): The page number.
+
+        Returns:
+            dict: The query parameters.
+        """
+        params = dict(self.params, limit=self.page_size)
+        if self.spec["paging"] == "page":
+            params["page"] = page
+        else:
+            params["skip"] = (page - 1) * self.page_size
+        if self.fields:
+            params["fields"] = ",".join(self.fields)
+        return params
+
+    def load_checkpoint(self):
+        """
+        Returns:
+            dict: The saved checkpoint, or a fresh one if there is none or it belongs to another harvest.
+        """
+        fresh = {
+            "source": self.source,
+            "url": self.url,
+            "params": self.page_params(1),
+            "total": None,
+            "done": [],
+        }
+        if not os.path.exists(self.checkpoint_path):
+            return fresh
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if any(checkpoint.get(key) != fresh[key] for key in ("source", "url", "params")):
+            return fresh
+        return checkpoint
+
+    def save_checkpoint(self, checkpoint):
+        """
+        Atomically write the checkpoint, so a crash never leaves a half-written file.
+
+        Args:
+            checkpoint (dict): The checkpoint to save.
+        """
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    async def fetch_page(self, page, semaphore):
+        """
+        Fetch one page, retrying failed requests with exponential backoff.
+
+        Args:
+            page (int): The page number.
+            semaphore (asyncio.Semaphore): Limits the number of concurrent requests.
+
+        Returns:
+            dict: The decoded response.
+        """
+        for attempt in range(self.retries):
+            try:
+                return await self.client.fetch_json(
+                    self.url, self.page_params(page), semaphore
+                )
+            except Exception:
+                if attempt == self.retries - 1:
+                    raise
+                await asyncio.sleep(2**attempt)
+
+    async def harvest_async(self, max_records=None):
+        """
+        Asynchronous version of `harvest`.
+        """
+        semaphore = asyncio.Semaphore(self.client.concurrency)
+        checkpoint = self.load_checkpoint()
+        done = set(checkpoint["done"])
+        written = 0
+
+        repair_store(self.store_path)
+        with open(self.store_path, "a", encoding="utf-8") as store:
+
+            def store_page(page, data):
+                # the page is serialized first and written at once, it is on disk before it is checkpointed
+                records = _lookup(data, self.spec["records"])
+                store.write(
+                    "".join(
+                        json.dumps(record, ensure_ascii=False) + "\n"
+                        for record in records
+                    )
+                )
+                store.flush()
+                os.fsync(store.fileno())
+                done.add(page)
+                checkpoint["done"] = sorted(done)
+                self.save_checkpoint(checkpoint)
+                return len(records)
+
+            # the first page tells how many records (and therefore pages) there are
+            if checkpoint["total"] is None:
+                data = await self.fetch_page(1, semaphore)
+                checkpoint["total"] = _lookup(data, self.spec["total"])
+                if 1 not in done:
+                    written += store_page(1, data)
+
+            total = checkpoint["total"]
+            if max_records is not None:
+                total = min(total, max_records)
+            pages = [
+                page
+                for page in range(1, math.ceil(total / self.page_size) + 1)
+                if page not in done
+            ]
+
+            # only a bounded window of pages is in flight, so memory does not grow with the harvest
+            window = 2 * self.client.concurrency
+            pending = set()
+            failed = []
+            pages = iter(pages)
+            while True:
+                for page in pages:
+                    task = asyncio.ensure_future(self.fetch_page(page, semaphore))
+                    task.page = page
+                    pending.add(task)
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+
+                finished, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    if task.exception() is not None:
+                        failed.append(task.page)
+                        print(f"Error fetching page {task.page}: {task.exception()}")
+                    else:
+                        written += store_page(task.page, task.result())
+
+        if failed:
+            print(
+                f"{len(failed)} pages failed, run harvest again to fetch them: {sorted(failed)}"
+            )
+        return written
+
+    def harvest(self, max_records=None):
+        """
+        Harvest all (remaining) pages into the store.
+
+        Pages finished in an earlier run are skipped. Pages that fail after all retries are left
+        out of the checkpoint and fetched again on the next run.
+
+        Args:
+            max_records (int, optional): Stop after this many records (rounded up to whole pages).
+
+        Returns:
+            int: Number of records written in this run.
+        """
+        try:
+            return run_sync(self.harvest_async(max_records))
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Close the pooled connections of the client, if the harvester created it.
+
+        A later harvest opens new connections.
+        """
+        if self._own_client:
+            self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def to_dataframe(self, source=None):
+        """
+        Load everything harvested so far.
+
+        Args:
+            source (str, optional): Value of an added "source" column.
+
+        Returns:
+            pd.DataFrame: One row per harvested record.
+        """
+        return read_records(self.store_path, source)
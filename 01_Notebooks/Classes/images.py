@@ -0,0 +1,291 @@
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cache import DEFAULT_CACHE_PATH
+from .parallel import split
+
+# IIIF image of the Art Institute of Chicago, 843 px wide
+IIIF_TEMPLATE = "https://www.artic.edu/iiif/2/{image_id}/full/843,/0/default.jpg"
+
+DEFAULT_IMAGE_DIR = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "images")
+
+IMAGE_SIZE = (224, 224)  # input size of VGG16 / MobileNetV2
+
+
+class ImageCache:
+    """
+    A content-addressed directory of downloaded images.
+
+    Each image is stored once, under the SHA-1 of its `image_id`, in a subdirectory named after the
+    first two hex digits (so no directory grows too large). Files are written atomically, an
+    interrupted run never leaves a truncated image behind.
+    """
+
+    def __init__(self, directory=DEFAULT_IMAGE_DIR):
+        """
+        Args:
+            directory (str): Where the images are stored, by default next to the response cache.
+        """
+        self.directory = directory
+
+    def path(self, image_id):
+        """
+        Args:
+            image_id (str): Identifier of the image, e.g. the IIIF image_id of the Chicago API.
+
+        Returns:
+            str: Path of the cached image (which may not exist yet).
+        """
+        digest = hashlib.sha1(str(image_id).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def __contains__(self, image_id):
+        return os.path.exists(self.path(image_id))
+
+    def put(self, image_id, data):
+        """
+        Store the bytes of an image.
+
+        Args:
+            image_id (str): Identifier of the image.
+            data (bytes): The encoded image as downloaded.
+
+        Returns:
+            str: Path of the cached image.
+        """
+        path = self.path(image_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+        return path
+
+    def discard(self, image_id):
+        """
+        Remove an image from the cache, e.g. one that cannot be decoded, so it is downloaded again.
+
+        Args:
+            image_id (str): Identifier of the image.
+        """
+        try:
+            os.remove(self.path(image_id))
+        except FileNotFoundError:
+            pass
+
+
+async def fetch_images(image_ids, cache, client, template=IIIF_TEMPLATE):
+    """
+    Download the images that are not cached yet, concurrently.
+
+    Args:
+        image_ids (iterable): Identifiers of the images.
+        cache (ImageCache): Where the images are stored.
+        client (MuseumClient): Client the downloads are sent through (concurrency and rate limit).
+        template (str): URL of an image, with an {image_id} placeholder.
+
+    Returns:
+        dict: image_id -> path of the cached image, None if the download failed.
+    """
+    paths = {}
+    missing = []
+    for image_id in dict.fromkeys(image_ids):
+        if image_id in cache:
+            paths[image_id] = cache.path(image_id)
+        else:
+            missing.append(image_id)
+
+    semaphore = asyncio.Semaphore(client.concurrency)
+
+    async def fetch(image_id):
+        # every image is stored as soon as it arrives, so only the images in flight are held in memory
+        # and a crash keeps the finished downloads
+        try:
+            data = await client.fetch_bytes(template.format(image_id=image_id), semaphore)
+        except Exception as e:
+            print(f"Error downloading image {image_id}: {e}")
+            return None
+        return cache.put(image_id, data)
+
+    fetched = await asyncio.gather(*(fetch(image_id) for image_id in missing))
+    paths.update(zip(missing, fetched))
+    return paths
+
+
+def download_images(image_ids, cache=None, client=None, template=IIIF_TEMPLATE):
+    """
+    Synchronous version of `fetch_images`, also usable inside Jupyter.
+
+    Args:
+        image_ids (iterable): Identifiers of the images.
+        cache (ImageCache, optional): Where the images are stored, by default DEFAULT_IMAGE_DIR.
+        client (MuseumClient, optional): By default a client with 16 concurrent downloads.
+        template (str): URL of an image, with an {image_id} placeholder.
+
+    Returns:
+        dict: image_id -> path of the cached image, None if the download failed.
+    """
+    from .museum_client import MuseumClient, run_sync
+
+    cache = cache or ImageCache()
+    own_client = client is None  # a client created here is closed again after the downloads
+    client = client or MuseumClient(concurrency=16, use_cache=False)
+    try:
+        return run_sync(fetch_images(image_ids, cache, client, template))
+    finally:
+        if own_client:
+            client.close()
+
+
+def decode_image(path, size=IMAGE_SIZE):
+    """
+    Decode an image and resize it.
+
+    JPEGs are decoded at a reduced scale right away (Pillow's draft mode), which is much faster
+    than decoding the full image and shrinking it afterwards.
+
+    Args:
+        path (str): Path of the encoded image.
+        size (tuple): (width, height) of the result.
+
+    Returns:
+        np.ndarray: RGB pixels as uint8, of shape (height, width, 3).
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.draft("RGB", size)
+        return np.asarray(img.convert("RGB").resize(size), dtype=np.uint8)
+
+
+def decode_into(output, rows, paths, size=IMAGE_SIZE):
+    """
+    Decode images into rows of a `.npy` file (runs in a worker process).
+
+    Args:
+        output (str): Path of the `.npy` file, opened as a memory map.
+        rows (list): Rows of the array to fill.
+        paths (list): Path of the image of each row.
+        size (tuple): (width, height) of the images.
+
+    Returns:
+        list: The rows whose image could not be decoded.
+    """
+    images = np.load(output, mmap_mode="r+")
+    failed = []
+    for row, path in zip(rows, paths):
+        try:
+            images[row] = decode_image(path, size)
+        except Exception as e:
+            print(f"Error decoding image {path}: {e}")
+            failed.append(row)
+    images.flush()
+    return failed
+
+
+def build_image_array(
+    image_ids,
+    output,
+    cache=None,
+    client=None,
+    size=IMAGE_SIZE,
+    workers=None,
+    template=IIIF_TEMPLATE,
+):
+    """
+    Download, decode and resize images into a memory-mapped `.npy` array.
+
+    Missing images are downloaded concurrently into the cache and decoded by several processes,
+    which write their rows straight into the array. Cached images that cannot be decoded are
+    downloaded and decoded once more. The pixels are kept as uint8 RGB (4x smaller than
+    float32), the model-specific normalization (e.g. preprocess_input of VGG16) is applied per batch
+    when the images are fed to a model.
+
+    Args:
+        image_ids (list): Identifiers of the images, one row each.
+        output (str): Path of the `.npy` file to write.
+        cache (ImageCache, optional): Where the images are stored, by default DEFAULT_IMAGE_DIR.
+        client (MuseumClient, optional): Client for the downloads, see `download_images`.
+        size (tuple): (width, height) of the images.
+        workers (int, optional): Number of decoding processes, by default one per CPU.
+        template (str): URL of an image, with an {image_id} placeholder.
+
+    Returns:
+        tuple: (images, valid) – the array as a read-only memory map of shape (n, height, width, 3)
+        and a boolean array telling which rows hold an image (rows of failed images are black).
+        `valid` is also saved next to the array, see `load_image_array`.
+    """
+    cache = cache or ImageCache()
+    paths = download_images(image_ids, cache, client, template)
+
+    images = np.lib.format.open_memmap(
+        output, mode="w+", dtype=np.uint8, shape=(len(image_ids), size[1], size[0], 3)
+    )
+    del images  # the header is written, the rows are filled by decode_into
+
+    valid = np.zeros(len(image_ids), dtype=bool)
+    rows = [row for row, image_id in enumerate(image_ids) if paths[image_id]]
+    valid[rows] = True
+
+    workers = min(workers or os.cpu_count() or 1, max(len(rows), 1))
+    parts = [part for part in split(rows, workers) if part]
+    tasks = [(part, [paths[image_ids[row]] for row in part]) for part in parts]
+    if workers == 1:
+        failed = [
+            row
+            for part, part_paths in tasks
+            for row in decode_into(output, part, part_paths, size)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(decode_into, output, part, part_paths, size)
+                for part, part_paths in tasks
+            ]
+            failed = [row for future in futures for row in future.result()]
+
+    # a cached image that cannot be decoded (e.g. truncated) is downloaded once more,
+    # otherwise every later run would fail on it again
+    retry_ids = list(dict.fromkeys(image_ids[row] for row in failed))
+    if retry_ids:
+        for image_id in retry_ids:
+            cache.discard(image_id)
+        paths.update(download_images(retry_ids, cache, client, template))
+        retry_rows = [row for row in failed if paths[image_ids[row]]]
+        failed = [row for row in failed if not paths[image_ids[row]]]
+        failed += decode_into(
+            output, retry_rows, [paths[image_ids[row]] for row in retry_rows], size
+        )
+    valid[failed] = False
+
+    np.save(valid_path(output), valid)
+    return np.load(output, mmap_mode="r"), valid
+
+
+def valid_path(output):
+    """
+    Args:
+        output (str): Path of an image array.
+
+    Returns:
+        str: Path of the array telling which of its rows hold an image.
+    """
+    root, _ = os.path.splitext(output)
+    return f"{root}_valid.npy"
+
+
+def load_image_array(output):
+    """
+    Open an image array written by `build_image_array` without reading it into memory.
+
+    Args:
+        output (str): Path of the `.npy` file.
+
+    Returns:
+        tuple: (images, valid), see `build_image_array`.
+    """
+    return np.load(output, mmap_mode="r"), np.load(valid_path(output))
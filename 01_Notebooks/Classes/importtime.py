@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+
+# dependencies that must only be loaded by the methods needing them (plotting, graphs, SPARQL, HTTP)
+LAZY_MODULES = (
+    "matplotlib",
+    "seaborn",
+    "networkx",
+    "rdflib.plugins.sparql",
+    "SPARQLWrapper",
+    "pyoxigraph",
+    "http.server",
+    "requests",
+)
+
+# directory containing the Classes package, the imports are run from there
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr):
+    """
+    Parse the report of `python -X importtime`.
+
+    Args:
+        stderr (str): Standard error of the interpreter.
+
+    Returns:
+        dict: module name -> cumulative import time in seconds (including its own imports).
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def import_profile(module="Classes.Collection", python=sys.executable):
+    """
+    Import a module in a fresh interpreter with `-X importtime`, i.e. measure its cold start.
+
+    Args:
+        module (str): The module to import.
+        python (str): The interpreter to use, by default the current one.
+
+    Returns:
+        dict: "seconds" (cumulative import time of the module), "times" (module -> seconds, see
+        `parse_importtime`) and "lazy_loaded" (the LAZY_MODULES that were loaded anyway).
+
+    Raises:
+        subprocess.CalledProcessError: If the module cannot be imported.
+    """
+    process = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PACKAGE_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = parse_importtime(process.stderr)
+    return {
+        "seconds": times.get(module),
+        "times": times,
+        "lazy_loaded": [name for name in LAZY_MODULES if name in times],
+    }
+
+
+def check_cold_start(modules=("Classes.Collection",), repeat=3, budget=None):
+    """
+    Regression check for the cold start of the package: none of the LAZY_MODULES may be loaded
+    by importing the modules, and optionally the import must stay within a time budget.
+
+    Args:
+        modules (iterable): Modules to import, each in its own interpreter.
+        repeat (int): Imports per module, the fastest one counts.
+        budget (float, optional): Maximum import time in seconds.
+
+    Returns:
+        dict: module -> (fastest import time in seconds, LAZY_MODULES loaded by the import).
+
+    Raises:
+        RuntimeError: If a module loads one of the LAZY_MODULES or exceeds the budget.
+    """
+    results = {}
+    for module in modules:
+        profiles = [import_profile(module) for _ in range(repeat)]
+        seconds = min(profile["seconds"] for profile in profiles)
+        results[module] = (seconds, profiles[0]["lazy_loaded"])
+
+    problems = [
+        f"{module} loads {', '.join(loaded)}"
+        for module, (_, loaded) in results.items()
+        if loaded
+    ]
+    if budget is not None:
+        problems += [
+            f"{module} takes {seconds:.3f}s to import (budget {budget:.3f}s)"
+            for module, (seconds, _) in results.items()
+            if seconds > budget
+        ]
+    if problems:
+        raise RuntimeError("Slow cold start: " + "; ".join(problems))
+    return results
+
+
+if __name__ == "__main__":
+    # python -m Classes.importtime [module ...], run from 01_Notebooks
+    for module, (seconds, _) in check_cold_start(sys.argv[1:] or ["Classes.Collection"]).items():
+        print(f"{module}: {seconds * 1000:.0f} ms")
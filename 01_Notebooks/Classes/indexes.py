@@ -0,0 +1,143 @@
+from bisect import bisect_left, bisect_right
+
+import pandas as pd
+
+
+def _is_missing(value):
+    return value is None or (not isinstance(value, (list, tuple)) and pd.isna(value))
+
+
+class HashIndex:
+    """
+    Maps attribute values to the positions of the items having them (e.g. culture -> artifacts).
+
+    Items with several values (e.g. tags) are added under each value, which makes it an inverted index.
+    """
+
+    def __init__(self):
+        self._positions = {}
+
+    def add(self, value, position):
+        """
+        Index an item under one value, missing values are skipped.
+
+        Args:
+            value: The attribute value.
+            position (int): Position of the item in its collection.
+        """
+        if not _is_missing(value):
+            self._positions.setdefault(value, set()).add(position)
+
+    def add_many(self, values, position):
+        """
+        Index an item under each of several values.
+
+        Args:
+            values (list): The attribute values.
+            position (int): Position of the item in its collection.
+        """
+        for value in values:
+            self.add(value, position)
+
+    def lookup(self, value):
+        """
+        Args:
+            value: The attribute value.
+
+        Returns:
+            set: Positions of the items with this value.
+        """
+        return self._positions.get(value, set())
+
+    def values(self):
+        """
+        Returns:
+            list: All indexed values.
+        """
+        return list(self._positions)
+
+
+class SortedIndex:
+    """
+    Keeps the positions of items sorted by a numeric attribute (e.g. accessionYear) for range queries.
+
+    New items are buffered and merged on the next query, so adding stays O(1).
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._positions = []
+        self._pending = []
+        self._key_by_position = {}
+
+    def add(self, key, position):
+        """
+        Index an item, missing keys are skipped.
+
+        Args:
+            key (float): The attribute value.
+            position (int): Position of the item in its collection.
+        """
+        if not _is_missing(key):
+            self._pending.append((key, position))
+            self._key_by_position[position] = key
+
+    def _merge(self):
+        if self._pending:
+            entries = list(zip(self._keys, self._positions))
+            entries += sorted(self._pending)
+            entries.sort()  # both parts are sorted runs, so this is a linear merge
+            self._keys = [key for key, _ in entries]
+            self._positions = [position for _, position in entries]
+            self._pending = []
+
+    def _bounds(self, low, high):
+        self._merge()
+        start = 0 if low is None else bisect_left(self._keys, low)
+        end = len(self._keys) if high is None else bisect_right(self._keys, high)
+        return start, max(start, end)
+
+    def range(self, low=None, high=None):
+        """
+        Find the items whose key lies in [low, high].
+
+        Args:
+            low (float, optional): Lower bound (inclusive), unbounded if None.
+            high (float, optional): Upper bound (inclusive), unbounded if None.
+
+        Returns:
+            list: Positions of the matching items.
+        """
+        start, end = self._bounds(low, high)
+        return self._positions[start:end]
+
+    def count(self, low=None, high=None):
+        """
+        Count the items whose key lies in [low, high] without collecting them.
+
+        Args:
+            low (float, optional): Lower bound (inclusive), unbounded if None.
+            high (float, optional): Upper bound (inclusive), unbounded if None.
+
+        Returns:
+            int: Number of matching items.
+        """
+        start, end = self._bounds(low, high)
+        return end - start
+
+    def contains(self, position, low=None, high=None):
+        """
+        Check whether an indexed item's key lies in [low, high].
+
+        Args:
+            position (int): Position of the item in its collection.
+            low (float, optional): Lower bound (inclusive), unbounded if None.
+            high (float, optional): Upper bound (inclusive), unbounded if None.
+
+        Returns:
+            bool: False if the item has no key or it is out of range.
+        """
+        key = self._key_by_position.get(position)
+        if key is None:
+            return False
+        return (low is None or key >= low) and (high is None or key <= high)
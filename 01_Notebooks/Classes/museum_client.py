@@ -0,0 +1,223 @@
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .Artifact import CHICAGO_URL, CLEVELAND_URL
+from .cache import cached_get_json
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Inside Jupyter an event loop is already running, so the coroutine is then run
+    on its own loop in a helper thread.
+
+    Args:
+        coro (coroutine): The coroutine to run.
+
+    Returns:
+        The result of the coroutine.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def target():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+class RateLimiter:
+    """
+    Spaces out the requests to one host so that at most `rate` requests start per second.
+
+    The limiter is not bound to an event loop, so one client can be reused across runs.
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate (float): Maximum requests per second, None or 0 for no limit.
+        """
+        self.interval = 1 / rate if rate else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    async def wait(self):
+        """
+        Wait until the next request may be sent.
+        """
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class MuseumClient:
+    """
+    A concurrent client for the Chicago and Cleveland museum APIs.
+
+    Requests run on asyncio with a bounded number in flight. They share one pooled
+    `requests.Session`, and each host is rate limited separately. Responses go through
+    the shared response cache. The base URLs are configurable, e.g. to point to a local mock server.
+    """
+
+    def __init__(
+        self,
+        chicago_url=CHICAGO_URL,
+        cleveland_url=CLEVELAND_URL,
+        concurrency=8,
+        rate_limit=10.0,
+        timeout=10,
+        use_cache=True,
+    ):
+        """
+        Args:
+            chicago_url (str): Search endpoint of the Art Institute of Chicago API.
+            cleveland_url (str): Artworks endpoint of the Cleveland Museum of Art API.
+            concurrency (int): Maximum number of requests in flight at the same time.
+            rate_limit (float): Maximum requests per second and host, None for no limit.
+            timeout (float): Timeout of a single request in seconds.
+            use_cache (bool): Whether responses go through the shared response cache.
+        """
+        self.chicago_url = chicago_url
+        self.cleveland_url = cleveland_url
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.use_cache = use_cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._limiters = {}
+
+    def _limiter(self, url):
+        host = urlparse(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = RateLimiter(self.rate_limit)
+        return self._limiters[host]
+
+    async def fetch_json(self, url, params=None, semaphore=None):
+        """
+        GET a JSON response without blocking the event loop.
+
+        Args:
+            url (str): URL of the API endpoint.
+            params (dict): Query parameters.
+            semaphore (asyncio.Semaphore): Limits the number of concurrent requests.
+
+        Returns:
+            The decoded JSON response.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+        async with semaphore:
+            await self._limiter(url).wait()
+            return await asyncio.to_thread(self._get_json, url, params)
+
+    async def fetch_bytes(self, url, semaphore=None):
+        """
+        GET a binary response (e.g. an image) without blocking the event loop, bypassing the response cache.
+
+        Args:
+            url (str): URL of the resource.
+            semaphore (asyncio.Semaphore): Limits the number of concurrent requests.
+
+        Returns:
+            bytes: The response body.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+        async with semaphore:
+            await self._limiter(url).wait()
+            return await asyncio.to_thread(self._get_bytes, url)
+
+    def _get_bytes(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    def _get_json(self, url, params):
+        if self.use_cache:
+            return cached_get_json(
+                url, params, session=self.session, timeout=self.timeout
+            )
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_many(self, requests_):
+        """
+        Fetch many JSON responses concurrently.
+
+        Identical requests are only sent once.
+
+        Args:
+            requests_ (list): (url, params) pairs.
+
+        Returns:
+            list: One decoded response per request, in order. Failed requests yield their exception.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        keys = [
+            json.dumps([url, sorted((params or {}).items())], default=str)
+            for url, params in requests_
+        ]
+        unique = dict(zip(keys, requests_))
+        responses = await asyncio.gather(
+            *(
+                self.fetch_json(url, params, semaphore)
+                for url, params in unique.values()
+            ),
+            return_exceptions=True,
+        )
+        by_key = dict(zip(unique, responses))
+        return [by_key[key] for key in keys]
+
+    def get_many(self, requests_):
+        """
+        Synchronous version of `fetch_many`, also usable inside Jupyter.
+
+        Args:
+            requests_ (list): (url, params) pairs.
+
+        Returns:
+            list: One decoded response (or exception) per request, in order.
+        """
+        return run_sync(self.fetch_many(requests_))
+
+    def close(self):
+        """
+        Close the pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,35 @@
+from rdflib import Namespace
+
+# Ontologies shared by the RDF exports of Artifact, Artist and Collection.
+# They are created once here instead of on every to_rdf call.
+CRM = Namespace("http://www.cidoc-crm.org/cidoc-crm/")
+DC = Namespace("http://purl.org/dc/elements/1.1/")
+EX = Namespace("http://w3id.org/example/")
+W3 = Namespace("https://w3id.org/i40/sto")
+FOAF = Namespace("http://xmlns.com/foaf/0.1/")
+Schema = Namespace("http://schema.org/")
+
+PREFIXES = {
+    "crm": CRM,
+    "dc": DC,
+    "ex": EX,
+    "w3": W3,
+    "foaf": FOAF,
+    "schema": Schema,
+}
+
+
+def bind_namespaces(graph):
+    """
+    Bind the project prefixes to a graph so that serializations use e.g. crm:something
+    instead of the full namespace.
+
+    Args:
+        graph (rdflib.Graph): The graph to bind the prefixes to.
+
+    Returns:
+        rdflib.Graph: The same graph.
+    """
+    for prefix, namespace in PREFIXES.items():
+        graph.bind(prefix, namespace, replace=True)
+    return graph
@@ -0,0 +1,131 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rdflib import Graph
+
+from .namespaces import CRM, bind_namespaces
+
+
+def shard_rdf(artists, artifacts, artist_uris, format="nt"):
+    """
+    Build and serialize the triples of one shard of a collection (runs in a worker process).
+
+    Args:
+        artists (list): Artist objects of the shard.
+        artifacts (list): Artifact objects of the shard.
+        artist_uris (dict): author name -> distinct uris of the artists with that name, for the P94_has_created links.
+        format (str): rdflib serializer name, e.g. "nt" or "turtle".
+
+    Returns:
+        bytes: The serialized triples of the shard (UTF-8).
+    """
+    graph = bind_namespaces(Graph())
+    for artist in artists:
+        graph.addN((s, p, o, graph) for s, p, o in artist.triples())
+    for artifact in artifacts:
+        graph.addN((s, p, o, graph) for s, p, o in artifact.triples())
+        artifact_uri = artifact.uri()
+        graph.addN(
+            (artist_uri, CRM["P94_has_created"], artifact_uri, graph)
+            for artist_uri in artist_uris.get(artifact.author_name, ())
+        )
+    return graph.serialize(format=format, encoding="utf-8")
+
+
+def split(items, n):
+    """
+    Split a list into n contiguous parts of (almost) equal length.
+
+    Args:
+        items (list): Items to split.
+        n (int): Number of parts.
+
+    Returns:
+        list: The parts, some may be empty if there are fewer items than parts.
+    """
+    size, extra = divmod(len(items), n)
+    parts = []
+    start = 0
+    for i in range(n):
+        end = start + size + (i < extra)
+        parts.append(items[start:end])
+        start = end
+    return parts
+
+
+def collection_shards(collection, n):
+    """
+    Split a collection into shards that can be turned into RDF independently.
+
+    Artists are sharded by name, so duplicate artists land in the same shard and are only
+    serialized once. Every artifact shard carries the artist uris its creator links need.
+
+    Args:
+        collection (Collection): The collection.
+        n (int): Number of shards.
+
+    Returns:
+        list: (artists, artifacts, artist_uris) arguments of `shard_rdf`, one per shard.
+    """
+    collection._sync_name_indexes()
+    artist_groups = split(list(collection._artists_by_name.values()), n)
+    artifact_parts = split(collection.artifacts, n)
+
+    shards = []
+    for groups, artifacts in zip(artist_groups, artifact_parts):
+        artists = [artist for group in groups for artist in group]
+        names = {artifact.author_name for artifact in artifacts}
+        artist_uris = {name: collection._uris_of_artists(name) for name in names}
+        shards.append((artists, artifacts, artist_uris))
+    return shards
+
+
+def iter_shard_rdf(collection, workers, format="nt"):
+    """
+    Serialize a collection shard by shard in worker processes.
+
+    Args:
+        collection (Collection): The collection.
+        workers (int): Number of worker processes (and shards).
+        format (str): rdflib serializer name, e.g. "nt" or "turtle".
+
+    Yields:
+        bytes: The serialized triples of each shard, in order. Shards may repeat triples
+        shared by several artifacts (e.g. tag descriptions), loading them into a graph removes the duplicates.
+    """
+    shards = collection_shards(collection, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(shard_rdf, artists, artifacts, artist_uris, format)
+            for artists, artifacts, artist_uris in shards
+        ]
+        for future in futures:
+            yield future.result()
+
+
+def speedup_curve(collection, workers=(1, 2, 4, 8), format="nt", path=os.devnull):
+    """
+    Time Collection.export_rdf with a growing number of worker processes.
+
+    Args:
+        collection (Collection): The collection to export.
+        workers (iterable): Numbers of workers to try, 1 is the single-process path.
+        format (str): "nt" or "ttl".
+        path (str): Where to write the exports, discarded by default.
+
+    Returns:
+        dict: workers -> (seconds, speedup relative to the single-process path).
+    """
+    timings = {}
+    for n in workers:
+        start = time.perf_counter()
+        collection.export_rdf(path, format=format, workers=n)
+        timings[n] = time.perf_counter() - start
+
+    baseline = timings.get(1)
+    if baseline is None:
+        start = time.perf_counter()
+        collection.export_rdf(path, format=format)
+        baseline = time.perf_counter() - start
+    return {n: (seconds, baseline / seconds) for n, seconds in timings.items()}
@@ -0,0 +1,321 @@
+import math
+import pickle
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from .uris import is_missing
+
+# indexed fields of a record
+FIELDS = ("title", "culture", "artist")
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+
+def normalize_text(text):
+    """
+    Normalize text for indexing: accents removed, lowercase, punctuation replaced by spaces.
+
+    Args:
+        text (str): The text, missing values become "".
+
+    Returns:
+        str: The normalized text.
+    """
+    if is_missing(text):
+        return ""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def normalize_name(name):
+    """
+    Normalize an artist name so that spellings of the same name compare equal.
+
+    Remarks in parentheses (e.g. "(French, 1840–1926)" in Cleveland creators) are dropped,
+    then the name is normalized like any text.
+
+    Args:
+        name (str): The artist name.
+
+    Returns:
+        str: The normalized name.
+    """
+    if is_missing(name):
+        return ""
+    return normalize_text(re.sub(r"\([^)]*\)", " ", str(name)))
+
+
+def first_present(*values):
+    """
+    Args:
+        *values: Candidate values, e.g. fields of a record.
+
+    Returns:
+        The first value that is not missing (see uris.is_missing), None if all are.
+    """
+    return next((value for value in values if not is_missing(value)), None)
+
+
+def aic_record(item):
+    """
+    Args:
+        item (dict): A record of the Art Institute of Chicago API (e.g. harvested with Harvester("aic", ...)).
+
+    Returns:
+        dict: The record in the common form of the index (museum, id, title, culture, artist, date, url).
+    """
+    return {
+        "museum": "aic",
+        "id": item.get("id"),
+        "title": item.get("title"),
+        "culture": first_present(item.get("place_of_origin"), item.get("style_title")),
+        "artist": first_present(item.get("artist_title"), item.get("artist_display")),
+        "date": item.get("date_display"),
+        "url": f"https://www.artic.edu/artworks/{item.get('id')}",
+    }
+
+
+def cleveland_record(item):
+    """
+    Args:
+        item (dict): A record of the Cleveland Museum of Art API (e.g. harvested with Harvester("cleveland", ...)).
+
+    Returns:
+        dict: The record in the common form of the index, see `aic_record`.
+    """
+    culture = item.get("culture")
+    creators = item.get("creators")
+    return {
+        "museum": "cleveland",
+        "id": item.get("id"),
+        "title": item.get("title"),
+        "culture": "; ".join(culture) if isinstance(culture, list) else culture,
+        "artist": (
+            creators[0].get("description")
+            if isinstance(creators, list) and creators
+            else None
+        ),
+        "date": item.get("creation_date"),
+        "url": item.get("url"),
+    }
+
+
+RECORD_PARSERS = {"aic": aic_record, "cleveland": cleveland_record}
+
+
+class SearchIndex:
+    """
+    An offline full-text index over mirrored museum records, ranked with BM25.
+
+    Title, culture and artist of every record are indexed separately, so a search can be limited to
+    some fields (e.g. the culture, like the Cleveland culture filter). Artist names are also indexed
+    as whole normalized names for exact lookups, with a fuzzy fallback for other spellings.
+    Records can be added at any time, the index can be pickled and loaded again.
+    """
+
+    def __init__(self):
+        self.records = []  # document -> record in the common form
+        self._museums = []  # document -> museum
+        self._postings = {field: {} for field in FIELDS}  # field -> term -> {document: frequency}
+        self._lengths = {field: [] for field in FIELDS}  # field -> document -> number of terms
+        self._artists = {}  # normalized artist name -> documents
+        self._arrays = None  # frozen postings and lengths, rebuilt after records are added
+
+    def __len__(self):
+        return len(self.records)
+
+    def add_records(self, items, museum):
+        """
+        Index raw records of a museum API.
+
+        Args:
+            items (iterable): The records (dicts), e.g. read from a harvested JSONL store.
+            museum (str): "aic" or "cleveland".
+
+        Raises:
+            ValueError: If the museum is unknown.
+        """
+        if museum not in RECORD_PARSERS:
+            raise ValueError(
+                f"Unknown museum {museum!r}, expected one of {sorted(RECORD_PARSERS)}"
+            )
+        parse = RECORD_PARSERS[museum]
+        for item in items:
+            record = parse(item)
+            document = len(self.records)
+            self.records.append(record)
+            self._museums.append(museum)
+            for field in FIELDS:
+                terms = normalize_text(record[field]).split()
+                self._lengths[field].append(len(terms))
+                postings = self._postings[field]
+                for term in terms:
+                    documents = postings.setdefault(term, {})
+                    documents[document] = documents.get(document, 0) + 1
+            name = normalize_name(record["artist"])
+            if name:
+                self._artists.setdefault(name, []).append(document)
+        self._arrays = None
+
+    @classmethod
+    def from_stores(cls, aic_path=None, cleveland_path=None):
+        """
+        Build an index from harvested JSONL stores (see harvester.Harvester).
+
+        Args:
+            aic_path (str, optional): Store of Art Institute of Chicago records.
+            cleveland_path (str, optional): Store of Cleveland Museum of Art records.
+
+        Returns:
+            SearchIndex: The index.
+        """
+        from .harvester import read_records
+
+        index = cls()
+        for museum, path in (("aic", aic_path), ("cleveland", cleveland_path)):
+            if path is not None:
+                df = read_records(path)
+                # fields a record lacks are NaN in the DataFrame, they become None again
+                records = df.astype(object).where(df.notna(), None).to_dict("records")
+                index.add_records(records, museum)
+        return index
+
+    def _freeze(self):
+        # postings as arrays, so a query term is scored with a few vectorized operations
+        if self._arrays is None:
+            arrays = {}
+            for field in FIELDS:
+                lengths = np.array(self._lengths[field], dtype=np.float64)
+                postings = {
+                    term: (
+                        np.fromiter(documents.keys(), np.int64, len(documents)),
+                        np.fromiter(documents.values(), np.float64, len(documents)),
+                    )
+                    for term, documents in self._postings[field].items()
+                }
+                arrays[field] = (postings, lengths, max(lengths.mean(), 1.0))
+            self._arrays = (arrays, np.array(self._museums))
+        return self._arrays
+
+    def scores(self, query, fields=FIELDS):
+        """
+        BM25 scores of all documents for a query, summed over the fields.
+
+        Args:
+            query (str): The query.
+            fields (iterable): Fields to search.
+
+        Returns:
+            np.ndarray: One score per document.
+        """
+        arrays, _ = self._freeze()
+        scores = np.zeros(len(self.records))
+        n = len(self.records)
+        for term in set(normalize_text(query).split()):
+            for field in fields:
+                postings, lengths, average_length = arrays[field]
+                if term not in postings:
+                    continue
+                documents, frequencies = postings[term]
+                idf = math.log(1 + (n - len(documents) + 0.5) / (len(documents) + 0.5))
+                norm = K1 * (1 - B + B * lengths[documents] / average_length)
+                scores[documents] += idf * frequencies * (K1 + 1) / (frequencies + norm)
+        return scores
+
+    def search(self, query, limit=10, museum=None, fields=FIELDS):
+        """
+        Find the records best matching a query.
+
+        Args:
+            query (str): The query, e.g. a culture or a title.
+            limit (int): Maximum number of records.
+            museum (str, optional): Only records of this museum ("aic" or "cleveland").
+            fields (iterable): Fields to search.
+
+        Returns:
+            list: The matching records (dicts in the common form), best first.
+        """
+        _, museums = self._freeze()
+        scores = self.scores(query, fields)
+        if museum is not None:
+            scores[museums != museum] = 0
+        candidates = np.flatnonzero(scores > 0)
+        best = candidates[np.argsort(-scores[candidates], kind="stable")[:limit]]
+        return [self.records[document] for document in best]
+
+    def match_artist(self, name, limit=10, museum=None, cutoff=0.85):
+        """
+        Find the records of an artist.
+
+        The normalized name is looked up first. If no record carries exactly that name, the artist
+        names sharing a word with it are compared fuzzily (also with their words sorted, so
+        "Monet, Claude" matches "Claude Monet") and those at least `cutoff` similar are used.
+
+        Args:
+            name (str): The artist name, e.g. an Artist's display_name.
+            limit (int): Maximum number of records.
+            museum (str, optional): Only records of this museum.
+            cutoff (float): Minimum similarity (0 to 1) of a fuzzy match.
+
+        Returns:
+            list: The records of the artist, best matching names first.
+        """
+        normalized = normalize_name(name)
+        if not normalized:
+            return []
+
+        documents = list(self._artists.get(normalized, ()))
+        if not documents:
+            postings = self._postings["artist"]
+            candidates = {
+                normalize_name(self.records[document]["artist"])
+                for term in normalized.split()
+                for document in postings.get(term, ())
+            }
+            sorted_name = " ".join(sorted(normalized.split()))
+            ranked = []
+            for candidate in candidates:
+                similarity = max(
+                    SequenceMatcher(None, normalized, candidate).ratio(),
+                    SequenceMatcher(
+                        None, sorted_name, " ".join(sorted(candidate.split()))
+                    ).ratio(),
+                )
+                if similarity >= cutoff:
+                    ranked.append((-similarity, candidate))
+            for _, candidate in sorted(ranked):
+                documents += self._artists[candidate]
+
+        if museum is not None:
+            documents = [d for d in documents if self._museums[d] == museum]
+        return [self.records[document] for document in documents[:limit]]
+
+    def save(self, path):
+        """
+        Args:
+            path (str): Where to pickle the index.
+        """
+        arrays, self._arrays = self._arrays, None  # rebuilt on demand, not worth storing
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            self._arrays = arrays
+
+    @classmethod
+    def load(cls, path):
+        """
+        Args:
+            path (str): Path of an index written by `save`.
+
+        Returns:
+            SearchIndex: The index.
+        """
+        with open(path, "rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,253 @@
+import threading
+from functools import lru_cache
+from urllib.parse import parse_qs, urlparse
+
+from rdflib import Graph
+
+from .namespaces import PREFIXES, bind_namespaces
+
+# the project prefixes (crm:, dc:, ...) can be used in queries without declaring them
+QUERY_PREFIXES = {prefix: str(namespace) for prefix, namespace in PREFIXES.items()}
+
+SPARQL_JSON = "application/sparql-results+json"
+N_TRIPLES = "application/n-triples"
+
+
+@lru_cache(maxsize=256)
+def prepare(query):
+    """
+    Parse and translate a SPARQL query for rdflib, memoized so repeated queries are only parsed once.
+
+    Args:
+        query (str): The SPARQL query.
+
+    Returns:
+        rdflib.plugins.sparql.sparql.Query: The prepared query.
+    """
+    from rdflib.plugins.sparql import prepareQuery
+
+    return prepareQuery(query, initNs=QUERY_PREFIXES)
+
+
+def oxigraph_available():
+    """
+    Returns:
+        bool: Whether the optional pyoxigraph package is installed.
+    """
+    try:
+        import pyoxigraph  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class SparqlStore:
+    """
+    An indexed triple store that answers SPARQL queries over the RDF of a collection.
+
+    Two backends are supported:
+    - "oxigraph" (needs pyoxigraph): a native store, either in memory or persisted on disk when a path
+      is given. A store saved once can be reopened in a later session and queried right away,
+      without parsing any Turtle.
+    - "rdflib": queries an rdflib graph in memory, the prepared queries are cached.
+
+    Results are returned the same way by both backends.
+    """
+
+    def __init__(self, path=None, backend=None):
+        """
+        Args:
+            path (str, optional): Directory of an on-disk store (oxigraph only), opened if it exists.
+            backend (str, optional): "oxigraph" or "rdflib". By default oxigraph if it is installed.
+
+        Raises:
+            ValueError: If the backend is unknown or a path is given for the rdflib backend.
+            ImportError: If the oxigraph backend is requested but pyoxigraph is not installed.
+        """
+        if backend is None:
+            backend = "oxigraph" if oxigraph_available() else "rdflib"
+        if backend not in ("oxigraph", "rdflib"):
+            raise ValueError(f"Unknown backend {backend!r}, expected 'oxigraph' or 'rdflib'")
+        if backend == "rdflib" and path is not None:
+            raise ValueError("Only the oxigraph backend can be stored on disk")
+
+        self.backend = backend
+        self.path = path
+        self.version = None  # set by load, e.g. to tell whether the store is up to date
+
+        if backend == "oxigraph":
+            import pyoxigraph
+
+            self._store = pyoxigraph.Store(path)
+        else:
+            self._store = bind_namespaces(Graph())
+
+    def load(self, graph, version=None):
+        """
+        Replace the content of the store with a graph.
+
+        The rdflib backend queries the graph itself instead of copying it, so it follows later
+        changes of the graph (e.g. the persistent graph of Collection.to_rdf).
+
+        Args:
+            graph (rdflib.Graph): The triples to load.
+            version (optional): Stored as `version`, to recognize the loaded content later.
+        """
+        if self.backend == "oxigraph":
+            import pyoxigraph
+
+            self._store.clear()
+            self._store.bulk_load(
+                graph.serialize(format="nt", encoding="utf-8"),
+                pyoxigraph.RdfFormat.N_TRIPLES,
+            )
+            self._store.flush()
+        else:
+            self._store = graph
+        self.version = version
+
+    def __len__(self):
+        return len(self._store)
+
+    def _run(self, query):
+        if self.backend == "oxigraph":
+            return self._store.query(query, prefixes=QUERY_PREFIXES)
+        return self._store.query(prepare(query))
+
+    def query(self, query):
+        """
+        Run a SPARQL query.
+
+        Args:
+            query (str): The query, the project prefixes (crm:, dc:, foaf:, ...) are predeclared.
+
+        Returns:
+            list, bool or rdflib.Graph: For SELECT one dict per solution (variable -> value as a string,
+            None if unbound), for ASK a bool, for CONSTRUCT and DESCRIBE a graph.
+        """
+        result = self._run(query)
+
+        if self.backend == "oxigraph":
+            import pyoxigraph
+
+            if isinstance(result, pyoxigraph.QuerySolutions):
+                names = [variable.value for variable in result.variables]
+                return [
+                    {
+                        name: None if solution[name] is None else solution[name].value
+                        for name in names
+                    }
+                    for solution in result
+                ]
+            if isinstance(result, pyoxigraph.QueryBoolean):
+                return bool(result)
+            graph = bind_namespaces(Graph())
+            graph.parse(
+                data=result.serialize(format=pyoxigraph.RdfFormat.N_TRIPLES),
+                format="nt",
+            )
+            return graph
+
+        if result.type == "SELECT":
+            names = [str(variable) for variable in result.vars]
+            return [
+                {
+                    name: None if value is None else str(value)
+                    for name, value in zip(names, row)
+                }
+                for row in result
+            ]
+        if result.type == "ASK":
+            return bool(result.askAnswer)
+        return bind_namespaces(result.graph)
+
+    def query_serialized(self, query):
+        """
+        Run a SPARQL query and serialize the result for the HTTP endpoint.
+
+        Args:
+            query (str): The query.
+
+        Returns:
+            tuple: (content type, body) – SPARQL JSON results for SELECT and ASK, N-Triples for
+            CONSTRUCT and DESCRIBE.
+        """
+        result = self._run(query)
+
+        if self.backend == "oxigraph":
+            import pyoxigraph
+
+            if isinstance(result, pyoxigraph.QueryTriples):
+                return N_TRIPLES, result.serialize(format=pyoxigraph.RdfFormat.N_TRIPLES)
+            return SPARQL_JSON, result.serialize(
+                format=pyoxigraph.QueryResultsFormat.JSON
+            )
+
+        if result.type in ("SELECT", "ASK"):
+            return SPARQL_JSON, result.serialize(format="json")
+        return N_TRIPLES, result.graph.serialize(format="nt", encoding="utf-8")
+
+    def serve(self, host="127.0.0.1", port=3030):
+        """
+        Start a small SPARQL endpoint over the store in a background thread.
+
+        Queries are accepted at /sparql as GET ?query=..., as POST form (query=...) or as POST
+        with an application/sparql-query body.
+
+        Args:
+            host (str): Address to listen on, only the local machine by default.
+            port (int): Port to listen on, 0 picks a free one (see server.server_address).
+
+        Returns:
+            ThreadingHTTPServer: The running server, stop it with `shutdown()`.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                self.answer(url.path, parse_qs(url.query).get("query", [None])[0])
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                content_type = self.headers.get("Content-Type", "").split(";")[0]
+                if content_type == "application/sparql-query":
+                    query = body.decode("utf-8")
+                else:
+                    query = parse_qs(body.decode("utf-8")).get("query", [None])[0]
+                self.answer(url.path, query)
+
+            def answer(self, path, query):
+                if path != "/sparql":
+                    self.send_error(404)
+                    return
+                if not query:
+                    self.send_error(400, "Missing query")
+                    return
+                try:
+                    content_type, body = store.query_serialized(query)
+                except Exception as e:
+                    self.send_error(400, str(e).splitlines()[0] if str(e) else "Bad query")
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # keeps notebooks free of request logs
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def close(self):
+        """
+        Flush an on-disk store, it can then be reopened with the same path.
+        """
+        if self.backend == "oxigraph":
+            self._store.flush()
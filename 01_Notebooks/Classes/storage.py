@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .utils import parse_list_column, parse_year_column
+
+# columns of the cleaned MET dataset that hold lists (stringified in the CSV)
+LIST_COLUMNS = [
+    "Tags",
+    "Tags AAT URL",
+    "Tags Wikidata URL",
+    "Artist Display Name",
+    "Artist Nationality",
+]
+
+# low-cardinality text columns, stored dictionary-encoded and loaded as categoricals
+CATEGORICAL_COLUMNS = [
+    "Department",
+    "Object Name",
+    "Culture",
+    "Period",
+    "Medium",
+    "Classification",
+    "Credit Line",
+]
+
+# columns needed to build the objects of a Collection
+ARTIFACT_COLUMNS = [
+    "Object ID",
+    "Department",
+    "AccessionYear",
+    "Object Name",
+    "Title",
+    "Culture",
+    "Period",
+    "Medium",
+    "Classification",
+    "Credit Line",
+    "Object Wikidata URL",
+    "Tags",
+    "Tags AAT URL",
+    "Tags Wikidata URL",
+    "Dimensions",
+    "cm_value",
+    "Artist Display Name",
+]
+ARTIST_COLUMNS = ["Artist Display Name", "Artist Nationality", "Artist Wikidata URL"]
+COLLECTION_COLUMNS = ARTIFACT_COLUMNS + ["Artist Nationality", "Artist Wikidata URL"]
+
+
+def to_typed(df):
+    """
+    Convert the cleaned MET dataset into its typed form.
+
+    The stringified list columns become real lists and AccessionYear becomes a nullable integer year.
+    cm_value becomes a float, and the low-cardinality text columns become categoricals.
+
+    Args:
+        df (pd.DataFrame): The cleaned dataset as read from MetObjects_Cleaned.csv.
+
+    Returns:
+        pd.DataFrame: A typed copy of the dataset.
+    """
+    df = df.copy()
+    for column in LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = [
+                values or None for values in parse_list_column(df[column])
+            ]
+    if "AccessionYear" in df.columns:
+        df["AccessionYear"] = pd.array(
+            parse_year_column(df["AccessionYear"]), dtype="Int16"
+        )
+    if "cm_value" in df.columns:
+        df["cm_value"] = pd.to_numeric(df["cm_value"], errors="coerce")
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def schema_for(df):
+    """
+    Build the Arrow schema of a typed dataset, with list<string> for the list columns.
+
+    Args:
+        df (pd.DataFrame): A dataset returned by `to_typed`.
+
+    Returns:
+        pa.Schema: The schema.
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    for column in LIST_COLUMNS:
+        if column in df.columns:
+            index = schema.get_field_index(column)
+            schema = schema.set(index, pa.field(column, pa.list_(pa.string())))
+    return schema
+
+
+def chunk_schema(typed):
+    """
+    Build a schema every chunk of a typed dataset can be written with, see `write_parquet_chunks`.
+
+    The schema of a single chunk depends on its values: categoricals get the smallest index type for
+    their number of categories, and a column without any value in the chunk has the null type.
+    Here dictionaries always use int32 indices and null columns become strings.
+
+    Args:
+        typed (pd.DataFrame): A chunk returned by `to_typed`.
+
+    Returns:
+        pa.Schema: The schema.
+    """
+    schema = schema_for(typed)
+    for index, field in enumerate(schema):
+        if pa.types.is_dictionary(field.type):
+            schema = schema.set(
+                index, field.with_type(pa.dictionary(pa.int32(), pa.string()))
+            )
+        elif pa.types.is_null(field.type):
+            schema = schema.set(index, field.with_type(pa.string()))
+    return schema
+
+
+def write_parquet_chunks(chunks, path):
+    """
+    Write the cleaned MET dataset as Parquet with typed columns, one row group per chunk.
+
+    Only one chunk is held in memory at a time. The schema is fixed by the first chunk.
+
+    Args:
+        chunks (iterable): DataFrames of the cleaned dataset with the same columns, e.g. from
+            cleaning.iter_clean_chunks.
+        path (str): Path of the Parquet file.
+
+    Returns:
+        int: Number of rows written.
+    """
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            typed = to_typed(chunk)
+            if writer is None:
+                schema = chunk_schema(typed)
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(
+                pa.Table.from_pandas(typed, schema=schema, preserve_index=False)
+            )
+            rows += len(typed)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_parquet(df, path):
+    """
+    Write the cleaned MET dataset as Parquet with typed columns.
+
+    Args:
+        df (pd.DataFrame): The cleaned dataset, as read from the CSV or already typed.
+        path (str): Path of the Parquet file.
+    """
+    typed = to_typed(df)
+    table = pa.Table.from_pandas(typed, schema=schema_for(typed), preserve_index=False)
+    pq.write_table(table, path)
+
+
+def csv_to_parquet(csv_path, parquet_path):
+    """
+    Convert MetObjects_Cleaned.csv into its Parquet form, so the list cells never have to be parsed again.
+
+    Args:
+        csv_path (str): Path of the cleaned CSV.
+        parquet_path (str): Path of the Parquet file to write.
+    """
+    write_parquet(pd.read_csv(csv_path, low_memory=False), parquet_path)
+
+
+def read_parquet(path, columns=None, filters=None):
+    """
+    Read the Parquet form of the cleaned MET dataset.
+
+    Only the requested columns are read from disk. Row filters are pushed down to the reader as well.
+
+    Args:
+        path (str): Path of the Parquet file.
+        columns (list, optional): Columns to read, e.g. COLLECTION_COLUMNS, all columns if omitted.
+        filters (list, optional): pyarrow filters such as [("Culture", "==", "Roman")].
+
+    Returns:
+        pd.DataFrame: The requested part of the dataset.
+    """
+    df = pd.read_parquet(path, columns=columns, filters=filters)
+    # missing text values come back as None, the CSV reader gives NaN
+    for column in df.columns:
+        if df[column].dtype == object and column not in LIST_COLUMNS:
+            df[column] = df[column].where(df[column].notna(), np.nan)
+    return df
+
+
+def load_columns(path, columns):
+    """
+    Read only some columns of the cleaned MET dataset from either its CSV or its Parquet form.
+
+    Args:
+        path (str): Path of the cleaned dataset (.csv or .parquet).
+        columns (list): Columns to read.
+
+    Returns:
+        pd.DataFrame: The requested columns.
+    """
+    if str(path).endswith(".parquet"):
+        return read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns, low_memory=False)
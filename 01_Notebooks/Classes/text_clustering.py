@@ -0,0 +1,218 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+def clean_text(series):
+    """
+    Lowercase texts and keep only letters and whitespace (the cleaning of the culture analysis).
+
+    Args:
+        series (pd.Series): The texts, missing values become "".
+
+    Returns:
+        pd.Series: The cleaned texts.
+    """
+    return (
+        series.fillna("")
+        .astype(str)
+        .str.lower()
+        .str.replace(r"[^a-z\s]", "", regex=True)
+        .str.strip()
+    )
+
+
+def deduplicate(texts):
+    """
+    Split texts into their distinct values and the position of every row among them.
+
+    Args:
+        texts (iterable): The texts, missing values are treated as "".
+
+    Returns:
+        tuple: (uniques, codes, counts) – the distinct texts (pd.Series), the index of each row's text in
+        uniques and the number of rows of each distinct text.
+    """
+    texts = pd.Series(texts, dtype=object).fillna("")
+    codes, uniques = pd.factorize(texts)
+    counts = np.bincount(codes, minlength=len(uniques))
+    return pd.Series(uniques, dtype=object), codes, counts
+
+
+class TextClusterer:
+    """
+    Incremental TF-IDF + MiniBatchKMeans clustering of short texts, such as cultures or titles.
+
+    Texts are deduplicated before anything is computed: only the distinct values are cleaned and
+    vectorized, weighted by how many rows share them, and the labels are mapped back to the rows.
+    The features are hashed, so there is no vocabulary to refit, and the document frequencies behind
+    the IDF weights are running counts. New batches (e.g. a harvest of Chicago or Cleveland titles)
+    update the model with `partial_fit` instead of a full refit. A fitted clusterer can be saved and
+    loaded again to assign new texts to the same clusters.
+    """
+
+    def __init__(
+        self,
+        n_clusters=5,
+        n_features=2**18,
+        stop_words="english",
+        clean=True,
+        batch_size=4096,
+        random_state=42,
+    ):
+        """
+        Args:
+            n_clusters (int): Number of clusters.
+            n_features (int): Number of hashed features.
+            stop_words (str or list, optional): Stop words removed before hashing, "english" as in the notebook.
+            clean (bool): Whether the texts are cleaned with `clean_text` first.
+            batch_size (int): Distinct texts per MiniBatchKMeans step.
+            random_state (int): Seed of the clustering.
+        """
+        self.n_clusters = n_clusters
+        self.clean = clean
+        self.batch_size = batch_size
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            stop_words=stop_words,
+            alternate_sign=False,
+            norm=None,
+        )
+        self.kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            batch_size=batch_size,
+            random_state=random_state,
+            n_init=3,
+        )
+        self.n_documents = 0
+        self.document_frequencies = np.zeros(n_features)
+        self.terms = {}  # hashed feature -> a term seen for it, to describe the clusters
+        self._seen_terms = set()
+
+    def _prepare(self, texts):
+        uniques, codes, counts = deduplicate(texts)
+        if self.clean:
+            # distinct texts may become equal once cleaned ("Greek" and "Greek?")
+            cleaned, cleaned_codes, _ = deduplicate(clean_text(uniques))
+            codes = cleaned_codes[codes]
+            counts = np.bincount(codes, minlength=len(cleaned))
+            uniques = cleaned
+        return uniques, codes, counts
+
+    def _vectorize(self, uniques):
+        # TF-IDF with the smoothed IDF of sklearn's TfidfVectorizer, rows are L2-normalized
+        X = self.vectorizer.transform(uniques)
+        idf = np.log((1 + self.n_documents) / (1 + self.document_frequencies)) + 1
+        return normalize(X @ sparse.diags(idf))
+
+    def _learn_terms(self, uniques):
+        analyzer = self.vectorizer.build_analyzer()
+        new_terms = list(
+            {term for text in uniques for term in analyzer(text)} - self._seen_terms
+        )
+        self._seen_terms.update(new_terms)
+        if new_terms:
+            X = self.vectorizer.transform(new_terms).tocsr()
+            for row, term in enumerate(new_terms):
+                for feature in X.indices[X.indptr[row] : X.indptr[row + 1]]:
+                    self.terms.setdefault(int(feature), term)
+
+    def partial_fit(self, texts):
+        """
+        Update the model with a batch of texts.
+
+        Args:
+            texts (iterable): The texts, one per row (duplicates are cheap).
+
+        Returns:
+            TextClusterer: self.
+        """
+        uniques, _, counts = self._prepare(texts)
+        X = self.vectorizer.transform(uniques)
+        self.n_documents += int(counts.sum())
+        self.document_frequencies += (X > 0).T @ counts
+        self._learn_terms(uniques)
+
+        X = self._vectorize(uniques)
+        fitted = hasattr(self.kmeans, "cluster_centers_")
+        if len(uniques) < self.n_clusters and not fitted:
+            raise ValueError(
+                f"The first batch needs at least {self.n_clusters} distinct texts, got {len(uniques)}"
+            )
+        for start in range(0, len(uniques), self.batch_size):
+            end = start + self.batch_size
+            if end < len(uniques) and len(uniques) - end < self.n_clusters:
+                end = len(uniques)  # a too small last batch is merged into this one
+            self.kmeans.partial_fit(X[start:end], sample_weight=counts[start:end])
+            if end == len(uniques):
+                break
+        return self
+
+    def predict(self, texts):
+        """
+        Assign texts to the clusters.
+
+        Args:
+            texts (iterable): The texts, one per row.
+
+        Returns:
+            np.ndarray: The cluster of every row.
+        """
+        uniques, codes, _ = self._prepare(texts)
+        return self.kmeans.predict(self._vectorize(uniques))[codes]
+
+    def fit_predict(self, texts):
+        """
+        Update the model with texts and assign them to the clusters.
+
+        Args:
+            texts (iterable): The texts, one per row.
+
+        Returns:
+            np.ndarray: The cluster of every row.
+        """
+        return self.partial_fit(texts).predict(texts)
+
+    def top_terms(self, n=10):
+        """
+        Describe the clusters by the terms with the highest weight in their centers.
+
+        Args:
+            n (int): Terms per cluster.
+
+        Returns:
+            list: One list of terms per cluster.
+        """
+        return [
+            [
+                self.terms[feature]
+                for feature in np.argsort(center)[::-1][:n]
+                if center[feature] > 0 and feature in self.terms
+            ]
+            for center in self.kmeans.cluster_centers_
+        ]
+
+    def save(self, path):
+        """
+        Args:
+            path (str): Where to pickle the fitted clusterer.
+        """
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Args:
+            path (str): Path of a clusterer written by `save`.
+
+        Returns:
+            TextClusterer: The fitted clusterer.
+        """
+        with open(path, "rb") as f:
+            return pickle.load(f)
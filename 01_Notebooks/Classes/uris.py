@@ -0,0 +1,110 @@
+import hashlib
+from functools import lru_cache
+from numbers import Integral
+from urllib.parse import quote
+
+import pandas as pd
+from rdflib import URIRef
+
+# base of the IRIs minted for objects without a Wikidata URL
+EXAMPLE_BASE = "http://w3id.org/example/"
+
+# characters left as they are when an existing URL is made safe (reserved characters and "%")
+URL_SAFE = ":/?#[]@!$&'()*+,;=%~"
+
+# number of memoized IRIs per function, bounded so a long harvest does not grow the caches without limit
+URI_CACHE_SIZE = 65536
+
+
+def is_missing(value):
+    """
+    Check whether a URL or label is missing (None, NaN, "nan" or empty).
+
+    Args:
+        value: The value to check.
+
+    Returns:
+        bool: True if there is no usable value.
+    """
+    if value is None or value == "" or value == "nan":
+        return True
+    return not isinstance(value, str) and bool(pd.isna(value))
+
+
+def id_hash(key, length=8):
+    """
+    Hash an identifier into a short deterministic suffix.
+
+    Integral floats (e.g. 245.0 read from a column with missing values) hash like the integer.
+
+    Args:
+        key: The identifier, e.g. the MET Object ID.
+        length (int): Number of hex digits to keep.
+
+    Returns:
+        str: The first `length` hex digits of the SHA-1 of the identifier.
+    """
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    elif isinstance(key, Integral):
+        key = int(key)
+    return hashlib.sha1(str(key).encode("utf-8")).hexdigest()[:length]
+
+
+@lru_cache(maxsize=URI_CACHE_SIZE)
+def mint_uri(kind, label, key=None):
+    """
+    Mint the example IRI of an object without a Wikidata URL.
+
+    The label (a title or a name) is kept readable: spaces become "_" and every other character
+    that is not allowed in an IRI path segment is percent-encoded. If a key is given, a hash of it
+    is appended, so objects with the same label (e.g. two untitled vases) get different IRIs while
+    the same object always gets the same one. Recent results are memoized.
+
+    Args:
+        kind (str): Kind of object, the first path segment (e.g. "artifact").
+        label (str): Title or name of the object.
+        key (optional): Identifier distinguishing objects with the same label, e.g. the Object ID.
+
+    Returns:
+        rdflib.URIRef: The minted IRI.
+    """
+    if is_missing(label):
+        label = "unknown"
+    segment = quote(str(label).replace(" ", "_"), safe="")
+    if not is_missing(key):
+        segment = f"{segment}_{id_hash(key)}"
+    return URIRef(f"{EXAMPLE_BASE}{kind}/{segment}")
+
+
+@lru_cache(maxsize=URI_CACHE_SIZE)
+def url_to_uri(url):
+    """
+    Turn a URL from the dataset into a URIRef, percent-encoding characters that are not allowed in IRIs
+    (e.g. spaces). Valid URLs are left unchanged. Recent results are memoized.
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        rdflib.URIRef: The IRI.
+    """
+    return URIRef(quote(url.strip(), safe=URL_SAFE))
+
+
+def object_uri(url, kind, label, key=None):
+    """
+    The IRI of an object: its URL if it has one, otherwise a minted example IRI.
+
+    Args:
+        url (str): The object's (Wikidata) URL, may be missing.
+        kind (str): Kind of object, see `mint_uri`.
+        label (str): Title or name of the object, see `mint_uri`.
+        key (optional): Identifier distinguishing objects with the same label, see `mint_uri`.
+
+    Returns:
+        rdflib.URIRef: The IRI.
+    """
+    if is_missing(url):
+        return mint_uri(kind, label, key)
+    return url_to_uri(url)
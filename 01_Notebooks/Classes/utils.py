@@ -1,20 +1,136 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+import ast
+import numbers
+import sys
 
+import numpy as np
+import pandas as pd
 
-def visualize_rdf_graph(rdf_graph):
+
+def parse_list(value):
+    """
+    Parse a list-valued cell from the cleaned MET dataset.
+
+    The cleaned CSV stores lists as their Python representation (e.g. "['Men', 'Women']").
+    Values that are already lists are returned unchanged, missing or malformed values become an empty list.
+
+    Args:
+        value (str, list or np.ndarray): The raw cell value.
+
+    Returns:
+        list: The parsed list.
+    """
+    if isinstance(value, list):
+        return value
+    if isinstance(value, (tuple, np.ndarray)):  # list columns read from Parquet
+        return list(value)
+    if not isinstance(value, str):
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    return list(parsed) if isinstance(parsed, (list, tuple)) else []
+
+
+def parse_list_column(series):
+    """
+    Parse a whole list-valued column of the cleaned MET dataset.
+
+    Every distinct string is parsed only once, rows sharing the same value receive their own copy of the list.
+
+    Args:
+        series (pd.Series): Column with stringified lists.
+
+    Returns:
+        list: One parsed list per row.
+    """
+    parsed = {
+        value: parse_list(value)
+        for value in series[series.map(type) == str].unique()
+    }
+    return [
+        list(parsed[value]) if isinstance(value, str) else parse_list(value)
+        for value in series.tolist()
+    ]
+
+
+def intern_value(value):
+    """
+    Intern a string so that repeated values (e.g. department, culture or medium) share one object.
+
+    Args:
+        value: Any cell value, only strings are interned.
+
+    Returns:
+        The interned string, or the value unchanged.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def parse_year(value):
+    """
+    Parse an accession date or year into a year.
+
+    Args:
+        value (int or str): A year or a date string such as "1906-01-01".
+
+    Returns:
+        int or float: The year, NaN if the value is missing.
+    """
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    return pd.Timestamp(value).year
+
+
+def parse_year_column(series):
+    """
+    Parse a whole AccessionYear column into years.
+
+    Works both for the date strings of the cleaned CSV and for integer year columns (e.g. read from Parquet).
+
+    Args:
+        series (pd.Series): Column with accession dates or years.
+
+    Returns:
+        list: One year per row, NaN where the value is missing.
+    """
+    if pd.api.types.is_integer_dtype(series):
+        years = series
+    else:
+        years = pd.to_datetime(series, errors="coerce").dt.year
+    return [np.nan if pd.isna(year) else int(year) for year in years.tolist()]
+
+
+def visualize_rdf_graph(rdf_graph, scalable=False, **options):
     """
     Visualize an RDF graph using NetworkX and Matplotlib.
 
     Converts an RDFLib Graph into a directed NetworkX graph for visualization.
     Each triple is rendered as a labeled edge between nodes.
 
+    For graphs with more than a few dozen nodes use `scalable=True`: literal values become node
+    attributes, the graph can be filtered, the layout is fast and cached and the result can be
+    exported to HTML or GEXF (see graph_viz.visualize for the options).
+
     Args:
         rdf_graph (rdflib.Graph): The RDF graph to visualize.
+        scalable (bool): Use the scalable mode.
+        **options: Options of graph_viz.visualize, e.g. output="graph.html" or predicates=[...].
 
     Displays:
         A matplotlib figure showing the directed graph with nodes and labeled edges.
+
+    Returns:
+        nx.DiGraph or None: In scalable mode the visualized graph.
     """
+    if scalable:
+        from .graph_viz import visualize
+
+        return visualize(rdf_graph, **options)
+
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
     nx_graph = nx.DiGraph()
 
     for subj, pred, obj in rdf_graph:
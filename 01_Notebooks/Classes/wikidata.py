@@ -0,0 +1,170 @@
+import re
+
+from .cache import get_default_cache
+
+WIKIDATA_URL = "https://query.wikidata.org/sparql"
+
+# declared explicitly so the queries also run against SPARQL endpoints other than Wikidata
+PREFIXES = """
+PREFIX wd: <http://www.wikidata.org/entity/>
+PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+PREFIX schema: <http://schema.org/>
+"""
+
+QID_PATTERN = re.compile(r"^Q\d+$")
+
+
+def qid_from_uri(uri):
+    """
+    Extract the Wikidata QID from an entity URL (e.g. https://www.wikidata.org/wiki/Q8441).
+
+    Args:
+        uri (str): The Wikidata URL.
+
+    Returns:
+        str or None: The QID, or None if the URL does not end in a valid QID.
+    """
+    if not isinstance(uri, str):
+        return None
+    qid = uri.rstrip("/").split("/")[-1]
+    return qid if QID_PATTERN.match(qid) else None
+
+
+def batched(items, batch_size):
+    """
+    Split a list into consecutive batches.
+
+    Args:
+        items (list): Items to split.
+        batch_size (int): Maximum number of items per batch.
+
+    Yields:
+        list: The next batch of items.
+    """
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+def query_values(query_template, qids, endpoint=WIKIDATA_URL, batch_size=50):
+    """
+    Run a SPARQL query for many entities at once using VALUES blocks.
+
+    The template must contain `{values}`, which is replaced by the QIDs of one batch
+    (e.g. `wd:Q1 wd:Q2`), and bind the entity to `?item`.
+    Results are cached per QID in the shared response cache, so only QIDs that were not
+    looked up before are sent to the endpoint. One SPARQLWrapper is reused for all batches.
+
+    Args:
+        query_template (str): The query with a `{values}` placeholder.
+        qids (iterable): QIDs to query, duplicates are removed.
+        endpoint (str): URL of the SPARQL endpoint.
+        batch_size (int): Number of QIDs per query.
+
+    Returns:
+        dict: QID -> list of result bindings (dicts of variable name to value).
+    """
+    cache = get_default_cache()
+
+    qids = sorted(set(qids))
+    cached = (
+        cache.get_many(
+            endpoint, [{"query": query_template, "item": qid} for qid in qids]
+        )
+        if cache is not None
+        else [None] * len(qids)
+    )  # one transaction for all QIDs
+
+    results = {}
+    missing = []
+    for qid, rows in zip(qids, cached):
+        if rows is None:
+            missing.append(qid)
+        elif rows:
+            results[qid] = rows
+
+    if not missing:
+        return results
+
+    from SPARQLWrapper import SPARQLWrapper, JSON
+
+    sparql = SPARQLWrapper(endpoint)
+    sparql.setReturnFormat(JSON)
+
+    for batch in batched(missing, batch_size):
+        values = " ".join(f"wd:{qid}" for qid in batch)
+        try:
+            sparql.setQuery(PREFIXES + query_template.format(values=values))
+            response = sparql.query().convert()
+        except Exception as e:
+            print(f"Error querying {batch[0]}..{batch[-1]}: {e}")
+            continue
+
+        batch_results = {}
+        for binding in response["results"]["bindings"]:
+            qid = qid_from_uri(binding["item"]["value"])
+            batch_results.setdefault(qid, []).append(
+                {name: value["value"] for name, value in binding.items()}
+            )
+
+        for qid in batch:
+            rows = batch_results.get(qid, [])
+            if rows:
+                results[qid] = rows
+        if cache is not None:  # entities without results are cached as well
+            cache.set_many(
+                endpoint,
+                [
+                    ({"query": query_template, "item": qid}, batch_results.get(qid, []))
+                    for qid in batch
+                ],
+            )
+
+    return results
+
+
+def query_descriptions(qids, endpoint=WIKIDATA_URL, batch_size=50):
+    """
+    Look up the English descriptions of Wikidata entities.
+
+    Args:
+        qids (iterable): QIDs to look up.
+        endpoint (str): URL of the SPARQL endpoint.
+        batch_size (int): Number of QIDs per query.
+
+    Returns:
+        dict: QID -> English description, only for entities with an English label and description.
+    """
+    query = """
+    SELECT ?item ?label ?description WHERE {{
+      VALUES ?item {{ {values} }}
+      ?item rdfs:label ?label .
+      OPTIONAL {{ ?item schema:description ?description . }}
+      FILTER (lang(?label) = "en")
+      FILTER (lang(?description) = "en")
+    }}
+    """
+    results = query_values(query, qids, endpoint, batch_size)
+    return {qid: rows[0].get("description", "") for qid, rows in results.items()}
+
+
+def query_dates_of_birth(qids, endpoint=WIKIDATA_URL, batch_size=50):
+    """
+    Look up the dates of birth (P569) of Wikidata entities.
+
+    Args:
+        qids (iterable): QIDs to look up.
+        endpoint (str): URL of the SPARQL endpoint.
+        batch_size (int): Number of QIDs per query.
+
+    Returns:
+        dict: QID -> date of birth, an empty string if the entity has none.
+    """
+    query = """
+    SELECT ?item ?date_of_birth WHERE {{
+      VALUES ?item {{ {values} }}
+      OPTIONAL {{ ?item wdt:P569 ?date_of_birth . }}
+    }}
+    """
+    results = query_values(query, qids, endpoint, batch_size)
+    return {qid: rows[0].get("date_of_birth", "") for qid, rows in results.items()}
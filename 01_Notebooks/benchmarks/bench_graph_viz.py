@@ -0,0 +1,44 @@
+"""
+Scalable RDF graph visualization (user-017).
+
+Commit message, 20k rows (220k triples, 20k nodes, 70k edges): conversion 2.8s, layout 4.0s
+(nx.spring_layout needed 33s for 3k nodes), HTML export with the cached layout 4.0s end to end.
+Pass a third argument to also time nx.spring_layout on a graph of that many nodes.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from Classes import graph_viz
+from Classes.Collection import Collection
+
+from benchmarks.synthetic import make_cleaned_df
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{label}: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def main(n=20000, spring_nodes=0):
+    directory = tempfile.mkdtemp()
+    graph = Collection.from_dataframe("viz", make_cleaned_df(n), compact=True).to_rdf()
+    nx_graph = timed("conversion", lambda: graph_viz.rdf_to_networkx(graph))
+    print(f"{len(graph)} triples, {nx_graph.number_of_nodes()} nodes, {nx_graph.number_of_edges()} edges")
+    timed("force_layout", lambda: graph_viz.force_layout(nx_graph))
+    for output in ("graph.html", "graph.gexf"):
+        timed(f"visualize -> {output} (layout cached)",
+              lambda: graph_viz.visualize(graph, output=os.path.join(directory, output), cache_dir=directory))
+
+    if spring_nodes:
+        import networkx as nx
+
+        subgraph = nx_graph.subgraph(list(nx_graph)[:spring_nodes])
+        timed(f"nx.spring_layout of {spring_nodes} nodes", lambda: nx.spring_layout(subgraph, k=0.5, seed=0))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,36 @@
+"""
+Resuming a harvest after failed requests (user-008).
+
+Commit message: against a paginated mock with 30% of requests failing, the first run stored 1850 of 2350
+records, the second run fetched only the 5 missing pages and ended with 2350 unique ids, a third run sent
+no request.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from Classes.harvester import Harvester
+
+from benchmarks.servers import serve_harvest
+
+
+def main(total=2350, fail_rate=0.3):
+    server, url, state = serve_harvest(total, fail_rate=fail_rate)
+    path = os.path.join(tempfile.mkdtemp(), "aic.jsonl")
+
+    for run in ("first", "second", "third"):
+        if run != "first":
+            state["fail_rate"] = 0.0
+        state["requests"] = 0
+        start = time.perf_counter()
+        written = Harvester("aic", path, fields=["id", "title"], url=f"{url}/aic", retries=2).harvest()
+        records = Harvester("aic", path, url=f"{url}/aic").to_dataframe()
+        print(f"{run} run: {state['requests']} requests, {written} records written, "
+              f"{len(records)} stored ({records['id'].nunique()} unique), {time.perf_counter() - start:.2f}s")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]), *map(float, sys.argv[2:]))
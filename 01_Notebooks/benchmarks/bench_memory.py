@@ -0,0 +1,31 @@
+"""
+Traced memory of a loaded collection, with and without compact artist loading (user-011).
+
+Commit message, 50k rows: 63.6MB before slots, 38.0MB with slots and interning, 32.5MB with compact=True
+(16 artists instead of 50k).
+"""
+import gc
+import sys
+import tracemalloc
+
+from Classes.Collection import Collection
+
+from benchmarks.synthetic import make_cleaned_df
+
+
+def main(n=50000):
+    rows = make_cleaned_df(n)
+    for options in ({}, {"compact": True}):
+        gc.collect()
+        tracemalloc.start()
+        collection = Collection.from_dataframe("memory", rows, **options)
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{options or 'default'}: {current / 1e6:.1f}MB for {len(collection.artifacts)} artifacts "
+              f"and {len(collection.artists)} artists")
+        del collection
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
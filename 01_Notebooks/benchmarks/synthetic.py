@@ -0,0 +1,294 @@
+import json
+import random
+
+import numpy as np
+import pandas as pd
+
+# tags of the synthetic artifacts: (label, Wikidata QID)
+TAGS = [
+    ("Men", "Q8441"),
+    ("Women", "Q467"),
+    ("Horses", "Q726"),
+    ("Lions", "Q140"),
+    ("Dionysus", "Q37340"),
+]
+
+# labels and descriptions of the tags and dates of birth of the artists, served by `wikidata_store`.
+# Q37340 (Dionysus) is left out, it stands for an entity without an English description
+WIKIDATA_TURTLE = """
+@prefix wd: <http://www.wikidata.org/entity/> .
+@prefix wdt: <http://www.wikidata.org/prop/direct/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix schema: <http://schema.org/> .
+wd:Q8441 rdfs:label "man"@en ; schema:description "male adult human"@en .
+wd:Q467 rdfs:label "woman"@en ; schema:description "female adult human"@en .
+wd:Q726 rdfs:label "horse"@en ; schema:description "domesticated animal"@en, "Hauspferd"@de .
+wd:Q140 rdfs:label "lion"@en ; schema:description "species of big cat"@en .
+wd:Q1234 wdt:P569 "0550-01-01T00:00:00Z" .
+"""
+
+MET_DEPARTMENTS = [
+    "Greek and Roman Art",
+    "Asian Art",
+    "European Paintings",
+    "Drawings and Prints",
+]
+
+
+def make_cleaned_df(n, seed=0):
+    """
+    Build a synthetic dataset in the form of MetObjects_Cleaned.csv (as read with pd.read_csv).
+
+    List cells are stringified lists, AccessionYear is a date string, missing values are NaN.
+
+    Args:
+        n (int): Number of rows.
+        seed (int): Seed of the random values.
+
+    Returns:
+        pd.DataFrame: The dataset.
+    """
+    rnd = random.Random(seed)
+    artists = [
+        "['Amasis Painter']",
+        "['Nikosthenes, potter', 'Painter N']",
+        "['Exekias']",
+        np.nan,
+        np.nan,
+    ]
+    rows = []
+    for i in range(n):
+        tags = rnd.sample(TAGS, rnd.randint(0, 3))
+        rows.append(
+            {
+                "Object ID": 100000 + i,
+                "Department": "Greek and Roman Art",
+                "AccessionYear": (
+                    f"{rnd.randint(1870, 2020)}-01-01" if rnd.random() > 0.05 else np.nan
+                ),
+                "Object Name": rnd.choice(["Statue", "Vase", "Kylix", "Coin"]),
+                "Title": rnd.choice(
+                    ["Marble statue", "Terracotta kylix", "Bronze coin", "Amphora"]
+                )
+                + ("" if rnd.random() < 0.5 else f" {i % 50}"),
+                "Culture": rnd.choice(["Greek, Attic", "Roman", "Greek", "Cypriot", np.nan]),
+                "Period": rnd.choice(["Archaic", "Classical", "Imperial", np.nan]),
+                "Medium": rnd.choice(["Marble", "Terracotta", "Bronze"]),
+                "Classification": rnd.choice(["Stone Sculpture", "Vases", "Bronzes"]),
+                "Credit Line": rnd.choice(
+                    ["Rogers Fund, 1906", "Gift of X, 1920", "Fletcher Fund"]
+                ),
+                "Object Wikidata URL": (
+                    f"https://www.wikidata.org/wiki/Q{900000 + i}"
+                    if rnd.random() < 0.2
+                    else np.nan
+                ),
+                "Tags": str([label for label, _ in tags]) if tags else np.nan,
+                "Tags AAT URL": (
+                    str([f"http://vocab.getty.edu/page/aat/{qid[1:]}" for _, qid in tags])
+                    if tags
+                    else np.nan
+                ),
+                "Tags Wikidata URL": (
+                    str([f"https://www.wikidata.org/wiki/{qid}" for _, qid in tags])
+                    if tags
+                    else np.nan
+                ),
+                "Artist Display Name": rnd.choice(artists),
+                "Artist Wikidata URL": rnd.choice(
+                    ["https://www.wikidata.org/wiki/Q1234", np.nan, np.nan]
+                ),
+                "Artist ULAN URL": np.nan,
+                "Artist Nationality": rnd.choice(["['Greek']", np.nan]),
+                "Dimensions": "H. 10 cm",
+                "cm_value": rnd.choice([10.5, 33.2, np.nan]),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def write_met_csv(path, n, seed=0):
+    """
+    Write a synthetic raw MetObjects.csv (all departments, "|"-separated lists), see cleaning.py.
+
+    Args:
+        path (str): Where to write the CSV.
+        n (int): Number of rows.
+        seed (int): Seed of the random values.
+    """
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rows.append(
+            {
+                "Object Number": f"X.{i}",
+                "Is Highlight": False,
+                "Object ID": i + 1,
+                "Department": rnd.choice(MET_DEPARTMENTS),
+                "AccessionYear": rnd.choice(["1906", "1979", "", "2005-02-15"]),
+                "Object Name": rnd.choice(["Vase", "Statue"]),
+                "Title": rnd.choice(["Amphora", "Kylix", ""]),
+                "Culture": rnd.choice(["Greek", "Roman", ""]),
+                "Period": "",
+                "Medium": "Clay",
+                "Classification": "Vases",
+                "Credit Line": "Rogers Fund",
+                "Object Wikidata URL": "",
+                "Tags": rnd.choice(["Men|Women", "Horses", ""]),
+                "Tags AAT URL": rnd.choice(["a|b", ""]),
+                "Tags Wikidata URL": rnd.choice(
+                    ["https://www.wikidata.org/wiki/Q1|https://www.wikidata.org/wiki/Q2", ""]
+                ),
+                "Artist Display Name": rnd.choice(["Amasis Painter|Amasis", "", "Exekias"]),
+                "Artist Wikidata URL": "",
+                "Artist ULAN URL": "",
+                "Artist Nationality": rnd.choice(["Greek", " | ", "", "Greek|Attic"]),
+                "Dimensions": rnd.choice(
+                    [
+                        "H. 5 1/4 in. (13.3 cm)",
+                        "Overall: 10 × 20 in. (25.4 × 50.8 cm)",
+                        "no dims",
+                        "",
+                    ]
+                ),
+                "Long Text": "x" * 200,
+            }
+        )
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def wikidata_store():
+    """
+    Returns:
+        SparqlStore: A store with the Wikidata facts of the synthetic dataset, its `serve()` endpoint
+        answers the queries of Collection.wikidata_enrich like Wikidata would.
+    """
+    from rdflib import Graph
+
+    from Classes.sparql_store import SparqlStore
+
+    store = SparqlStore(backend="rdflib")
+    store.load(Graph().parse(data=WIKIDATA_TURTLE, format="turtle"))
+    return store
+
+
+def make_embeddings(n, dimension=512, themes=2000, noise=0.8, seed=1):
+    """
+    Synthetic image embeddings: vectors around a number of visual "themes".
+
+    Args:
+        n (int): Number of vectors.
+        dimension (int): Dimensions per vector.
+        themes (int): Number of clusters, fewer themes with more noise make the search harder.
+        noise (float): Standard deviation of the noise added to the theme of a vector.
+        seed (int): Seed of the random values.
+
+    Returns:
+        np.ndarray: float32 vectors of shape (n, dimension).
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((themes, dimension)).astype(np.float32)
+    return centers[rng.integers(0, themes, n)] + noise * rng.standard_normal(
+        (n, dimension)
+    ).astype(np.float32)
+
+
+CULTURE_NAMES = [
+    "Greek, Attic", "Roman", "Egyptian", "Japanese", "China", "American", "French",
+    "Greek, South Italian, Apulian", "Etruscan", "Cypriot", "Roman, Imperial", "Japan",
+    "Chinese, Qing dynasty", "Italian, Venice", "British, London", "Mexico, Aztec", "Peru, Moche",
+    "Persian", "Iran", "Indian, Mughal", "German, Nuremberg", "Flemish", "Dutch",
+]
+
+
+def make_cultures(n, rare=5000, seed=0):
+    """
+    Synthetic Culture values of the whole MET dataset: qualified variants of common cultures
+    ("Roman (?)", "Greek, Attic probably"), many rare ones and missing values.
+
+    Args:
+        n (int): Number of rows.
+        rare (int): Number of rare cultures.
+        seed (int): Seed of the random values.
+
+    Returns:
+        pd.Series: The cultures, None where missing.
+    """
+    rng = np.random.default_rng(seed)
+    qualifiers = ["", " (?)", " probably", " possibly", f" Period {rng.integers(100)}"]
+    values = [f"{name}{qualifier}" for name in CULTURE_NAMES for qualifier in qualifiers]
+    values += [f"Culture {i}" for i in rng.integers(0, rare, rare).astype(str)]
+    return pd.Series(rng.choice(values + [None], n))
+
+
+ARTIST_FIRST_NAMES = ["Claude", "Vincent", "Amasis", "Paul", "Édouard", "Mary", "Katsushika", "Winslow", "John", "Nikosthenes"]
+ARTIST_LAST_NAMES = ["Monet", "van Gogh", "Painter", "Cézanne", "Manet", "Cassatt", "Hokusai", "Homer", "Singer Sargent", "potter"]
+CULTURES = ["Greek", "Roman", "Japan", "France", "Egypt", "Etruscan", "China"]
+TITLE_WORDS = ["Vase", "Amphora", "Portrait", "Landscape", "Bowl", "Kylix", "Woman", "River", "Night", "Garden"]
+
+
+def artist_names(n_per_name=300):
+    """
+    Args:
+        n_per_name (int): Numbered variants of every name.
+
+    Returns:
+        list: Distinct artist names, e.g. "Claude Monet 5".
+    """
+    return [
+        f"{first} {last} {i}"
+        for i in range(n_per_name)
+        for first, last in zip(ARTIST_FIRST_NAMES, ARTIST_LAST_NAMES)
+    ]
+
+
+def write_museum_stores(directory, n_aic=100_000, n_cleveland=30_000, seed=0):
+    """
+    Write synthetic harvested JSONL stores of the Art Institute of Chicago and the Cleveland Museum of Art.
+
+    Args:
+        directory (str): Where to write aic.jsonl and cleveland.jsonl.
+        n_aic (int): Chicago records.
+        n_cleveland (int): Cleveland records.
+        seed (int): Seed of the random values.
+
+    Returns:
+        tuple: Paths of the two stores.
+    """
+    import os
+
+    rng = np.random.default_rng(seed)
+    artists = artist_names()
+
+    def title():
+        return " ".join(rng.choice(TITLE_WORDS, 3))
+
+    aic = (
+        {
+            "id": i,
+            "title": title(),
+            "artist_title": artists[rng.integers(len(artists))],
+            "place_of_origin": CULTURES[rng.integers(len(CULTURES))],
+            "date_display": "1880",
+        }
+        for i in range(n_aic)
+    )
+    cleveland = (
+        {
+            "id": i,
+            "title": title(),
+            "culture": [CULTURES[rng.integers(len(CULTURES))]],
+            "creators": [
+                {"description": f"{artists[rng.integers(len(artists))]} (French, 1840–1926)"}
+            ],
+            "creation_date": "c. 1900",
+            "url": f"https://clevelandart.org/art/{i}",
+        }
+        for i in range(n_cleveland)
+    )
+    paths = (os.path.join(directory, "aic.jsonl"), os.path.join(directory, "cleveland.jsonl"))
+    for path, records in zip(paths, (aic, cleveland)):
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return paths